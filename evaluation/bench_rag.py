@@ -0,0 +1,288 @@
+"""
+Offline end-to-end retrieval and latency benchmark.
+
+Ingests a fixture corpus (pre-chunked text and tables), runs a labelled
+query set through the retriever, reranker and Generation, and prints a
+JSON report: recall@k / MRR / nDCG before and after reranking, per-stage
+p50/p95/p99 latency, ingestion throughput and peak RSS. LLM calls go to
+StubTogetherClient, so no network access or API key is needed (the
+embedding and reranker models must be available locally).
+
+    python -m evaluation.bench_rag --output runs/baseline.json
+    python -m evaluation.bench_rag --mode dense --output runs/dense.json
+
+`--corpus` is a JSON list of {"id", "document_id", "page_number",
+"section", "type", "text"}; `--queries` is a JSON list of {"query",
+"relevant": [corpus ids]}. `--pdf` additionally measures partitioning
+throughput on real PDFs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+from langchain.schema import Document
+
+from evaluation.metrics import StageTimer, ranking_report, peak_rss_mb
+from evaluation.stub_client import StubTogetherClient
+from src.config.models import EMBEDDING_MODEL
+from src.config.retrieval import TOP_K_RETRIEVAL
+from src.core.generation.generation import Generation
+from src.core.helper.lru_cache import LRUCache
+from src.core.helper.model_registry import get_embedding_model
+from src.core.ingestion.graph.graph_builder import GraphBuilder, SQLiteGraphStore
+from src.core.ingestion.index.bm25_index import BM25Index
+from src.core.ingestion.index.cached_embeddings import CachedEmbeddings
+from src.core.ingestion.index.manifest import chunk_doc_id
+from src.core.ingestion.loader.summarizer import Summarizer
+from src.core.query.entity_extractor import EntityExtractor, KIND_SECTION, KIND_ENTITY
+from src.core.retrieval.graph_retriever import GraphRetriever
+from src.core.retrieval.hybrid_retriever import HybridRetriever
+from src.core.retrieval.reranker import Reranker
+from src.core.retrieval.retriever import Retriever
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _FixedRetriever:
+    """Hands Generation an already retrieved context so only generation is timed."""
+
+    def __init__(self):
+        self.docs = []
+
+    def retrieve(self, query, metadata_filter=None):
+        return self.docs
+
+
+def load_corpus(path: str):
+    with open(path) as f:
+        records = json.load(f)
+
+    docs, labels = [], {}
+    for record in records:
+        metadata = {
+            "source": record["document_id"],
+            "type": record.get("type", "text"),
+            "section": record.get("section", ""),
+            "heading": "",
+            "page_number": record.get("page_number", -1),
+        }
+        metadata["doc_id"] = chunk_doc_id(record["document_id"], record["text"], metadata)
+        labels[metadata["doc_id"]] = record["id"]
+        docs.append(Document(page_content=record["text"], metadata=metadata))
+    return docs, labels
+
+
+def ingest(docs, workdir: str, embedding, client, use_graph: bool, timer: StageTimer) -> dict:
+    from langchain.storage import InMemoryStore
+    from langchain_community.vectorstores import Chroma
+
+    texts = [doc for doc in docs if doc.metadata["type"] != "table"]
+    tables = [doc for doc in docs if doc.metadata["type"] == "table"]
+    persist_dir = os.path.join(workdir, "chroma")
+    full_vectorstore = Chroma(collection_name="bench_full", embedding_function=embedding,
+                              persist_directory=persist_dir)
+    summary_vectorstore = Chroma(collection_name="bench_summary", embedding_function=embedding,
+                                 persist_directory=persist_dir)
+    docstore = InMemoryStore()
+    sparse_index = BM25Index(os.path.join(workdir, "bm25.json.gz"))
+    graph_store = SQLiteGraphStore(os.path.join(workdir, "graph.sqlite3")) if use_graph else None
+
+    start = time.perf_counter()
+    with timer.stage("ingest.summarize"):
+        summaries = Summarizer(client=client, requests_per_minute=0).summarize_all(texts, tables, [])
+        summary_docs = summaries["texts"] + summaries["tables"]
+    with timer.stage("ingest.embed"):
+        full_vectorstore.add_documents(docs, ids=[doc.metadata["doc_id"] for doc in docs])
+        summary_vectorstore.add_documents(summary_docs, ids=[doc.metadata["doc_id"] for doc in summary_docs])
+    with timer.stage("ingest.sparse"):
+        sparse_index.add_documents(docs)
+    with timer.stage("ingest.persist"):
+        docstore.mset([
+            (doc.metadata["doc_id"], json.dumps({"page_content": doc.page_content, "metadata": doc.metadata}))
+            for doc in docs + summary_docs
+        ])
+    if graph_store is not None:
+        with timer.stage("ingest.graph"):
+            for document_id in sorted({doc.metadata["source"] for doc in docs}):
+                GraphBuilder(graph_store).index_documents(
+                    document_id, [doc for doc in docs if doc.metadata["source"] == document_id]
+                )
+    elapsed = time.perf_counter() - start
+
+    pages = len({(doc.metadata["source"], doc.metadata["page_number"]) for doc in docs})
+    return {
+        "vectorstore": full_vectorstore,
+        "docstore": docstore,
+        "sparse_index": sparse_index,
+        "graph_store": graph_store,
+        "report": {
+            "chunks": len(docs),
+            "pages": pages,
+            "summaries": len(summary_docs),
+            "llm_calls": client.calls,
+            "seconds": round(elapsed, 3),
+            "chunks_per_s": round(len(docs) / elapsed, 2) if elapsed else None,
+            "pages_per_s": round(pages / elapsed, 2) if elapsed else None,
+        },
+    }
+
+
+def bench_partition(pdf_paths, timer: StageTimer) -> dict:
+    from src.core.ingestion.loader.pdf_loader import UnstructuredPDFLoader
+
+    pages = chunks = 0
+    start = time.perf_counter()
+    for path in pdf_paths:
+        loader = UnstructuredPDFLoader(file_path=path, use_partition_cache=False)
+        with timer.stage("ingest.partition"):
+            texts, tables, _ = loader.process_pdf_content()
+        chunks += len(texts) + len(tables)
+        pages += len({doc.metadata.get("page_number") for doc in texts + tables})
+    elapsed = time.perf_counter() - start
+    return {
+        "files": len(pdf_paths),
+        "pages_with_content": pages,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else None,
+        "chunks_per_s": round(chunks / elapsed, 2) if elapsed else None,
+    }
+
+
+def build_retriever(stores: dict, embedding, mode: str) -> Retriever:
+    if mode == "dense":
+        return Retriever(stores["vectorstore"], stores["docstore"], embedding)
+
+    graph_retriever = None
+    if stores["graph_store"] is not None:
+        entity_extractor = EntityExtractor()
+        entity_extractor.add_terms(
+            [(name, KIND_SECTION) for name in stores["sparse_index"].metadata_values("section")] +
+            [(name, KIND_ENTITY) for name, _, kind in stores["graph_store"].entity_names() if kind == "entity"]
+        )
+        graph_retriever = GraphRetriever(stores["graph_store"], entity_extractor=entity_extractor)
+    return HybridRetriever(
+        stores["vectorstore"], stores["docstore"], embedding,
+        sparse_index=stores["sparse_index"],
+        graph_retriever=graph_retriever,
+    )
+
+
+def run_queries(queries, retriever, reranker, generator, labels, candidates_k, timer):
+    search_runs, reranked_runs = [], []
+    for item in queries:
+        query = item["query"]
+        start = time.perf_counter()
+        with timer.stage("query.search"):
+            if isinstance(retriever, HybridRetriever):
+                results = retriever.hybrid_search(query, candidates_k)
+            else:
+                results = retriever.dense_search(query, candidates_k)
+        with timer.stage("query.enrich"):
+            docs = [doc for doc in retriever.enrich(results) if doc.page_content]
+        with timer.stage("query.rerank"):
+            reranked = reranker.rerank(query, docs)
+        generator.retriever.docs = reranked[:TOP_K_RETRIEVAL]
+        with timer.stage("query.generate"):
+            generator.answer(query, {})
+        timer.record("query.total", (time.perf_counter() - start) * 1000)
+
+        ranked = [labels.get(doc.metadata.get("doc_id")) for doc in docs]
+        reranked_ids = [labels.get(doc.metadata.get("doc_id")) for doc in reranked]
+        search_runs.append({"ranked": ranked, "relevant": item["relevant"]})
+        reranked_runs.append({"ranked": reranked_ids, "relevant": item["relevant"]})
+    return search_runs, reranked_runs
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=os.path.join(FIXTURES_DIR, "corpus.json"))
+    parser.add_argument("--queries", default=os.path.join(FIXTURES_DIR, "queries.json"))
+    parser.add_argument("--mode", choices=["hybrid", "dense"], default="hybrid")
+    parser.add_argument("--no-graph", action="store_true", help="skip the graph stage and graph retrieval")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes over the query set")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub LLM latency in seconds")
+    parser.add_argument("--reranker-backend", default=None)
+    parser.add_argument("--warm-embeddings", action="store_true",
+                        help="use the persistent embedding cache (ingestion then measures cache hits)")
+    parser.add_argument("--pdf", nargs="*", default=[], help="PDFs to measure partition throughput on")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with open(args.queries) as f:
+        queries = json.load(f)
+    docs, labels = load_corpus(args.corpus)
+
+    embedding = get_embedding_model()
+    if not args.warm_embeddings:
+        # Fresh wrapper: same model, no persistent vectors, empty query LRU
+        embedding = CachedEmbeddings(embedding.model, EMBEDDING_MODEL)
+
+    reranker_kwargs = {"backend": args.reranker_backend} if args.reranker_backend else {}
+    reranker = Reranker(top_n=None, score_cache=LRUCache(0), **reranker_kwargs)
+    client = StubTogetherClient(latency=args.llm_latency, reply="Stub answer.")
+    generator = Generation(retriever=_FixedRetriever(), client=client)
+
+    timer = StageTimer()
+    report = {
+        "config": {
+            "revision": git_revision(),
+            "mode": args.mode,
+            "graph": args.mode == "hybrid" and not args.no_graph,
+            "candidates": args.candidates,
+            "top_k": TOP_K_RETRIEVAL,
+            "reranker_backend": reranker.backend,
+            "embedding_model": EMBEDDING_MODEL,
+            "llm_latency_s": args.llm_latency,
+            "repeats": args.repeats,
+        },
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_rag_") as workdir:
+        stores = ingest(docs, workdir, embedding, client,
+                        use_graph=report["config"]["graph"], timer=timer)
+        report["ingestion"] = stores["report"]
+        if args.pdf:
+            report["ingestion"]["partition"] = bench_partition(args.pdf, timer)
+
+        retriever = build_retriever(stores, embedding, args.mode)
+        retriever.reranker = reranker
+
+        # Warm-up pass loads models; its timings are discarded
+        run_queries(queries[:1], retriever, reranker, generator, labels, args.candidates, StageTimer())
+        search_runs = reranked_runs = None
+        for _ in range(max(1, args.repeats)):
+            search_runs, reranked_runs = run_queries(
+                queries, retriever, reranker, generator, labels, args.candidates, timer
+            )
+
+    report["retrieval"] = {
+        "search": ranking_report(search_runs, args.k),
+        "reranked": ranking_report(reranked_runs, args.k),
+    }
+    report["latency"] = timer.report()
+    report["peak_rss_mb"] = peak_rss_mb()
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Latency vs. ranking-quality benchmark for the reranker backends.
+
+The reference ranking is the PyTorch CrossEncoder scoring full passages
+(512 tokens). Each candidate configuration is compared against it.
+
+    python -m evaluation.bench_reranker --data queries.json --repeats 3
+
+`--data` is a JSON list of {"query": str, "docs": [str, ...]}; without it a
+small built-in set of long synthetic passages is used.
+"""
+import argparse
+import json
+import math
+import statistics
+import time
+
+from langchain.schema import Document
+
+from evaluation.metrics import percentile
+from src.core.helper.lru_cache import LRUCache
+from src.core.retrieval.reranker import Reranker
+
+_PARAGRAPHS = [
+    "The Transformer relies entirely on self-attention to compute representations of its input and output "
+    "without using sequence-aligned recurrence or convolution.",
+    "On the WMT 2014 English-to-German translation task the big model achieves a BLEU score of 28.4, "
+    "improving over the best previously reported results by more than 2 BLEU.",
+    "We trained on the standard WMT 2014 English-German dataset consisting of about 4.5 million sentence pairs "
+    "using byte-pair encoding with a shared vocabulary of about 37000 tokens.",
+    "Multi-head attention allows the model to jointly attend to information from different representation "
+    "subspaces at different positions.",
+    "We used the Adam optimizer with beta1 = 0.9, beta2 = 0.98 and varied the learning rate over the course "
+    "of training with a warmup of 4000 steps.",
+]
+
+_QUERIES = [
+    "What BLEU score does the big Transformer reach on English-German?",
+    "Which optimizer and warmup schedule were used?",
+    "How large is the training dataset?",
+    "Why use multi-head attention?",
+]
+
+
+def builtin_dataset(passage_chars: int = 8000) -> list:
+    dataset = []
+    for query in _QUERIES:
+        docs = []
+        for i, lead in enumerate(_PARAGRAPHS):
+            filler = " ".join(_PARAGRAPHS[(i + j) % len(_PARAGRAPHS)] for j in range(1, len(_PARAGRAPHS)))
+            text = lead
+            while len(text) < passage_chars:
+                text += " " + filler
+            docs.append(text[:passage_chars])
+        dataset.append({"query": query, "docs": docs})
+    return dataset
+
+
+def spearman(a: list, b: list) -> float:
+    def ranks(values):
+        order = sorted(range(len(values)), key=lambda i: values[i])
+        result = [0] * len(values)
+        for rank, i in enumerate(order):
+            result[i] = rank
+        return result
+
+    ra, rb = ranks(a), ranks(b)
+    n = len(a)
+    if n < 2:
+        return 1.0
+    d2 = sum((x - y) ** 2 for x, y in zip(ra, rb))
+    return 1 - 6 * d2 / (n * (n * n - 1))
+
+
+def ndcg_at_k(reference_scores: list, candidate_scores: list, k: int) -> float:
+    # Graded relevance = position in the reference ranking (best doc highest)
+    n = len(reference_scores)
+    ref_order = sorted(range(n), key=lambda i: -reference_scores[i])
+    relevance = {doc: n - rank for rank, doc in enumerate(ref_order)}
+    cand_order = sorted(range(n), key=lambda i: -candidate_scores[i])
+
+    dcg = sum(relevance[doc] / math.log2(rank + 2) for rank, doc in enumerate(cand_order[:k]))
+    idcg = sum(relevance[doc] / math.log2(rank + 2) for rank, doc in enumerate(ref_order[:k]))
+    return dcg / idcg if idcg else 1.0
+
+
+def score_dataset(reranker: Reranker, dataset: list, repeats: int):
+    latencies, all_scores = [], []
+    for item in dataset:
+        docs = [Document(page_content=d, metadata={"doc_id": str(i)}) for i, d in enumerate(item["docs"])]
+        scores = None
+        for _ in range(repeats):
+            reranker.score_cache.clear()
+            start = time.perf_counter()
+            scores = reranker.score(item["query"], docs)
+            latencies.append((time.perf_counter() - start) * 1000)
+        all_scores.append(scores)
+    return latencies, all_scores
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="JSON list of {query, docs}")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.data:
+        with open(args.data) as f:
+            dataset = json.load(f)
+    else:
+        dataset = builtin_dataset()
+
+    configs = {
+        "torch_full": dict(backend="torch", max_length=512),
+        "torch_truncated": dict(backend="torch", max_length=args.max_length),
+        "onnx_int8_truncated": dict(backend="onnx", max_length=args.max_length),
+    }
+
+    results = {}
+    reference = None
+    for name, config in configs.items():
+        reranker = Reranker(top_n=None, score_cache=LRUCache(0), **config)
+        if reranker.model is None:
+            results[name] = {"error": "model unavailable"}
+            continue
+
+        # Warm-up so one-off graph/session initialisation is not timed
+        score_dataset(reranker, dataset[:1], 1)
+        latencies, scores = score_dataset(reranker, dataset, args.repeats)
+        if reference is None:
+            reference = scores
+
+        results[name] = {
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "mean_ms": round(statistics.mean(latencies), 2),
+            "spearman_vs_reference": round(statistics.mean(spearman(r, s) for r, s in zip(reference, scores)), 4),
+            "top1_agreement": round(statistics.mean(
+                float(max(range(len(r)), key=r.__getitem__) == max(range(len(s)), key=s.__getitem__))
+                for r, s in zip(reference, scores)
+            ), 4),
+            f"ndcg@{args.k}_vs_reference": round(statistics.mean(
+                ndcg_at_k(r, s, args.k) for r, s in zip(reference, scores)
+            ), 4),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
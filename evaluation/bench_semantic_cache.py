@@ -0,0 +1,72 @@
+"""
+Similarity threshold measurement for the semantic answer cache.
+
+Embeds labelled query pairs with the production embedding model and
+reports the cosine similarities of paraphrases ("same": true) and of
+near-miss questions that need a different answer ("same": false), the
+lowest threshold without a false hit, and the hit rate on paraphrases at
+that threshold and at SEMANTIC_CACHE_THRESHOLD.
+
+    python -m evaluation.bench_semantic_cache --data evaluation/fixtures/query_pairs.json
+
+Near misses that differ only in numbers ("CIFAR-10" / "CIFAR-100") are
+reported both by raw cosine and after the cache's identifier-term check.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from src.config.cache import SEMANTIC_CACHE_THRESHOLD
+from src.core.generation.semantic_cache import identifier_terms
+from src.core.helper.model_registry import get_embedding_model
+
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), "fixtures", "query_pairs.json")
+
+
+def cosine(a, b) -> float:
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def hit_rate(scores, threshold: float) -> float:
+    return round(sum(s >= threshold for s in scores) / len(scores), 3) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        pairs = json.load(f)
+
+    embeddings = get_embedding_model()
+    rows = []
+    for pair in pairs:
+        score = cosine(embeddings.embed_query(pair["a"]), embeddings.embed_query(pair["b"]))
+        guarded = identifier_terms(pair["a"]) == identifier_terms(pair["b"])
+        rows.append({**pair, "cosine": round(score, 4), "terms_match": guarded})
+
+    same = [r["cosine"] for r in rows if r["same"]]
+    different = [r["cosine"] for r in rows if not r["same"]]
+    # Near misses the identifier-term check does not already reject
+    different_unguarded = [r["cosine"] for r in rows if not r["same"] and r["terms_match"]]
+    safe_threshold = round(max(different_unguarded) + 1e-4, 4) if different_unguarded else None
+
+    report = {
+        "pairs": rows,
+        "paraphrase_cosine": {"min": min(same, default=None), "max": max(same, default=None)},
+        "near_miss_cosine": {"min": min(different, default=None), "max": max(different, default=None)},
+        "lowest_threshold_without_false_hits": safe_threshold,
+        "paraphrase_hit_rate_at_safe_threshold": hit_rate(same, safe_threshold) if safe_threshold else None,
+        "configured_threshold": SEMANTIC_CACHE_THRESHOLD,
+        "paraphrase_hit_rate_at_configured": hit_rate(same, SEMANTIC_CACHE_THRESHOLD),
+        "false_hits_at_configured": sum(s >= SEMANTIC_CACHE_THRESHOLD for s in different_unguarded),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Offline throughput benchmark for Summarizer.
+
+    python -m evaluation.bench_summarizer --elements 40 --latency 0.5 --concurrency 1 3 8
+"""
+import argparse
+import json
+import time
+
+from langchain.schema import Document
+
+from evaluation.stub_client import StubTogetherClient
+from src.core.ingestion.loader.summarizer import Summarizer
+
+
+def run(n_elements: int, latency: float, concurrency: int, rpm: int, rate_limit_ratio: float) -> dict:
+    client = StubTogetherClient(latency=latency, rate_limit_ratio=rate_limit_ratio)
+    summarizer = Summarizer(client=client, max_concurrency=concurrency, requests_per_minute=rpm)
+    summarizer.engine.backoff_base = latency
+
+    texts = [Document(page_content=f"Chunk {i}", metadata={"page_number": i}) for i in range(n_elements)]
+
+    start = time.perf_counter()
+    summaries = summarizer.summarize_all(texts, [], [])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "elements": len(summaries["texts"]),
+        "calls": client.calls,
+        "max_in_flight": client.max_in_flight,
+        "seconds": round(elapsed, 3),
+        "elements_per_second": round(n_elements / elapsed, 2) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 3, 8])
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+
+    results = [
+        run(args.elements, args.latency, c, args.rpm, args.rate_limit_ratio)
+        for c in args.concurrency
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
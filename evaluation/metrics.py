@@ -0,0 +1,108 @@
+"""
+Retrieval-quality, latency and memory metrics shared by the benchmarks.
+
+Ranking metrics take the ranked list of retrieved ids and the set of ids
+labelled relevant for the query (binary relevance).
+"""
+import math
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Sequence
+
+
+def recall_at_k(ranked: Sequence[str], relevant: Iterable[str], k: int) -> float:
+    relevant = set(relevant)
+    if not relevant:
+        return 0.0
+    return len(relevant.intersection(ranked[:k])) / len(relevant)
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: Iterable[str]) -> float:
+    relevant = set(relevant)
+    for rank, doc_id in enumerate(ranked, start=1):
+        if doc_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: Sequence[str], relevant: Iterable[str], k: int) -> float:
+    relevant = set(relevant)
+    dcg = sum(1.0 / math.log2(rank + 2) for rank, doc_id in enumerate(ranked[:k]) if doc_id in relevant)
+    idcg = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return dcg / idcg if idcg else 0.0
+
+
+def ranking_report(runs: List[dict], ks: Sequence[int]) -> dict:
+    """Mean recall@k, MRR and nDCG@k over [{"ranked": [...], "relevant": [...]}, ...]."""
+    if not runs:
+        return {}
+    report = {"queries": len(runs), "mrr": round(statistics.mean(
+        reciprocal_rank(run["ranked"], run["relevant"]) for run in runs
+    ), 4)}
+    for k in ks:
+        report[f"recall@{k}"] = round(statistics.mean(
+            recall_at_k(run["ranked"], run["relevant"], k) for run in runs
+        ), 4)
+        report[f"ndcg@{k}"] = round(statistics.mean(
+            ndcg_at_k(run["ranked"], run["relevant"], k) for run in runs
+        ), 4)
+    return report
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def latency_summary(values_ms: Sequence[float]) -> dict:
+    if not values_ms:
+        return {"count": 0}
+    return {
+        "count": len(values_ms),
+        "mean_ms": round(statistics.mean(values_ms), 3),
+        "p50_ms": round(percentile(values_ms, 50), 3),
+        "p95_ms": round(percentile(values_ms, 95), 3),
+        "p99_ms": round(percentile(values_ms, 99), 3),
+        "max_ms": round(max(values_ms), 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, or -1 where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return -1.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class StageTimer:
+    """Collects wall-clock durations per named stage."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, elapsed_ms: float):
+        self.samples.setdefault(name, []).append(elapsed_ms)
+
+    def total_seconds(self, name: str) -> float:
+        return sum(self.samples.get(name, [])) / 1000
+
+    def report(self) -> dict:
+        return {name: latency_summary(values) for name, values in self.samples.items()}
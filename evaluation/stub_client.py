@@ -0,0 +1,48 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class StubAPIError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StubTogetherClient:
+    """
+    Offline stand-in for the Together client.
+
+    Mimics `client.chat.completions.create` with a configurable latency and
+    an optional fraction of simulated 429 responses, so summarization and
+    generation throughput can be measured without network access.
+    """
+
+    def __init__(self, latency: float = 0.2, rate_limit_ratio: float = 0.0, seed: int = 0,
+                 reply: str = "Stub summary."):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.reply = reply
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: list, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            rate_limited = self._random.random() < self.rate_limit_ratio
+        try:
+            time.sleep(self.latency)
+            if rate_limited:
+                raise StubAPIError("Simulated rate limit", status_code=429)
+            message = SimpleNamespace(content=self.reply)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        finally:
+            with self._lock:
+                self._in_flight -= 1
@@ -1,13 +1,21 @@
 import os
 import json
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from langchain.schema import Document
 
-from src.loader.pdf_loader import UnstructuredPDFLoader
-from src.loader.summarizer import Summarizer
-from src.index.vector_store import VectorStoreManager
-from src.retrieval.retriever import Retriever
-from src.retrieval.retriever_summary import SummaryRetriever
+from src.core.ingestion.loader.pdf_loader import UnstructuredPDFLoader
+from src.core.ingestion.loader.summarizer import Summarizer
+from src.core.ingestion.index.vector_store import VectorStoreManager
+from src.core.retrieval.retriever import Retriever
+from src.core.retrieval.hybrid_retriever import HybridRetriever
+from src.config.retrieval import RETRIEVAL_MODE
+from src.config.graph import GRAPH_ENABLED
+from src.core.ingestion.graph.graph_builder import GraphBuilder, get_graph_store
+from src.core.retrieval.graph_retriever import GraphRetriever
+from src.core.query.entity_extractor import EntityExtractor, KIND_SECTION, KIND_HEADING, KIND_ENTITY
+from src.core.ingestion.index.manifest import DocumentManifest, summary_doc_id
+from src.core.ingestion.index.summary_artifacts import SummaryArtifacts
+from src.core.ingestion.loader.hierarchical_summarizer import HierarchicalSummarizer
 
 
 def load_pdf(file_path: str, image_output_dir: str = "./data") -> UnstructuredPDFLoader:
@@ -24,22 +32,80 @@ def load_pdf(file_path: str, image_output_dir: str = "./data") -> UnstructuredPD
     )
 
 
-def summarize_content(texts: List[Document], tables: List[Document], images_b64: List[str]) -> Dict[str, List[Document]]:
+def summarize_content(
+    texts: List[Document],
+    tables: List[Document],
+    image_paths: List[str],
+    image_metadata: List[dict] = None
+) -> Dict[str, List[Document]]:
     summarizer = Summarizer()
-    return summarizer.summarize_all(texts, tables, images_b64)
+    return summarizer.summarize_all(texts, tables, image_paths, image_metadata)
 
 
-def initialize_vector_stores(
-    full_docs: List[Document],
-    summary_docs: List[Document]
-) -> Tuple[VectorStoreManager, VectorStoreManager]:
+def initialize_vector_stores() -> Tuple[VectorStoreManager, VectorStoreManager]:
     full_store = VectorStoreManager(collection_name="full_content")
     summary_store = VectorStoreManager(collection_name="summary_content")
+    return full_store, summary_store
 
-    full_store.add_documents(full_docs)
-    summary_store.add_documents(summary_docs)
 
-    return full_store, summary_store
+def initialize_graph_builder() -> Optional[GraphBuilder]:
+    if not GRAPH_ENABLED:
+        return None
+    try:
+        return GraphBuilder(get_graph_store())
+    except Exception as e:
+        print(f"[pdf_utils] Graph store unavailable, skipping graph stage: {e}")
+        return None
+
+
+def dedupe_by_doc_id(documents: List[Document]) -> List[Document]:
+    seen = set()
+    unique = []
+    for doc in documents:
+        doc_id = doc.metadata["doc_id"]
+        if doc_id not in seen:
+            seen.add(doc_id)
+            unique.append(doc)
+    return unique
+
+
+def build_manifest(
+    document_id: str,
+    file_hash: str,
+    full_docs: List[Document],
+    image_metadata: List[dict],
+    section_titles: set = None
+) -> DocumentManifest:
+    chunks = {doc.metadata["doc_id"]: [summary_doc_id(doc.metadata["doc_id"])] for doc in full_docs}
+    images = {md["doc_id"]: [summary_doc_id(md["doc_id"])] for md in image_metadata}
+    return DocumentManifest(document_id, file_hash, chunks=chunks, images=images,
+                            section_titles=list(section_titles or []))
+
+
+def remove_stale_entries(
+    full_store: VectorStoreManager,
+    summary_store: VectorStoreManager,
+    previous: Optional[DocumentManifest],
+    current: DocumentManifest,
+    graph_builder: Optional[GraphBuilder] = None
+) -> int:
+    """Delete chunks (and their summaries) that are no longer part of the document."""
+    if previous is None:
+        return 0
+
+    stale_sources = {
+        source_id: derived_ids
+        for source_id, derived_ids in list(previous.chunks.items()) + list(previous.images.items())
+        if source_id not in current.chunks and source_id not in current.images
+    }
+    if not stale_sources:
+        return 0
+
+    full_store.delete_documents(list(stale_sources))
+    summary_store.delete_documents([i for derived_ids in stale_sources.values() for i in derived_ids])
+    if graph_builder is not None:
+        graph_builder.remove_chunks(list(stale_sources))
+    return len(stale_sources)
 
 
 def persist_to_docstore(store, documents: List[Document]):
@@ -54,23 +120,95 @@ def persist_to_docstore(store, documents: List[Document]):
     ])
 
 
-def initialize_retrievers(
-    full_store: VectorStoreManager,
+def load_from_docstore(store, ids: List[str]) -> List[Document]:
+    """Documents for `ids` in order; ids missing from the docstore are skipped."""
+    docs = []
+    for doc_id, raw in zip(ids, store.docstore.mget(ids) if ids else []):
+        if not raw:
+            continue
+        try:
+            docs.append(Document(**json.loads(raw)))
+        except Exception as e:
+            print(f"[pdf_utils] Failed to parse doc_id={doc_id}: {e}")
+    return docs
+
+
+def reading_order(doc: Document) -> Tuple[float, int]:
+    """Sort key: page, then position among the partitioned chunks."""
+    page = doc.metadata.get("page_number", -1)
+    page = page if isinstance(page, int) and page >= 0 else float("inf")
+    return page, doc.metadata.get("element_index", 0)
+
+
+def refresh_summary_artifacts(
     summary_store: VectorStoreManager,
-    pdf_loader: UnstructuredPDFLoader
-) -> Tuple[Retriever, SummaryRetriever]:
-    summary_retriever = SummaryRetriever(
-        vectorstore=summary_store.get_vectorstore(),
-        docstore=summary_store.get_docstore(),
-        embedding_function=summary_store.embedding_model,
-        pdf_loader=pdf_loader
+    manifest: DocumentManifest,
+    section_titles: set = None
+) -> SummaryArtifacts:
+    """Reduce all of a document's chunk summaries into section and document summaries."""
+    existing = summary_store.summary_artifacts.get(manifest.document_id, manifest.file_hash)
+    if existing is not None:
+        return existing
+
+    summary_ids = [i for derived_ids in manifest.chunks.values() for i in derived_ids]
+    # Manifests list texts before tables; the reduce expects reading order
+    summaries = sorted(load_from_docstore(summary_store, summary_ids), key=reading_order)
+    artifacts = HierarchicalSummarizer().summarize(
+        manifest.document_id, manifest.file_hash, summaries, section_titles
     )
+    summary_store.summary_artifacts.save(artifacts)
+    print(f"[pdf_utils] Stored summary artifacts for {manifest.document_id} "
+          f"({len(artifacts.sections)} sections)")
+    return artifacts
+
 
-    detail_retriever = Retriever(
-        vectorstore=full_store.get_vectorstore(),
-        docstore=full_store.get_docstore(),
-        embedding_function=full_store.embedding_model,
-        summary_retriever=summary_retriever
+def refresh_gazetteer(
+    entity_extractor: EntityExtractor,
+    full_store: VectorStoreManager,
+    graph_builder: Optional[GraphBuilder] = None
+) -> int:
+    """Feed section titles, headings and graph entity names to the query gazetteer."""
+    sparse_index = full_store.get_sparse_index()
+    terms = [(name, KIND_SECTION) for name in sparse_index.metadata_values("section")]
+    terms += [(name, KIND_HEADING) for name in sparse_index.metadata_values("heading")]
+    if graph_builder is not None:
+        try:
+            terms += [(name, KIND_ENTITY) for name, _, kind in graph_builder.store.entity_names() if kind == "entity"]
+        except Exception as e:
+            print(f"[pdf_utils] Could not read graph entities for the gazetteer: {e}")
+    # Only terms the gazetteer has not seen trigger a rebuild
+    return entity_extractor.add_terms(terms)
+
+
+def build_retriever(store: VectorStoreManager, graph_store=None, entity_extractor: EntityExtractor = None) -> Retriever:
+    if RETRIEVAL_MODE == "hybrid":
+        return HybridRetriever(
+            vectorstore=store.get_vectorstore(),
+            docstore=store.get_docstore(),
+            embedding_function=store.embedding_model,
+            sparse_index=store.get_sparse_index(),
+            graph_retriever=GraphRetriever(graph_store, entity_extractor=entity_extractor)
+            if graph_store is not None else None,
+        )
+    return Retriever(
+        vectorstore=store.get_vectorstore(),
+        docstore=store.get_docstore(),
+        embedding_function=store.embedding_model,
+    )
+
+
+def initialize_retrievers(
+    full_store: VectorStoreManager,
+    summary_store: VectorStoreManager,
+    graph_builder: Optional[GraphBuilder] = None,
+    entity_extractor: EntityExtractor = None
+) -> Tuple[Retriever, Retriever]:
+    # Retrievers span every document in the shared collections; scoping is a metadata filter.
+    # Both share the registry's embedding and reranker models
+    summary_retriever = build_retriever(summary_store)
+    # The graph links entities to full-content chunk ids
+    detail_retriever = build_retriever(
+        full_store, graph_builder.store if graph_builder else None, entity_extractor
     )
 
-    return detail_retriever, summary_retriever
\ No newline at end of file
+    return detail_retriever, summary_retriever
@@ -1,8 +1,19 @@
+import asyncio
+import hashlib
 import os
-from fastapi import APIRouter, UploadFile, Query
+import json
+import tempfile
+from typing import Optional, Tuple
+from fastapi import APIRouter, UploadFile, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from src.api.services.qa_service import QAService
+from src.api.services.ingestion_jobs import IngestionJobManager, IngestionQueueFull
+from src.core.ingestion.index.corpus_registry import DocumentConflict, UnknownDocument
+from src.core.ingestion.index.manifest import document_id_for
+from src.config.llm import DISCONNECT_POLL_SECONDS
 
 qa_service = QAService()
+job_manager = IngestionJobManager(run_fn=qa_service.load_and_index_pdf)
 router = APIRouter()
 
 # Project root directory
@@ -10,16 +21,117 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-@router.post("/upload")
-async def upload_pdf(file: UploadFile):
-    # Save file into /data/
-    file_path = os.path.join(DATA_DIR, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+async def save_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Store an upload under data/uploads/<content hash>/<filename>. Each
+    revision gets its own path, so a queued or running ingestion of an
+    earlier revision never sees its file overwritten; the file name (and so
+    the document id) is unchanged. Returns (path, sha256 of the content).
+    """
+    upload_dir = os.path.join(DATA_DIR, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload_", dir=upload_dir)
+    sha = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                block = await file.read(1 << 20)
+                if not block:
+                    break
+                sha.update(block)
+                f.write(block)
+        revision_dir = os.path.join(upload_dir, sha.hexdigest()[:32])
+        os.makedirs(revision_dir, exist_ok=True)
+        file_path = os.path.join(revision_dir, os.path.basename(file.filename))
+        # Same content, same path: replacing it with identical bytes is harmless
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return file_path, sha.hexdigest()
 
-    result = qa_service.load_and_index_pdf(file_path)
-    return {"message": "PDF processed", "stats": result}
+@router.post("/upload", status_code=202)
+async def upload_pdf(file: UploadFile, replace: bool = False):
+    # replace=true: the file is a new revision of the indexed document with the same name
+    file_path, file_hash = await save_upload(file)
+    try:
+        await asyncio.to_thread(qa_service.check_upload, document_id_for(file_path), file_hash, replace)
+    except DocumentConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    # Partition / summarize / embed run in the background worker pool
+    try:
+        job = job_manager.submit(file_path, replace=replace)
+    except IngestionQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"message": "PDF queued for processing", "job_id": job["job_id"], "status": job["status"]}
+
+@router.get("/jobs")
+def list_jobs(limit: int = 50):
+    return job_manager.list(limit)
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@router.get("/documents")
+def list_documents():
+    return qa_service.list_documents()
+
+async def cancel_on_disconnect(request: Request, coro):
+    """Await `coro`, cancelling it (and the LLM call behind it) if the client disconnects first."""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                # 499: client closed request; nobody is left to read the response
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
 
 @router.get("/query")
-def query_pdf(q: str = Query(..., alias="question")):
-    return qa_service.answer_query(q)
\ No newline at end of file
+async def query_pdf(request: Request, q: str = Query(..., alias="question"), document_id: Optional[str] = None):
+    # Without document_id the question is answered from the whole corpus
+    try:
+        return await cancel_on_disconnect(request, qa_service.aanswer_query(q, document_id))
+    except UnknownDocument:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+
+@router.get("/query/stream")
+async def stream_query_pdf(q: str = Query(..., alias="question"), document_id: Optional[str] = None):
+    try:
+        info, tokens = await qa_service.astream_answer_query(q, document_id)
+    except UnknownDocument:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+
+    # Server-sent events: "route" and "filter" events, then answer tokens, then "done".
+    # On disconnect Starlette stops iterating, which closes the upstream LLM stream.
+    async def event_stream():
+        yield f"event: route\ndata: {json.dumps(info['route'])}\n\n"
+        yield f"event: filter\ndata: {json.dumps(info['filter'])}\n\n"
+        async for token in tokens:
+            yield f"data: {json.dumps({'token': token})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/models")
+def loaded_models():
+    return qa_service.model_memory_report()
+
+@router.get("/cache/stats")
+def cache_stats():
+    return qa_service.cache_stats()
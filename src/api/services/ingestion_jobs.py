@@ -0,0 +1,227 @@
+import json
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional
+
+from src.config.ingestion import (
+    INGESTION_WORKERS,
+    INGESTION_MAX_QUEUED,
+    INGESTION_JOB_BACKEND,
+    INGESTION_JOB_TTL_SECONDS,
+    INGESTION_JOB_REDIS_PREFIX,
+    INGESTION_STAGES,
+)
+from src.config.redis import REDIS_URL
+from src.core.helper.telemetry import telemetry
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+STAGE_PENDING = "pending"
+STAGE_SKIPPED = "skipped"
+
+
+class IngestionQueueFull(Exception):
+    pass
+
+
+class InMemoryJobStore:
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: dict):
+        with self._lock:
+            self._jobs[job["job_id"]] = json.loads(json.dumps(job))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def list(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j["created_at"], reverse=True)
+            return json.loads(json.dumps(jobs[:limit]))
+
+
+class RedisJobStore:
+    """Job records as JSON strings with a TTL, indexed by a creation-time sorted set."""
+
+    def __init__(self, redis_client=None, prefix: str = INGESTION_JOB_REDIS_PREFIX,
+                 ttl_seconds: int = INGESTION_JOB_TTL_SECONDS):
+        if redis_client is None:
+            from redis import Redis
+            redis_client = Redis.from_url(REDIS_URL)
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self._index_key = f"{prefix}__index"
+
+    def save(self, job: dict):
+        pipe = self.redis.pipeline()
+        pipe.set(self.prefix + job["job_id"], json.dumps(job), ex=self.ttl_seconds)
+        pipe.zadd(self._index_key, {job["job_id"]: job["created_at"]})
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raw = self.redis.get(self.prefix + job_id)
+        return json.loads(raw) if raw else None
+
+    def list(self, limit: int = 50) -> List[dict]:
+        job_ids = self.redis.zrevrange(self._index_key, 0, limit - 1)
+        jobs = []
+        for job_id in job_ids:
+            job = self.get(job_id.decode() if isinstance(job_id, bytes) else job_id)
+            if job:
+                jobs.append(job)
+        return jobs
+
+
+class JobProgress:
+    """Records per-stage status, timing and details for one job."""
+
+    def __init__(self, job: dict, store):
+        self.job = job
+        self.store = store
+        self._lock = threading.Lock()
+
+    def _save(self):
+        self.job["updated_at"] = time.time()
+        self.store.save(self.job)
+
+    @contextmanager
+    def stage(self, name: str):
+        stage = self.job["stages"].setdefault(name, {"status": STAGE_PENDING})
+        details = {}
+        with self._lock:
+            stage.update({"status": JOB_RUNNING, "started_at": time.time()})
+            self.job["current_stage"] = name
+            self._save()
+
+        start = time.perf_counter()
+        try:
+            yield details
+        except Exception as e:
+            with self._lock:
+                stage.update({
+                    "status": JOB_FAILED,
+                    "seconds": round(time.perf_counter() - start, 3),
+                    "error": str(e),
+                    **details,
+                })
+                self._save()
+            raise
+
+        with self._lock:
+            stage.update({
+                "status": JOB_SUCCEEDED,
+                "seconds": round(time.perf_counter() - start, 3),
+                "finished_at": time.time(),
+                **details,
+            })
+            self._save()
+
+    def skip_remaining(self):
+        with self._lock:
+            for stage in self.job["stages"].values():
+                if stage["status"] == STAGE_PENDING:
+                    stage["status"] = STAGE_SKIPPED
+            self._save()
+
+
+@contextmanager
+def ingestion_stage(progress: Optional[JobProgress], name: str):
+    """Stage context for callers that may run with or without a job; always traced."""
+    with telemetry.span(f"ingest_{name}"):
+        with (progress.stage(name) if progress is not None else nullcontext({})) as stage:
+            yield stage
+
+
+class IngestionJobManager:
+    """
+    Runs ingestion jobs on a bounded worker pool.
+
+    At most `max_workers` files are processed at once and at most
+    `max_queued` more may wait; beyond that, submit() raises
+    IngestionQueueFull so the API can push back instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        run_fn: Callable[..., dict],
+        max_workers: int = INGESTION_WORKERS,
+        max_queued: int = INGESTION_MAX_QUEUED,
+        backend: str = INGESTION_JOB_BACKEND,
+    ):
+        self.run_fn = run_fn
+        self.store = RedisJobStore() if backend == "redis" else InMemoryJobStore()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+
+    def submit(self, file_path: str, **kwargs) -> dict:
+        if not self._slots.acquire(blocking=False):
+            raise IngestionQueueFull("Too many ingestion jobs in progress, retry later.")
+
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "file_path": file_path,
+            "status": JOB_QUEUED,
+            "current_stage": None,
+            "stages": {name: {"status": STAGE_PENDING} for name in INGESTION_STAGES},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "seconds": None,
+        }
+        self.store.save(job)
+
+        try:
+            self._executor.submit(self._run, job, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        return job
+
+    def _run(self, job: dict, kwargs: dict):
+        progress = JobProgress(job, self.store)
+        start = time.perf_counter()
+        job.update({"status": JOB_RUNNING, "started_at": time.time()})
+        self.store.save(job)
+
+        try:
+            job["result"] = self.run_fn(job["file_path"], progress=progress, **kwargs)
+            job["status"] = JOB_SUCCEEDED
+        except Exception as e:
+            print(f"[IngestionJobManager] Job {job['job_id']} failed: {e}")
+            job["status"] = JOB_FAILED
+            job["error"] = {"message": str(e), "type": type(e).__name__,
+                            "traceback": traceback.format_exc(limit=5)}
+        finally:
+            progress.skip_remaining()
+            job.update({
+                "current_stage": None,
+                "finished_at": time.time(),
+                "seconds": round(time.perf_counter() - start, 3),
+            })
+            self.store.save(job)
+            self._slots.release()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def list(self, limit: int = 50) -> List[dict]:
+        return self.store.list(limit)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -1,17 +1,32 @@
+import asyncio
 import os
-from typing import Dict
+import threading
+from typing import AsyncIterator, Dict, Iterator, List, Tuple
 from dotenv import load_dotenv
 
-from src.retrieval.metadata_filter import MetadataFilterExtractor
-from core.generation.generation import Generation
-from src.retrieval.retriever import Retriever
-from src.retrieval.retriever_summary import SummaryRetriever
+from src.core.retrieval.metadata_filter import MetadataFilterExtractor
+from src.core.retrieval.retriever import Retriever
+from src.core.helper.model_registry import model_registry, get_embedding_model, get_intent_classifier, get_llm_gateway
+from src.core.helper.completion_cache import get_completion_cache
+from src.core.generation.semantic_cache import SemanticAnswerCache
+from src.core.query.query_router import QueryRouter
+from src.core.query.entity_extractor import EntityExtractor
+from src.core.orchestration.rag_pipeline import RAGPipeline
+from src.core.ingestion.index.corpus_registry import CorpusRegistry, DocumentConflict
+from src.api.services.ingestion_jobs import JobProgress, ingestion_stage
+from src.config.cache import SEMANTIC_CACHE_ENABLED
 
 from src.api.helper.pdf_utils import (
     load_pdf,
     summarize_content,
     initialize_vector_stores,
     persist_to_docstore,
+    dedupe_by_doc_id,
+    build_manifest,
+    remove_stale_entries,
+    refresh_summary_artifacts,
+    initialize_graph_builder,
+    refresh_gazetteer,
     initialize_retrievers,
 )
 
@@ -21,55 +36,246 @@ class QAService:
     def __init__(self):
         self.full_store = None
         self.summary_store = None
+        self.graph_builder = None
+        # Query gazetteer, grown as documents are ingested
+        self.entity_extractor = EntityExtractor()
         self.detail_retriever: Retriever = None
-        self.summary_retriever: SummaryRetriever = None
+        self.summary_retriever: Retriever = None
+        self.filter_extractor: MetadataFilterExtractor = None
+        self.router: QueryRouter = None
+        self.pipeline: RAGPipeline = None
+        # Documents already indexed in the persistent stores
+        self.corpus: CorpusRegistry = None
+        self.answer_cache = SemanticAnswerCache() if SEMANTIC_CACHE_ENABLED else None
+        self._lock = threading.Lock()
+        self._document_locks: Dict[str, threading.Lock] = {}
 
-    def load_and_index_pdf(self, file_path: str, image_output_dir: str = "./data") -> Dict[str, int]:
+    def _ensure_stores(self):
+        with self._lock:
+            if self.full_store is None:
+                self.full_store, self.summary_store = initialize_vector_stores()
+                self.graph_builder = initialize_graph_builder()
+                # Terms of everything indexed before this process started
+                refresh_gazetteer(self.entity_extractor, self.full_store, self.graph_builder)
+            if self.corpus is None:
+                corpus = CorpusRegistry(self.full_store.manifests)
+                corpus.attach()
+                self.corpus = corpus
+
+    def attach(self) -> int:
+        """Attach to the persisted collections, docstore and manifests; returns the document count."""
+        self._ensure_stores()
+        return len(self.corpus)
+
+    def _document_lock(self, document_id: str) -> threading.Lock:
+        with self._lock:
+            return self._document_locks.setdefault(document_id, threading.Lock())
+
+    def check_upload(self, document_id: str, file_hash: str, replace: bool = False):
+        """Raise DocumentConflict when `file_hash` would silently replace a different indexed file."""
+        self._ensure_stores()
+        previous = self.full_store.manifests.get(document_id)
+        if previous is not None and previous.file_hash != file_hash and not replace:
+            raise DocumentConflict(
+                f"A different file is already indexed as {document_id}; "
+                f"upload with replace=true to index this one as its new revision, or rename it."
+            )
+
+    def load_and_index_pdf(
+        self,
+        file_path: str,
+        image_output_dir: str = "./data",
+        progress: JobProgress = None,
+        replace: bool = False,
+    ) -> Dict[str, int]:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Load and chunk
         pdf_loader = load_pdf(file_path, image_output_dir)
-        full_texts, full_tables, images_b64 = pdf_loader.process_pdf_content()
+        self._ensure_stores()
+
+        # Uploads of different documents run in parallel; revisions of one document do not
+        with self._document_lock(pdf_loader.document_id):
+            # Re-checked under the lock: another upload of the name may have finished meanwhile
+            self.check_upload(pdf_loader.document_id, pdf_loader.get_file_hash(), replace)
+            return self._index_pdf(pdf_loader, progress)
+
+    def _index_pdf(self, pdf_loader, progress: JobProgress = None) -> Dict[str, int]:
+        # Unchanged file: nothing to partition, summarize or embed
+        previous = self.full_store.manifests.get(pdf_loader.document_id)
+        file_hash = pdf_loader.get_file_hash()
+        if previous is not None and previous.file_hash == file_hash:
+            print(f"[QAService] {pdf_loader.document_id} is unchanged, skipping ingestion")
+            # No-op when artifacts for this file hash already exist
+            refresh_summary_artifacts(self.summary_store, previous, set(previous.section_titles) or None)
+            self.corpus.register(previous)
+            return {
+                "document_id": pdf_loader.document_id,
+                "status": "unchanged",
+                "chunks": len(previous.chunks),
+                "images": len(previous.images),
+                "added": 0,
+                "removed": 0,
+            }
+
+        # Load and chunk
+        with ingestion_stage(progress, "partition") as stage:
+            full_texts, full_tables, images = pdf_loader.process_pdf_content()
+            full_texts = dedupe_by_doc_id(full_texts)
+            full_tables = dedupe_by_doc_id(full_tables)
+            image_metadata = pdf_loader.get_image_metadata(images)
+            stage.update({"texts": len(full_texts), "tables": len(full_tables), "images": len(images)})
+            stage["images_skipped"] = pdf_loader.image_loader.stats.get("found", 0) - len(images)
+
+        # Only chunks whose content-derived id is new need summarizing and embedding
+        known_ids = set(previous.chunks) | set(previous.images) if previous else set()
+        new_texts = [doc for doc in full_texts if doc.metadata["doc_id"] not in known_ids]
+        new_tables = [doc for doc in full_tables if doc.metadata["doc_id"] not in known_ids]
+        new_images = {}
+        for image, md in zip(images, image_metadata):
+            if md["doc_id"] not in known_ids:
+                new_images.setdefault(md["doc_id"], (image.path, md))
 
         # Summarize
-        summary_results = summarize_content(full_texts, full_tables, images_b64)
+        with ingestion_stage(progress, "summarize") as stage:
+            summary_results = summarize_content(
+                new_texts,
+                new_tables,
+                [path for path, _ in new_images.values()],
+                [md for _, md in new_images.values()],
+            )
+            stage["items"] = len(new_texts) + len(new_tables) + len(new_images)
         summarized_texts = summary_results["texts"]
         summarized_tables = summary_results["tables"]
         summarized_images = summary_results["images"]
 
         # Combine documents
-        full_docs = full_texts + full_tables
+        full_docs = new_texts + new_tables
         summary_docs = summarized_texts + summarized_tables + summarized_images
 
-        # Init vector stores and persist
-        self.full_store, self.summary_store = initialize_vector_stores(full_docs, summary_docs)
-        persist_to_docstore(self.full_store, full_docs)
-        persist_to_docstore(self.summary_store, summary_docs)
+        # Embed the new entries
+        with ingestion_stage(progress, "embed") as stage:
+            self.full_store.add_documents(full_docs)
+            self.summary_store.add_documents(summary_docs)
+            stage["documents"] = len(full_docs) + len(summary_docs)
+
+        # Persist originals, drop entries that disappeared, record the manifest
+        with ingestion_stage(progress, "persist") as stage:
+            persist_to_docstore(self.full_store, full_docs)
+            persist_to_docstore(self.summary_store, summary_docs)
 
-        # Init retrievers
-        self.detail_retriever, self.summary_retriever = initialize_retrievers(
-            full_store=self.full_store,
-            summary_store=self.summary_store,
-            pdf_loader=pdf_loader
-        )
+            manifest = build_manifest(
+                pdf_loader.document_id,
+                file_hash,
+                full_texts + full_tables,
+                image_metadata,
+                pdf_loader.section_titles,
+            )
+            removed = remove_stale_entries(
+                self.full_store, self.summary_store, previous, manifest, self.graph_builder
+            )
+            # One BM25 write per store per ingestion, before the manifest records it as indexed
+            self.full_store.save_sparse_index()
+            self.summary_store.save_sparse_index()
+            self.full_store.manifests.save(manifest)
+            stage["removed"] = removed
+
+        # Entities, relations and citations of the new chunks
+        with ingestion_stage(progress, "graph") as stage:
+            if self.graph_builder is not None:
+                stage.update(self.graph_builder.index_documents(pdf_loader.document_id, full_docs))
+            stage["gazetteer_terms_added"] = refresh_gazetteer(
+                self.entity_extractor, self.full_store, self.graph_builder
+            )
+
+        # Map-reduce chunk summaries into section and document summaries
+        with ingestion_stage(progress, "reduce") as stage:
+            artifacts = refresh_summary_artifacts(self.summary_store, manifest, pdf_loader.section_titles)
+            stage["sections"] = len(artifacts.sections)
+
+        # Queryable from here on, alongside every other document
+        self.corpus.register(manifest)
 
         return {
+            "document_id": pdf_loader.document_id,
+            "status": "updated" if previous else "created",
             "texts": len(full_texts),
             "tables": len(full_tables),
-            "images": len(summarized_images),
+            "images": len(manifest.images),
+            "added": len(full_docs) + len(summarized_images),
+            "removed": removed,
         }
 
-    def answer_query(self, query: str) -> Dict:
-        if self.detail_retriever is None:
-            raise RuntimeError("PDF not loaded. Call load_and_index_pdf() first.")
+    def _get_pipeline(self) -> RAGPipeline:
+        self._ensure_stores()
+        if not len(self.corpus):
+            self.corpus.sync()
+        if not len(self.corpus):
+            raise RuntimeError("No documents indexed. Upload a PDF first.")
+
+        with self._lock:
+            if self.pipeline is None:
+                self.detail_retriever, self.summary_retriever = initialize_retrievers(
+                    full_store=self.full_store,
+                    summary_store=self.summary_store,
+                    graph_builder=self.graph_builder,
+                    entity_extractor=self.entity_extractor,
+                )
+                if self.filter_extractor is None:
+                    self.filter_extractor = MetadataFilterExtractor(self.entity_extractor)
+                if self.router is None:
+                    try:
+                        intent_classifier = get_intent_classifier()
+                    except Exception as e:
+                        print(f"[QAService] Intent classifier unavailable, routing by rules only: {e}")
+                        intent_classifier = None
+                    self.router = QueryRouter(intent_classifier)
+                self.pipeline = RAGPipeline(
+                    store=self.full_store,
+                    retriever=self.detail_retriever,
+                    router=self.router,
+                    filter_extractor=self.filter_extractor,
+                    artifacts=self.summary_store.summary_artifacts,
+                    answer_cache=self.answer_cache,
+                    corpus=self.corpus,
+                )
+            return self.pipeline
+
+    def _scoped_pipeline(self, document_id: str = None) -> Tuple[RAGPipeline, str]:
+        pipeline = self._get_pipeline()
+        return pipeline, self.corpus.resolve(document_id)
+
+    def answer_query(self, query: str, document_id: str = None) -> Dict:
+        pipeline, document_id = self._scoped_pipeline(document_id)
+        return pipeline.answer(query, document_id)
 
-        metadata_filter = MetadataFilterExtractor().extract(query)
-        generator = Generation(retriever=self.detail_retriever)
-        answer = generator.answer(query, metadata_filter)
+    def stream_answer_query(self, query: str, document_id: str = None) -> Tuple[dict, Iterator[str]]:
+        pipeline, document_id = self._scoped_pipeline(document_id)
+        return pipeline.stream(query, document_id)
 
+    async def aanswer_query(self, query: str, document_id: str = None) -> Dict:
+        # First use may load stores and models; keep that off the event loop
+        pipeline, document_id = await asyncio.to_thread(self._scoped_pipeline, document_id)
+        return await pipeline.aanswer(query, document_id)
+
+    async def astream_answer_query(self, query: str, document_id: str = None) -> Tuple[dict, AsyncIterator[str]]:
+        pipeline, document_id = await asyncio.to_thread(self._scoped_pipeline, document_id)
+        return await pipeline.astream(query, document_id)
+
+    def list_documents(self) -> List[dict]:
+        self._ensure_stores()
+        return self.corpus.documents()
+
+    def model_memory_report(self) -> Dict[str, dict]:
+        return model_registry.memory_report()
+
+    def cache_stats(self) -> Dict[str, dict]:
+        completion_cache = get_completion_cache()
+        # Report embedding stats without forcing the model to load
+        embeddings = get_embedding_model().stats() if self.full_store is not None else None
         return {
-            "query": query,
-            "filter": metadata_filter,
-            "answer": answer,
-        }
\ No newline at end of file
+            "completions": completion_cache.stats() if completion_cache else None,
+            "embeddings": embeddings,
+            "answers": self.answer_cache.stats() if self.answer_cache else None,
+            "llm_gateway": get_llm_gateway().stats() if model_registry.is_loaded("llm_gateway:together") else None,
+        }
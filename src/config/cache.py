@@ -0,0 +1,30 @@
+# LLM / vision completion cache
+# Backend: "disk" (SQLite file), "redis" or "none"
+COMPLETION_CACHE_BACKEND = "disk"
+COMPLETION_CACHE_DIR = ".cache/completions"
+COMPLETION_CACHE_TTL_SECONDS = 30 * 24 * 3600
+COMPLETION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+COMPLETION_CACHE_REDIS_PREFIX = "completion_cache:"
+
+# Parsed partition_pdf output, keyed by PDF content hash + chunking parameters
+PARTITION_CACHE_ENABLED = True
+PARTITION_CACHE_DIR = ".cache/partitions"
+
+# Embedding vectors keyed by model + text hash
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_DIR = ".cache/embeddings"
+EMBEDDING_QUERY_LRU_SIZE = 2048
+
+# Semantic answer cache (query embedding + metadata filter + corpus version)
+SEMANTIC_CACHE_ENABLED = True
+# Minimum cosine similarity between query embeddings to reuse an answer.
+# e5 similarities are compressed (unrelated questions often score 0.75-0.85), so
+# this sits high; re-measure with `python -m evaluation.bench_semantic_cache`
+# (paraphrases vs near-miss pairs) when changing the embedding model.
+# Queries must also share their numeric terms ("cifar-10" vs "cifar-100").
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_CACHE_MAX_ENTRIES = 2000
+SEMANTIC_CACHE_TTL_SECONDS = 6 * 3600
+
+# (query hash, doc_id) -> cross-encoder score
+RERANKER_SCORE_CACHE_SIZE = 20000
@@ -0,0 +1,22 @@
+import os
+
+# Knowledge graph built from chunks at ingest (entities, relations, citations)
+GRAPH_ENABLED = True
+# Backend: "sqlite" (embedded, default) or "neo4j" (needs the neo4j driver and a server)
+GRAPH_BACKEND = "sqlite"
+GRAPH_DB_PATH = ".cache/graph/graph.sqlite3"
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "")
+
+# Retrieval: hops expanded from the query entities, entities visited per query,
+# neighbours kept per hop and wall-clock budget for the whole expansion
+GRAPH_MAX_HOPS = 2
+GRAPH_MAX_NODES = 200
+GRAPH_HOP_FANOUT = 50
+GRAPH_TIME_BUDGET_MS = 50
+# Score multiplier per hop away from a query entity
+GRAPH_HOP_DECAY = 0.5
+# Chunks returned by the graph retriever (fused with dense/BM25 results)
+GRAPH_TOP_K = 10
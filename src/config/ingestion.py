@@ -0,0 +1,11 @@
+# Background ingestion jobs
+# Number of PDFs processed at the same time
+INGESTION_WORKERS = 2
+# Jobs waiting for a worker before /upload starts rejecting new files
+INGESTION_MAX_QUEUED = 16
+# Job status backend: "memory" or "redis"
+INGESTION_JOB_BACKEND = "memory"
+INGESTION_JOB_TTL_SECONDS = 7 * 24 * 3600
+INGESTION_JOB_REDIS_PREFIX = "ingestion_job:"
+
+INGESTION_STAGES = ["partition", "summarize", "embed", "persist", "graph", "reduce"]
@@ -0,0 +1,96 @@
+from src.config.constants import SUMMARY_INTENT_FULL, SUMMARY_INTENT_SECTION, QUERY_INTENT_DETAIL
+
+# Example queries per label; label embeddings are the normalized mean of these
+TYPE_EXEMPLARS = {
+    "text": [
+        "explain the proposed method",
+        "what does the paper say about the limitations",
+        "describe the approach in the introduction",
+        "what is the main contribution of this work",
+        "who are the authors of the paper",
+    ],
+    "table": [
+        "show me the results table",
+        "what are the numbers in the comparison table",
+        "which model has the highest score in the table",
+        "list the hyperparameters reported in the table",
+        "what accuracy values are reported for each dataset",
+    ],
+    "image": [
+        "what does the figure show",
+        "describe the architecture diagram",
+        "explain the chart of training loss",
+        "what is plotted in figure 2",
+        "describe the image of the model overview",
+    ],
+}
+
+INTENT_EXEMPLARS = {
+    SUMMARY_INTENT_FULL: [
+        "summarize this paper",
+        "give me an overview of the whole document",
+        "what is this paper about",
+        "tl;dr of the document",
+        "provide a summary of the entire article",
+    ],
+    SUMMARY_INTENT_SECTION: [
+        "summarize the methodology section",
+        "give me a summary of the results section",
+        "what does the conclusion section say in short",
+        "briefly summarize the introduction",
+        "overview of the related work section",
+    ],
+    QUERY_INTENT_DETAIL: [
+        "what learning rate was used for training",
+        "which dataset was used for evaluation",
+        "how many layers does the encoder have",
+        "what BLEU score does the model achieve",
+        "who proposed the attention mechanism",
+    ],
+}
+
+# Held-out labelled queries used to fit the temperature and confidence thresholds at load time
+TYPE_CALIBRATION_EXAMPLES = [
+    ("how does the proposed loss function work", "text"),
+    ("what are the limitations discussed by the authors", "text"),
+    ("explain the training procedure", "text"),
+    ("what motivates this research", "text"),
+    ("what does table 2 say about the baselines", "table"),
+    ("compare the f1 scores across all models", "table"),
+    ("which row has the lowest error rate", "table"),
+    ("what values are listed for the ablation study", "table"),
+    ("what does the architecture diagram depict", "image"),
+    ("what trend is shown in the loss curve plot", "image"),
+    ("what is illustrated in figure 3", "image"),
+    ("describe the visualization of the attention maps", "image"),
+]
+INTENT_CALIBRATION_EXAMPLES = [
+    ("can you summarize the whole paper", SUMMARY_INTENT_FULL),
+    ("what is the gist of this document", SUMMARY_INTENT_FULL),
+    ("give me a short overview of the article", SUMMARY_INTENT_FULL),
+    ("summarize the experiments section", SUMMARY_INTENT_SECTION),
+    ("briefly, what does the discussion section cover", SUMMARY_INTENT_SECTION),
+    ("give me an overview of the method section", SUMMARY_INTENT_SECTION),
+    ("what batch size was used", QUERY_INTENT_DETAIL),
+    ("what is the accuracy on imagenet", QUERY_INTENT_DETAIL),
+    ("which optimizer did the authors use", QUERY_INTENT_DETAIL),
+]
+# Calibrated thresholds target this precision on the examples above
+CALIBRATION_TARGET_PRECISION = 0.9
+INTENT_CALIBRATION_ENABLED = True
+
+# Softmax temperature over cosine similarities (e5 similarities are tightly clustered)
+INTENT_TEMPERATURE = 0.02
+# Minimum softmax probability of the top label before it is used (defaults until calibrated)
+TYPE_CONFIDENCE_THRESHOLD = 0.6
+INTENT_CONFIDENCE_THRESHOLD = 0.5
+
+# Query routing: minimum rapidfuzz partial_ratio for a query to name a section
+SECTION_MATCH_THRESHOLD = 80
+# Summary artifacts kept in process memory (one entry per document)
+ARTIFACT_CACHE_SIZE = 64
+
+# Query gazetteer (entity names, section titles and headings seen at ingestion)
+GAZETTEER_MIN_TERM_LENGTH = 3
+# rapidfuzz fallback when no term matches exactly (0 disables it)
+GAZETTEER_FUZZY_THRESHOLD = 88
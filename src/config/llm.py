@@ -0,0 +1,17 @@
+# Async LLM gateway used by the query path (ingestion keeps the synchronous Together client)
+TOGETHER_BASE_URL = "https://api.together.xyz/v1"
+# Pooled keep-alive connections shared by all in-flight generations
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_KEEPALIVE_EXPIRY = 30.0
+# Per-call timeouts in seconds; read covers the gap between streamed chunks
+LLM_CONNECT_TIMEOUT = 5.0
+LLM_READ_TIMEOUT = 120.0
+LLM_WRITE_TIMEOUT = 10.0
+LLM_POOL_TIMEOUT = 10.0
+# Retries on 429 / 5xx for non-streaming calls
+LLM_MAX_RETRIES = 3
+LLM_BACKOFF_BASE = 0.5
+LLM_BACKOFF_MAX = 8.0
+# How often a pending /query checks whether its HTTP client went away
+DISCONNECT_POLL_SECONDS = 0.5
@@ -6,9 +6,50 @@ IMAGE_MODEL = "meta-llama/Llama-Vision-Free"
 
 EMBEDDING_MODEL = "intfloat/e5-large-v2"
 
-ZERO_SHOT_MODEL = "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"
-
 RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 # Summary settings
 SUMMARY_TEMPERATURE = 0.5
-MAX_CONCURRENCY = 3
\ No newline at end of file
+MAX_CONCURRENCY = 3
+# Requests-per-minute budget shared by all summary calls (0 disables the limit)
+SUMMARY_REQUESTS_PER_MINUTE = 60
+# Retry settings for 429 / 5xx responses
+SUMMARY_MAX_RETRIES = 5
+SUMMARY_BACKOFF_BASE = 1.0
+SUMMARY_BACKOFF_MAX = 30.0
+# Section / document summaries: at most this many summaries (and characters) per reduce call
+HIERARCHY_FAN_IN = 8
+HIERARCHY_MAX_INPUT_CHARS = 12000
+# Embedding settings
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_NORMALIZE = True
+# e5 models expect these prefixes on queries and indexed passages
+EMBEDDING_QUERY_PREFIX = "query: "
+EMBEDDING_PASSAGE_PREFIX = "passage: "
+# Reranker settings
+# Backend: "torch" (sentence-transformers CrossEncoder) or "onnx" (int8-quantized ONNX Runtime)
+RERANKER_BACKEND = "torch"
+# Query + passage tokens per pair; the passage is truncated to fit
+RERANKER_MAX_LENGTH = 256
+# Number of documents returned after reranking (None keeps all). Retrieval
+# only hands over TOP_K_RETRIEVAL candidates and the context packer's token
+# budget decides how many make the prompt, so no cut is applied by default.
+RERANKER_TOP_N = None
+RERANKER_ONNX_DIR = ".cache/onnx"
+# Context packing for the answer prompt
+# Tokenizer used to count context tokens (falls back to ~4 characters per token if unavailable)
+CONTEXT_TOKENIZER = "deepseek-ai/DeepSeek-R1-Distill-Llama-70B"
+# Context tokens per answer prompt, filled in rerank order
+CONTEXT_TOKEN_BUDGET = 3000
+# Longer chunks are trimmed to their most query-relevant sentences / table rows
+CONTEXT_CHUNK_MAX_TOKENS = 800
+# A trimmed chunk smaller than this is not worth including
+CONTEXT_MIN_CHUNK_TOKENS = 48
+# Chunks whose word shingles are mostly already packed are dropped as overlaps
+CONTEXT_DEDUP_THRESHOLD = 0.8
+# Micro-batching of concurrent query-time inference (query embeddings, reranker pairs)
+MICRO_BATCHING_ENABLED = True
+# A batch runs when it is full or this long after its first item arrived
+EMBED_BATCH_MAX_SIZE = 32
+EMBED_BATCH_MAX_WAIT_MS = 5
+RERANK_BATCH_MAX_SIZE = 64
+RERANK_BATCH_MAX_WAIT_MS = 5
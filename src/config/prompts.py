@@ -87,3 +87,27 @@ Return them as a Python list of lowercase strings. Do not explain.
 Query: "{query}"
 Answer:"""
 
+
+SECTION_SUMMARY_PROMPT = """
+You are an assistant tasked with summarizing one section of a document.
+Below are summaries of consecutive parts of the section "{section}".
+Combine them into a single concise summary of the section.
+
+Respond only with the summary, no additionnal comment.
+Do not start your message by saying "Here is a summary" or anything like that.
+
+Summaries:
+{element}
+"""
+
+DOCUMENT_SUMMARY_PROMPT = """
+You are an assistant tasked with summarizing a whole document.
+Below are summaries of its sections, in reading order.
+Write a concise summary of the entire document covering its purpose, approach and main findings.
+
+Respond only with the summary, no additionnal comment.
+Do not start your message by saying "Here is a summary" or anything like that.
+
+Section summaries:
+{element}
+"""
@@ -1,2 +1,16 @@
 # Number of top results to retrieve from vector store
-TOP_K_RETRIEVAL = 3
\ No newline at end of file
+TOP_K_RETRIEVAL = 3
+
+# In-process LRU of parent documents fetched from the Redis docstore (0 disables it)
+DOCSTORE_LRU_SIZE = 512
+# What to do with a search hit whose doc_id has no docstore entry:
+#   "vector" -> keep the document returned by the vector store
+#   "drop"   -> skip the hit
+DOCSTORE_MISS_POLICY = "vector"
+
+# Retrieval mode: "dense" (Chroma only) or "hybrid" (BM25 + dense fused with RRF)
+RETRIEVAL_MODE = "hybrid"
+# Candidates taken from each of the sparse and dense lists before fusion
+HYBRID_CANDIDATES_K = 10
+# Reciprocal rank fusion constant: score = sum(1 / (RRF_K + rank))
+RRF_K = 60
@@ -0,0 +1,15 @@
+import os
+
+# Per-stage timing spans, token counts and cache counters exposed on /metrics
+TELEMETRY_ENABLED = True
+# Print one structured line per finished root span (a query or an ingestion stage)
+TELEMETRY_LOG_SPANS = False
+# Histogram buckets for stage durations, in seconds
+TELEMETRY_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Histogram buckets for micro-batch sizes
+TELEMETRY_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# Optional OpenTelemetry span export (needs opentelemetry-sdk and the OTLP exporter)
+OTEL_ENABLED = os.getenv("OTEL_ENABLED", "false").lower() in ("1", "true", "yes")
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "research-rag")
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
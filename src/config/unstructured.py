@@ -7,4 +7,22 @@ NEW_AFTER = 6000
 # Block types for classification
 COMPOSITE_BLOCK_TYPE = "CompositeElement"
 TABLE_BLOCK_TYPE = "Table"
-IMAGE_BLOCK_TYPES = "Image"
\ No newline at end of file
+IMAGE_BLOCK_TYPES = "Image"
+
+# Page-range parallel partitioning
+# Worker processes for hi_res layout detection (1 = partition the whole file in-process).
+# Each worker loads its own layout model, so budget memory accordingly.
+PARTITION_WORKERS = 1
+# Pages per partition task; files with fewer pages are partitioned in one go
+PAGES_PER_PARTITION = 16
+
+# Image extraction
+# Content-addressed store for extracted image blocks (<sha256[:2]>/<sha256>.<ext>)
+IMAGE_STORE_DIR = ".cache/images"
+# Smaller images are treated as decorative (icons, bullets, rules) and not captioned
+IMAGE_MIN_BYTES = 2048
+IMAGE_MIN_WIDTH = 48
+IMAGE_MIN_HEIGHT = 48
+IMAGE_MIN_AREA = 100 * 100
+# Near-duplicate threshold: max differing bits between 64-bit difference hashes
+IMAGE_DHASH_MAX_DISTANCE = 6
@@ -0,0 +1,274 @@
+import math
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from langchain.schema import Document
+
+from src.config.models import (
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_CHUNK_MAX_TOKENS,
+    CONTEXT_MIN_CHUNK_TOKENS,
+    CONTEXT_DEDUP_THRESHOLD,
+)
+from src.core.helper.model_registry import get_tokenizer
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.index.bm25_index import tokenize
+
+CHUNK_SEPARATOR = "\n\n"
+# Used when the tokenizer cannot be loaded
+CHARS_PER_TOKEN = 4
+SHINGLE_SIZE = 5
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])|\n+")
+_WORD_RE = re.compile(r"\w+")
+
+
+class _TableParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.rows: List[List[str]] = []
+        self.header_rows = 0
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._row_is_header = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row, self._row_is_header = [], False
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            self._row_is_header = self._row_is_header or tag == "th"
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if any(self._row):
+                # Only leading <th> rows count as the header
+                if self._row_is_header and self.header_rows == len(self.rows):
+                    self.header_rows += 1
+                self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _markdown_row(cells: List[str], width: int) -> str:
+    cells = [cell.replace("|", "\\|") for cell in cells] + [""] * (width - len(cells))
+    return "| " + " | ".join(cells) + " |"
+
+
+def html_table_to_markdown(html: str) -> List[str]:
+    """
+    Lines of a markdown table for `html`. The first lines (header and
+    divider) are returned even when the table has no <th> row, using the
+    first row as the header.
+    """
+    parser = _TableParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.rows:
+        return [" ".join(re.sub(r"<[^>]+>", " ", html).split())]
+
+    width = max(len(row) for row in parser.rows)
+    header_rows = max(1, parser.header_rows)
+    lines = [_markdown_row(row, width) for row in parser.rows[:header_rows]]
+    lines.append("| " + " | ".join(["---"] * width) + " |")
+    lines.extend(_markdown_row(row, width) for row in parser.rows[header_rows:])
+    return lines
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def is_table(doc: Document) -> bool:
+    return doc.metadata.get("type") == "table" or doc.page_content.lstrip().startswith("<table")
+
+
+class PackedContext:
+    """Context text for one prompt plus how it was packed."""
+
+    def __init__(self, text: str, docs: List[Document], tokens: int, original_tokens: int,
+                 duplicates: int = 0, trimmed: int = 0, truncated: int = 0):
+        self.text = text
+        self.docs = docs
+        self.tokens = tokens
+        self.original_tokens = original_tokens
+        self.duplicates = duplicates
+        self.trimmed = trimmed
+        self.truncated = truncated
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def to_dict(self) -> dict:
+        return {
+            "chunks": len(self.docs),
+            "tokens": self.tokens,
+            "original_tokens": self.original_tokens,
+            "saved_tokens": self.saved_tokens,
+            "duplicates_dropped": self.duplicates,
+            "chunks_trimmed": self.trimmed,
+            "chunks_over_budget": self.truncated,
+        }
+
+
+class ContextPacker:
+    """
+    Packs reranked chunks into a token budget for the answer prompt.
+
+    Chunks are taken in rerank order. Tables are converted from HTML to
+    markdown; a chunk whose word shingles are mostly covered by chunks
+    already packed is dropped; a chunk larger than its share of the
+    budget is cut down to its sentences (or table rows) that share the
+    most terms with the query, kept in document order.
+    """
+
+    # Process-wide: once the tokenizer failed to load, every packer estimates
+    _tokenizer_failed = False
+
+    def __init__(
+        self,
+        budget: int = CONTEXT_TOKEN_BUDGET,
+        chunk_max_tokens: int = CONTEXT_CHUNK_MAX_TOKENS,
+        min_chunk_tokens: int = CONTEXT_MIN_CHUNK_TOKENS,
+        dedup_threshold: float = CONTEXT_DEDUP_THRESHOLD,
+        tokenizer=None,
+    ):
+        self.budget = budget
+        self.chunk_max_tokens = chunk_max_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.dedup_threshold = dedup_threshold
+        self._tokenizer = tokenizer
+
+    def count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._tokenizer is None and not self._tokenizer_failed:
+            try:
+                self._tokenizer = get_tokenizer()
+            except Exception as e:
+                print(f"[ContextPacker] Tokenizer unavailable, estimating {CHARS_PER_TOKEN} chars per token: {e}")
+                ContextPacker._tokenizer_failed = True
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text, add_special_tokens=False))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def _select(self, query_terms: set, units: List[str], limit: int, joiner: str, keep: int = 0) -> str:
+        """Most query-relevant units that fit in `limit` tokens, in their original order."""
+        chosen = list(range(keep))
+        used = sum(self.count_tokens(units[i]) for i in chosen)
+
+        def relevance(i):
+            return len(query_terms.intersection(tokenize(units[i])))
+
+        candidates = sorted(range(keep, len(units)), key=lambda i: (-relevance(i), i))
+        # Ties (and chunks with no query overlap at all) fall back to document order
+        for i in candidates:
+            cost = self.count_tokens(units[i])
+            if used + cost <= limit:
+                chosen.append(i)
+                used += cost
+
+        if len(chosen) == keep and candidates:
+            # Not even one unit fits whole (e.g. a chunk without sentence breaks): cut the best one
+            units = list(units)
+            units[candidates[0]] = self._truncate(units[candidates[0]], limit - used)
+            chosen.append(candidates[0])
+        return joiner.join(units[i] for i in sorted(chosen))
+
+    def _truncate(self, text: str, limit: int) -> str:
+        words = text.split()
+        tokens = self.count_tokens(text)
+        while words and tokens > limit:
+            words = words[: max(0, int(len(words) * limit / tokens * 0.95))]
+            tokens = self.count_tokens(" ".join(words))
+        return " ".join(words)
+
+    def _fit(self, query_terms: set, doc: Document, text: str, limit: int) -> str:
+        if is_table(doc):
+            lines = text.split("\n")
+            # Header and divider lines stay so the kept rows remain readable
+            keep = next((i + 1 for i, line in enumerate(lines) if line.startswith("| ---")), 0)
+            return self._select(query_terms, lines, limit, "\n", keep)
+        return self._select(query_terms, split_sentences(text), limit, " ")
+
+    def pack(self, query: str, docs: List[Document]) -> PackedContext:
+        query_terms = set(tokenize(query))
+        separator_tokens = self.count_tokens(CHUNK_SEPARATOR)
+        original_tokens = self.count_tokens(CHUNK_SEPARATOR.join(doc.page_content for doc in docs))
+
+        parts, used_docs, seen = [], [], set()
+        used = duplicates = trimmed = truncated = 0
+        for doc in docs:
+            text = "\n".join(html_table_to_markdown(doc.page_content)) if is_table(doc) else doc.page_content
+            text = text.strip()
+            if not text:
+                continue
+
+            doc_shingles = shingles(text)
+            if doc_shingles and seen and \
+                    len(doc_shingles & seen) / len(doc_shingles) >= self.dedup_threshold:
+                duplicates += 1
+                continue
+
+            remaining = self.budget - used - (separator_tokens if parts else 0)
+            limit = min(self.chunk_max_tokens, remaining)
+            if limit < self.min_chunk_tokens:
+                truncated += 1
+                continue
+
+            tokens = self.count_tokens(text)
+            if tokens > limit:
+                text = self._fit(query_terms, doc, text, limit)
+                tokens = self.count_tokens(text)
+                if tokens < self.min_chunk_tokens:
+                    truncated += 1
+                    continue
+                trimmed += 1
+
+            used += tokens + (separator_tokens if parts else 0)
+            parts.append(text)
+            used_docs.append(doc)
+            # Untrimmed shingles, so a repeat of a trimmed chunk is still recognized
+            seen |= doc_shingles
+
+        packed = PackedContext(
+            text=CHUNK_SEPARATOR.join(parts),
+            docs=used_docs,
+            tokens=used,
+            original_tokens=original_tokens,
+            duplicates=duplicates,
+            trimmed=trimmed,
+            truncated=truncated,
+        )
+        telemetry.count_items("context_tokens_saved", packed.saved_tokens)
+        print(f"[ContextPacker] {packed.tokens}/{self.budget} tokens from {len(used_docs)}/{len(docs)} chunks, "
+              f"saved {packed.saved_tokens} tokens ({duplicates} duplicates, {trimmed} trimmed)")
+        return packed
+
+
+_default_packer: Optional[ContextPacker] = None
+
+
+def get_context_packer() -> ContextPacker:
+    """Packer shared by every Generation, so the tokenizer is resolved once per process."""
+    global _default_packer
+    if _default_packer is None:
+        _default_packer = ContextPacker()
+    return _default_packer
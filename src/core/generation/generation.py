@@ -1,23 +1,57 @@
 
-from typing import List
+import asyncio
+import time
+from typing import AsyncIterator, Iterator, List
 from dotenv import load_dotenv
 from langchain.schema import Document
-from src.config.client import client
 from src.config.models import LLM_MODEL
 from src.config.prompts import QA_PROMPT
-from src.core.helper.response_cleaner import ResponseCleaner
+from src.core.generation.context_packer import ContextPacker, PackedContext, get_context_packer
+from src.core.helper.response_cleaner import ResponseCleaner, StreamingThinkBlockCleaner
+from src.core.helper.model_registry import get_llm_client, get_llm_gateway
+from src.core.helper.telemetry import telemetry
 from src.core.retrieval.retriever import Retriever
 
 
 class Generation:
-    def __init__(self, retriever: Retriever):
+    def __init__(self, retriever: Retriever, client=None, packer: ContextPacker = None, gateway=None):
         self.retriever = retriever
-        self.client = client
+        # Any object exposing chat.completions.create works (e.g. a stub for benchmarks)
+        self.client = client if client is not None else get_llm_client()
+        # Async path (aanswer / astream_answer); loaded on first use
+        self._gateway = gateway
         self.model_name = LLM_MODEL
+        self.packer = packer if packer is not None else get_context_packer()
+        # Packing report of the most recent prompt
+        self.last_context: PackedContext = None
+        # Set when the last answer ended in an LLM error (possibly after streaming part of it)
+        self.failed = False
 
     def build_answer_prompt(self, question: str, docs: List[Document]) -> str:
-        context = "\n\n".join([doc.page_content for doc in docs])
-        return QA_PROMPT.format(context=context, question=question)
+        self.last_context = self.packer.pack(question, docs)
+        return QA_PROMPT.format(context=self.last_context.text, question=question)
+
+    def _request(self, prompt: str, stream: bool) -> dict:
+        return {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 4096,
+            "temperature": 0.5,
+            "stream": stream,
+        }
+
+    def _retrieve_prompt(self, query: str, metadata_filter: dict):
+        """Answer prompt for `query`, or None when nothing relevant is retrieved."""
+        top_k_results = self.retriever.retrieve(query, metadata_filter)
+        if not top_k_results:
+            return None
+        return self.build_answer_prompt(query, top_k_results)
+
+    @property
+    def gateway(self):
+        if self._gateway is None:
+            self._gateway = get_llm_gateway()
+        return self._gateway
 
     def answer(self, query: str, metadata_filter: dict) -> str:
         # Retrieve top-k documents
@@ -30,13 +64,10 @@ class Generation:
 
         # Generate answer
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4096,
-                temperature=0.5,
-                stream=False
-            )
+            with telemetry.span("generation", model=self.model_name):
+                response = self.client.chat.completions.create(**self._request(prompt, stream=False))
+            if not getattr(response, "cached", False):
+                telemetry.record_llm_usage("generation", self.model_name, response)
             raw_output = response.choices[0].message.content.strip()
             # Clean the output
             cleaned = ResponseCleaner.strip_think_block(raw_output)
@@ -44,4 +75,79 @@ class Generation:
             return cleaned
 
         except Exception as e:
-            return f"LLM error during answer generation: {str(e)}"
\ No newline at end of file
+            self.failed = True
+            return f"LLM error during answer generation: {str(e)}"
+
+    def stream_answer(self, query: str, metadata_filter: dict) -> Iterator[str]:
+        """Yield answer text as the LLM produces it, with reasoning blocks removed."""
+        top_k_results = self.retriever.retrieve(query, metadata_filter)
+        if not top_k_results:
+            yield "No relevant context found."
+            return
+
+        prompt = self.build_answer_prompt(query, top_k_results)
+        cleaner = StreamingThinkBlockCleaner()
+
+        # Not a span: the caller may advance this generator from different contexts
+        start = time.perf_counter()
+        try:
+            stream = self.client.chat.completions.create(**self._request(prompt, stream=True))
+            last_chunk = None
+            for chunk in stream:
+                last_chunk = chunk
+                if not chunk.choices:
+                    continue
+                delta = getattr(chunk.choices[0].delta, "content", None)
+                visible = cleaner.feed(delta or "")
+                if visible:
+                    yield visible
+
+            tail = cleaner.flush()
+            if tail:
+                yield tail
+            telemetry.observe("generation", time.perf_counter() - start)
+            # Together reports usage on the final stream chunk
+            telemetry.record_llm_usage("generation", self.model_name, last_chunk)
+
+        except Exception as e:
+            self.failed = True
+            yield f"LLM error during answer generation: {str(e)}"
+
+    async def aanswer(self, query: str, metadata_filter: dict) -> str:
+        """answer() without holding a thread for the LLM call; only retrieval and packing run in a worker."""
+        prompt = await asyncio.to_thread(self._retrieve_prompt, query, metadata_filter)
+        if prompt is None:
+            return "No relevant context found."
+
+        try:
+            with telemetry.span("generation", model=self.model_name):
+                raw_output = await self.gateway.complete(self._request(prompt, stream=False))
+            return ResponseCleaner.strip_think_block((raw_output or "").strip())
+        except Exception as e:
+            self.failed = True
+            return f"LLM error during answer generation: {str(e)}"
+
+    async def astream_answer(self, query: str, metadata_filter: dict) -> AsyncIterator[str]:
+        """Async stream_answer(); closing the iterator closes the upstream stream."""
+        prompt = await asyncio.to_thread(self._retrieve_prompt, query, metadata_filter)
+        if prompt is None:
+            yield "No relevant context found."
+            return
+
+        cleaner = StreamingThinkBlockCleaner()
+
+        start = time.perf_counter()
+        try:
+            async for delta in self.gateway.stream(self._request(prompt, stream=True)):
+                visible = cleaner.feed(delta)
+                if visible:
+                    yield visible
+
+            tail = cleaner.flush()
+            if tail:
+                yield tail
+            telemetry.observe("generation", time.perf_counter() - start)
+
+        except Exception as e:
+            self.failed = True
+            yield f"LLM error during answer generation: {str(e)}"
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+import random
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from src.config.llm import (
+    TOGETHER_BASE_URL,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_CONNECT_TIMEOUT,
+    LLM_READ_TIMEOUT,
+    LLM_WRITE_TIMEOUT,
+    LLM_POOL_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+)
+from src.core.helper.completion_cache import CompletionCache, completion_cache_key
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.loader.summarization_engine import RETRYABLE_STATUS_CODES
+
+
+class LLMGatewayError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _namespace(value):
+    """JSON response -> attribute access, matching the SDK's response objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_namespace(v) for v in value]
+    return value
+
+
+class _Flight:
+    """One upstream call and the number of callers still waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncLLMGateway:
+    """
+    Async chat-completions client for the query path.
+
+    One pooled httpx.AsyncClient keeps connections to the provider alive
+    across requests. Concurrent identical requests share a single upstream
+    call (single flight); when every caller waiting on a call has been
+    cancelled, e.g. because their HTTP clients disconnected, the upstream
+    call is cancelled too. Non-streaming results go through the completion
+    cache like the synchronous client.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = TOGETHER_BASE_URL,
+        completion_cache: Optional[CompletionCache] = None,
+        max_retries: int = LLM_MAX_RETRIES,
+        http_client: httpx.AsyncClient = None,
+    ):
+        self.api_key = api_key or os.getenv("TOGETHER_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.completion_cache = completion_cache
+        self.max_retries = max_retries
+        self.http = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=LLM_CONNECT_TIMEOUT,
+                read=LLM_READ_TIMEOUT,
+                write=LLM_WRITE_TIMEOUT,
+                pool=LLM_POOL_TIMEOUT,
+            ),
+        )
+        self._flights: Dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    async def _post(self, request: dict, timeout: Optional[float]) -> dict:
+        attempt = 0
+        while True:
+            try:
+                response = await self.http.post(
+                    f"{self.base_url}/chat/completions",
+                    json={**request, "stream": False},
+                    headers=self._headers(),
+                    timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                )
+                if response.status_code >= 400:
+                    raise LLMGatewayError(response.text[:500], response.status_code)
+                return response.json()
+            except (LLMGatewayError, httpx.TransportError) as e:
+                status = getattr(e, "status_code", None)
+                retryable = status in RETRYABLE_STATUS_CODES if status is not None \
+                    else isinstance(e, (httpx.TimeoutException, httpx.NetworkError))
+                if attempt >= self.max_retries or not retryable:
+                    raise
+                delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+                print(f"[AsyncLLMGateway] Retrying after {type(e).__name__} "
+                      f"(attempt {attempt + 1}/{self.max_retries}) in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _call(self, request: dict, key: str, timeout: Optional[float]) -> str:
+        if self.completion_cache is not None:
+            cached = await asyncio.to_thread(self.completion_cache.get, key)
+            if cached is not None:
+                return cached
+
+        with telemetry.span("llm_request", model=request.get("model", "")):
+            data = await self._post(request, timeout)
+        response = _namespace(data)
+        telemetry.record_llm_usage("generation", request.get("model", ""), response)
+        content = response.choices[0].message.content
+        if self.completion_cache is not None and content is not None:
+            await asyncio.to_thread(self.completion_cache.set, key, content)
+        return content
+
+    async def complete(self, request: dict, timeout: Optional[float] = None) -> str:
+        """Message content for a non-streaming chat completion request."""
+        key = completion_cache_key(request)
+        flight = self._flights.get(key)
+        if flight is None or flight.task.cancelled():
+            flight = _Flight(asyncio.ensure_future(self._call(request, key, timeout)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(
+                lambda _, flight=flight: self._flights.pop(key) if self._flights.get(key) is flight else None
+            )
+        else:
+            self.coalesced += 1
+            telemetry.cache_hit("llm_single_flight")
+
+        flight.waiters += 1
+        try:
+            # Shielded so one caller going away does not cancel the call for the others
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Unregister first so a new identical request starts its own call
+                # instead of joining one that is being cancelled
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def stream(self, request: dict, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Yield content deltas of a streaming request. Streams are not
+        coalesced; closing the iterator closes the upstream connection.
+        """
+        usage = None
+        async with self.http.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json={**request, "stream": True},
+            headers=self._headers(),
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as response:
+            if response.status_code >= 400:
+                body = await response.aread()
+                raise LLMGatewayError(body.decode("utf-8", "replace")[:500], response.status_code)
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                chunk = json.loads(payload)
+                usage = chunk.get("usage") or usage
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+        telemetry.record_llm_usage("generation", request.get("model", ""), _namespace({"usage": usage}))
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._flights), "coalesced": self.coalesced}
+
+    async def aclose(self):
+        await self.http.aclose()
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.core.ingestion.index.bm25_index import tokenize
+
+from src.config.cache import (
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_TTL_SECONDS,
+)
+
+
+def filter_key(metadata_filter: Optional[dict]) -> str:
+    return json.dumps(metadata_filter or {}, sort_keys=True, default=str)
+
+
+def identifier_terms(query: str) -> frozenset:
+    """
+    Query terms containing digits ("cifar-10", "table 2", "2014"). Embeddings
+    barely separate queries that differ only in these, so they must match.
+    """
+    return frozenset(term for term in tokenize(query) if any(ch.isdigit() for ch in term))
+
+
+class SemanticAnswerCache:
+    """
+    Bounded in-process cache of answers, looked up by query-embedding
+    similarity.
+
+    An entry is only reusable for the same metadata filter, the same
+    numeric / identifier terms and the same corpus version, so any change
+    to the indexed documents invalidates it. Versions only move forward:
+    answers computed against an older version are not stored. Eviction is
+    LRU across all entries, plus a per-entry TTL.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()   # entry id -> entry dict, in LRU order
+        self._next_id = 0
+        self._corpus_version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _check_version(self, corpus_version) -> bool:
+        """Advance to a newer corpus version; False when `corpus_version` is older than the current one."""
+        if self._corpus_version is None or corpus_version > self._corpus_version:
+            # Indexed documents changed: every stored answer may be stale
+            if self._entries:
+                print(f"[SemanticAnswerCache] Corpus version {self._corpus_version} -> {corpus_version}, "
+                      f"dropping {len(self._entries)} entries")
+            self._entries.clear()
+            self._corpus_version = corpus_version
+        return corpus_version == self._corpus_version
+
+    def _expire(self, now: float):
+        if not self.ttl_seconds:
+            return
+        expired = [eid for eid, e in self._entries.items() if now - e["created_at"] > self.ttl_seconds]
+        for eid in expired:
+            del self._entries[eid]
+            self.evictions += 1
+
+    def lookup(self, query: str, query_vector, metadata_filter: dict,
+               corpus_version) -> Optional[Tuple[dict, float]]:
+        """Return (entry, similarity) of the closest cached answer above the threshold."""
+        vec = self._normalize(query_vector)
+        key = filter_key(metadata_filter)
+        terms = identifier_terms(query)
+
+        with self._lock:
+            if not self._check_version(corpus_version):
+                self.misses += 1
+                return None
+            self._expire(time.time())
+
+            candidates = [
+                (eid, e) for eid, e in self._entries.items()
+                if e["filter_key"] == key and e["terms"] == terms
+            ]
+            if candidates:
+                matrix = np.stack([e["vector"] for _, e in candidates])
+                scores = matrix @ vec
+                best = int(np.argmax(scores))
+                score = float(scores[best])
+                if score >= self.threshold:
+                    eid, entry = candidates[best]
+                    self._entries.move_to_end(eid)
+                    self.hits += 1
+                    return entry, score
+
+            self.misses += 1
+            return None
+
+    def store(self, query: str, query_vector, metadata_filter: dict, corpus_version, answer: str):
+        with self._lock:
+            # Started before an ingestion finished: the answer may already be stale
+            if not self._check_version(corpus_version):
+                return
+            self._entries[self._next_id] = {
+                "query": query,
+                "vector": self._normalize(query_vector),
+                "filter_key": filter_key(metadata_filter),
+                "terms": identifier_terms(query),
+                "answer": answer,
+                "created_at": time.time(),
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "corpus_version": self._corpus_version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from src.config.cache import (
+    COMPLETION_CACHE_BACKEND,
+    COMPLETION_CACHE_DIR,
+    COMPLETION_CACHE_TTL_SECONDS,
+    COMPLETION_CACHE_MAX_BYTES,
+    COMPLETION_CACHE_REDIS_PREFIX,
+)
+from src.config.redis import REDIS_URL
+from src.core.helper.telemetry import telemetry
+
+# Request fields that do not change the completion content
+_IGNORED_PARAMS = {"stream", "timeout"}
+
+
+def completion_cache_key(request: dict) -> str:
+    """Content address of a completion request: hash of model, messages and parameters."""
+    payload = {k: v for k, v in request.items() if k not in _IGNORED_PARAMS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class DiskCompletionStore:
+    """SQLite-backed store with TTL expiry and least-recently-used eviction by total size."""
+
+    def __init__(self, cache_dir: str = COMPLETION_CACHE_DIR,
+                 ttl_seconds: int = COMPLETION_CACHE_TTL_SECONDS,
+                 max_bytes: int = COMPLETION_CACHE_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "completions.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON completions (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM completions ORDER BY accessed_at ASC")
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM completions WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+
+class RedisCompletionStore:
+    """Redis-backed store; TTL via key expiry, size bound via an access-ordered sorted set."""
+
+    def __init__(self, redis_client=None, prefix: str = COMPLETION_CACHE_REDIS_PREFIX,
+                 ttl_seconds: int = COMPLETION_CACHE_TTL_SECONDS,
+                 max_bytes: int = COMPLETION_CACHE_MAX_BYTES):
+        if redis_client is None:
+            from redis import Redis
+            redis_client = Redis.from_url(REDIS_URL)
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lru_key = f"{prefix}__lru"
+        self._sizes_key = f"{prefix}__sizes"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.redis.get(self.prefix + key)
+        if value is None:
+            # Expired by TTL: drop its bookkeeping
+            self.redis.zrem(self._lru_key, key)
+            self.redis.hdel(self._sizes_key, key)
+            return None
+        self.redis.zadd(self._lru_key, {key: time.time()})
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        pipe = self.redis.pipeline()
+        pipe.set(self.prefix + key, value, ex=self.ttl_seconds or None)
+        pipe.zadd(self._lru_key, {key: time.time()})
+        pipe.hset(self._sizes_key, key, size)
+        pipe.execute()
+        self._evict()
+
+    def _evict(self):
+        sizes = {k.decode() if isinstance(k, bytes) else k: int(v)
+                 for k, v in self.redis.hgetall(self._sizes_key).items()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        pipe = self.redis.pipeline()
+        for raw_key in self.redis.zrange(self._lru_key, 0, -1):
+            if total <= self.max_bytes:
+                break
+            key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+            total -= sizes.get(key, 0)
+            pipe.delete(self.prefix + key)
+            pipe.zrem(self._lru_key, key)
+            pipe.hdel(self._sizes_key, key)
+        pipe.execute()
+
+    def clear(self):
+        keys = [self.prefix + (k.decode() if isinstance(k, bytes) else k)
+                for k in self.redis.zrange(self._lru_key, 0, -1)]
+        if keys:
+            self.redis.delete(*keys)
+        self.redis.delete(self._lru_key, self._sizes_key)
+
+
+class CompletionCache:
+    def __init__(self, store):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            print(f"[CompletionCache] Lookup failed: {e}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            telemetry.cache_miss("completion")
+        else:
+            telemetry.cache_hit("completion")
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            self.store.set(key, value)
+        except Exception as e:
+            print(f"[CompletionCache] Store failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.store).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class _CachedCompletions:
+    def __init__(self, completions, cache: CompletionCache):
+        self._completions = completions
+        self._cache = cache
+
+    def create(self, **request):
+        # Streams are consumed incrementally by the caller; never cache them here
+        if request.get("stream"):
+            return self._completions.create(**request)
+
+        key = completion_cache_key(request)
+        cached = self._cache.get(key)
+        if cached is not None:
+            message = SimpleNamespace(content=cached)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], cached=True)
+
+        response = self._completions.create(**request)
+        content = response.choices[0].message.content
+        if content is not None:
+            self._cache.set(key, content)
+        return response
+
+
+class CachedChatClient:
+    """
+    Wraps a Together-style client so `chat.completions.create` is served from
+    the completion cache when the exact same request was answered before.
+    """
+
+    def __init__(self, client, cache: CompletionCache):
+        self.client = client
+        self.cache = cache
+        self.chat = SimpleNamespace(completions=_CachedCompletions(client.chat.completions, cache))
+
+    def lookup(self, request: dict) -> Optional[str]:
+        """Cached content for a non-streaming request, without calling the API."""
+        if request.get("stream"):
+            return None
+        return self.cache.get(completion_cache_key(request))
+
+    def create_uncached(self, request: dict):
+        """Call the API (after a lookup() miss) and cache the result."""
+        response = self.client.chat.completions.create(**request)
+        content = response.choices[0].message.content
+        if content is not None and not request.get("stream"):
+            self.cache.set(completion_cache_key(request), content)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+_completion_cache: Optional[CompletionCache] = None
+_completion_cache_lock = threading.Lock()
+
+
+def get_completion_cache(backend: str = COMPLETION_CACHE_BACKEND) -> Optional[CompletionCache]:
+    """Process-wide completion cache, or None when caching is disabled or unavailable."""
+    global _completion_cache
+    if backend == "none":
+        return None
+
+    with _completion_cache_lock:
+        if _completion_cache is None:
+            try:
+                store = RedisCompletionStore() if backend == "redis" else DiskCompletionStore()
+                _completion_cache = CompletionCache(store)
+            except Exception as e:
+                print(f"[CompletionCache] Failed to initialise {backend} backend: {e}")
+                return None
+        return _completion_cache
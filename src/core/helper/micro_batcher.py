@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+from src.core.helper.telemetry import telemetry
+
+
+class _Request:
+    __slots__ = ("items", "future", "enqueued_at")
+
+    def __init__(self, items: Sequence[Any]):
+        self.items = list(items)
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent inference calls into batched ones.
+
+    Callers block in submit() / submit_many() while one worker thread
+    collects queued requests until `max_batch_size` items are gathered or
+    `max_wait_ms` has passed since the first request of the batch arrived,
+    runs `batch_fn` once on all their items and hands each caller its own
+    results. An exception from `batch_fn` is raised in every caller of
+    that batch. A request's items always stay in one batch. Should the
+    worker itself die (a BaseException such as SystemExit), every pending
+    caller gets that exception and later submissions fail immediately.
+
+    The window is only waited out while requests are arriving concurrently
+    (the previous batch served more than one request), so a lone request
+    at low load is not delayed.
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int, max_wait_ms: float):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        # A request that did not fit the previous batch starts the next one
+        self._carry: Optional[_Request] = None
+        self._concurrent = False
+        # Set when the worker thread has stopped
+        self._stopped: Optional[BaseException] = None
+        self.batches = 0
+        self.items = 0
+        self._worker = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Any:
+        return self.submit_many([item])[0]
+
+    def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        if not items:
+            return []
+        if self._stopped is not None:
+            raise RuntimeError(f"{self.name} batcher has stopped") from self._stopped
+        request = _Request(items)
+        self._queue.put(request)
+        return request.future.result()
+
+    def _collect(self) -> List[_Request]:
+        first, self._carry = self._carry or self._queue.get(), None
+        batch, size = [first], len(first.items)
+        deadline = first.enqueued_at + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                # Anything already queued joins even when there is no window to wait out
+                if timeout > 0 and self._concurrent:
+                    request = self._queue.get(timeout=timeout)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request.items) > self.max_batch_size:
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.items)
+        self._concurrent = len(batch) > 1 or self._carry is not None or not self._queue.empty()
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for request in batch for item in request.items]
+            started = time.perf_counter()
+            telemetry.record_batch(self.name, len(items), [started - r.enqueued_at for r in batch])
+            try:
+                with telemetry.span(f"{self.name}_batch", size=len(items)):
+                    results = list(self.batch_fn(items))
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            except BaseException as e:
+                self._stop(batch, e)
+                raise
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(results[offset:offset + len(request.items)])
+                offset += len(request.items)
+            self.batches += 1
+            self.items += len(items)
+
+    def _stop(self, batch: List[_Request], error: BaseException):
+        """Fail the running batch and everything still queued; nothing would complete them."""
+        self._stopped = error
+        pending = batch + ([self._carry] if self._carry is not None else [])
+        self._carry = None
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for request in pending:
+            request.future.set_exception(error)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
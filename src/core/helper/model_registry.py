@@ -0,0 +1,184 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.config.models import EMBEDDING_MODEL, RERANKER_MODEL, CONTEXT_TOKENIZER
+
+
+class ModelRegistry:
+    """
+    Process-wide, thread-safe cache of heavyweight model objects.
+
+    Each model is loaded at most once per key; concurrent callers asking for
+    the same key wait on a per-key lock instead of loading a second copy.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._key_lock(key):
+            # Another thread may have finished loading while we waited
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            start = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - start
+
+            with self._lock:
+                self._models[key] = model
+                self._info[key] = {
+                    "type": type(model).__name__,
+                    "load_seconds": round(load_seconds, 3),
+                    "memory_bytes": estimate_memory_bytes(model),
+                }
+            print(f"[ModelRegistry] Loaded {key} in {load_seconds:.2f}s")
+            return model
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._models
+
+    def unload(self, key: str):
+        with self._lock:
+            self._models.pop(key, None)
+            self._info.pop(key, None)
+
+    def memory_report(self) -> Dict[str, dict]:
+        """Per-model load time and parameter/buffer memory (bytes, MB)."""
+        with self._lock:
+            report = {}
+            for key, info in self._info.items():
+                mem = info["memory_bytes"]
+                report[key] = {
+                    **info,
+                    "memory_mb": round(mem / (1024 * 1024), 1) if mem is not None else None,
+                }
+            return report
+
+
+def _torch_modules(obj: Any, depth: int = 0):
+    """Find torch modules held by common wrappers (pipelines, CrossEncoder, LangChain)."""
+    try:
+        import torch
+    except ImportError:
+        return []
+
+    if isinstance(obj, torch.nn.Module):
+        return [obj]
+    if depth >= 2:
+        return []
+
+    modules = []
+    for attr in ("model", "client", "_client"):
+        inner = getattr(obj, attr, None)
+        if inner is not None and inner is not obj:
+            modules.extend(_torch_modules(inner, depth + 1))
+    return modules
+
+
+def estimate_memory_bytes(obj: Any) -> Optional[int]:
+    modules = _torch_modules(obj)
+    if not modules:
+        return None
+
+    seen = set()
+    total = 0
+    for module in modules:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+model_registry = ModelRegistry()
+
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL):
+    def load():
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        from src.config.cache import EMBEDDING_CACHE_ENABLED
+        from src.core.ingestion.index.cached_embeddings import CachedEmbeddings, EmbeddingStore
+
+        # Vectors are cached by text hash; only unseen texts reach the model
+        store = EmbeddingStore(model_name) if EMBEDDING_CACHE_ENABLED else None
+        return CachedEmbeddings(HuggingFaceEmbeddings(model_name=model_name), model_name, store=store)
+
+    return model_registry.get_or_load(f"embedding:{model_name}", load)
+
+
+def get_reranker_model(model_name: str = RERANKER_MODEL, max_length: int = None):
+    def load():
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder(model_name, max_length=max_length)
+
+    return model_registry.get_or_load(f"reranker:{model_name}:{max_length}", load)
+
+
+def get_onnx_reranker_model(model_name: str = RERANKER_MODEL, max_length: int = None):
+    def load():
+        from src.core.retrieval.onnx_reranker import OnnxCrossEncoder
+        return OnnxCrossEncoder(model_name, max_length=max_length)
+
+    return model_registry.get_or_load(f"reranker_onnx:{model_name}:{max_length}", load)
+
+
+def get_llm_client():
+    def load():
+        from src.config.client import client
+        from src.core.helper.completion_cache import CachedChatClient, get_completion_cache
+
+        # Identical non-streaming requests are answered from the completion cache
+        cache = get_completion_cache()
+        return CachedChatClient(client, cache) if cache is not None else client
+
+    return model_registry.get_or_load("llm_client:together", load)
+
+
+def get_llm_gateway():
+    def load():
+        from src.core.generation.llm_gateway import AsyncLLMGateway
+        from src.core.helper.completion_cache import get_completion_cache
+        return AsyncLLMGateway(completion_cache=get_completion_cache())
+
+    return model_registry.get_or_load("llm_gateway:together", load)
+
+
+def get_intent_classifier():
+    def load():
+        from src.config.intent import INTENT_CALIBRATION_ENABLED
+        from src.core.query.intent_classifier import IntentClassifier
+
+        classifier = IntentClassifier(get_embedding_model())
+        if INTENT_CALIBRATION_ENABLED:
+            try:
+                classifier.calibrate()
+            except Exception as e:
+                print(f"[ModelRegistry] Intent calibration failed, keeping default thresholds: {e}")
+        return classifier
+
+    return model_registry.get_or_load("intent_classifier", load)
+
+
+def get_tokenizer(model_name: str = CONTEXT_TOKENIZER):
+    def load():
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model_name)
+
+    return model_registry.get_or_load(f"tokenizer:{model_name}", load)
@@ -1,8 +1,110 @@
 import re
 
+THINK_TAGS = ("think", "thinking", "reasoning")
+
+
 class ResponseCleaner:
     @staticmethod
     def strip_think_block(text: str) -> str:
         """Remove <think>, <thinking>, <reasoning> blocks (DeepSeek, Claude, etc.)"""
         return re.sub(r"<(think|thinking|reasoning)>.*?</\1>\s*", "", text, flags=re.DOTALL).strip()
-    
\ No newline at end of file
+
+
+class StreamingThinkBlockCleaner:
+    """
+    Incremental counterpart of ResponseCleaner.strip_think_block.
+
+    Feed streamed chunks in order; each call returns the text that is safe to
+    show. Reasoning blocks are hidden even when their tags are split across
+    chunks, and leading/trailing whitespace is trimmed like `str.strip()`.
+    """
+
+    _OPEN_TAGS = [f"<{tag}>" for tag in THINK_TAGS]
+
+    def __init__(self):
+        self._buffer = ""
+        self._close_tag = None         # set while inside a reasoning block
+        self._skip_whitespace = False  # whitespace after a closing tag is dropped
+        self._pending_ws = ""          # held back until more visible text arrives
+        self._started = False
+
+    def _find_open_tag(self):
+        best = None
+        for tag in self._OPEN_TAGS:
+            idx = self._buffer.find(tag)
+            if idx != -1 and (best is None or idx < best[0]):
+                best = (idx, tag)
+        return best
+
+    def _partial_open_suffix(self) -> int:
+        """Length of the longest buffer suffix that could still become an opening tag."""
+        longest = 0
+        for tag in self._OPEN_TAGS:
+            for size in range(1, len(tag)):
+                if size > longest and self._buffer.endswith(tag[:size]):
+                    longest = size
+        return longest
+
+    def _emit(self, text: str) -> str:
+        if not text:
+            return ""
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+
+        stripped = text.rstrip()
+        out = self._pending_ws + stripped if stripped else ""
+        self._pending_ws = text[len(stripped):] if stripped else self._pending_ws + text
+        return out
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        self._buffer += chunk
+        output = []
+
+        while self._buffer:
+            if self._close_tag is not None:
+                idx = self._buffer.find(self._close_tag)
+                if idx == -1:
+                    # Keep just enough to recognise a closing tag split across chunks
+                    self._buffer = self._buffer[-(len(self._close_tag) - 1):]
+                    break
+                self._buffer = self._buffer[idx + len(self._close_tag):]
+                self._close_tag = None
+                self._skip_whitespace = True
+                continue
+
+            if self._skip_whitespace:
+                self._buffer = self._buffer.lstrip()
+                if not self._buffer:
+                    break
+                self._skip_whitespace = False
+
+            match = self._find_open_tag()
+            if match is not None:
+                idx, tag = match
+                output.append(self._emit(self._buffer[:idx]))
+                self._buffer = self._buffer[idx + len(tag):]
+                self._close_tag = "</" + tag[1:]
+                continue
+
+            hold = self._partial_open_suffix()
+            output.append(self._emit(self._buffer[:len(self._buffer) - hold]))
+            self._buffer = self._buffer[len(self._buffer) - hold:]
+            break
+
+        return "".join(output)
+
+    def flush(self) -> str:
+        """Return any held-back visible text once the stream has ended."""
+        # An unterminated reasoning block stays hidden
+        remainder = self._buffer if self._close_tag is None else ""
+        self._buffer = ""
+        self._close_tag = None
+
+        out = self._emit(remainder)
+        self._pending_ws = ""
+        return out
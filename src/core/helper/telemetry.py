@@ -0,0 +1,257 @@
+import bisect
+import contextvars
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from src.config.telemetry import (
+    TELEMETRY_ENABLED,
+    TELEMETRY_LOG_SPANS,
+    TELEMETRY_LATENCY_BUCKETS,
+    TELEMETRY_BATCH_SIZE_BUCKETS,
+    OTEL_ENABLED,
+    OTEL_SERVICE_NAME,
+    OTEL_EXPORTER_OTLP_ENDPOINT,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=TELEMETRY_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, **labels) -> Optional[dict]:
+        series = self._series.get(_label_key(labels))
+        if series is None:
+            return None
+        return {"count": series[2], "sum": series[1]}
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {repr(total)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines)
+
+
+class Telemetry:
+    """
+    Process-wide stage timings, token counts and cache counters.
+
+    `span(stage)` times a block into the stage-duration histogram (and an
+    OpenTelemetry span when enabled); nested spans are tracked per
+    context so a root span can be logged with its children's timings.
+    `render()` returns everything in the Prometheus text format.
+    """
+
+    def __init__(self, enabled: bool = TELEMETRY_ENABLED, log_spans: bool = TELEMETRY_LOG_SPANS):
+        self.enabled = enabled
+        self.log_spans = log_spans
+        self.stage_duration = Histogram(
+            "rag_stage_duration_seconds", "Wall-clock time spent in each pipeline stage."
+        )
+        self.stage_errors = Counter("rag_stage_errors_total", "Pipeline stages that raised an exception.")
+        self.llm_tokens = Counter("rag_llm_tokens_total", "LLM tokens by stage, model and kind (prompt/completion).")
+        self.llm_requests = Counter("rag_llm_requests_total", "LLM requests by stage and model.")
+        self.cache_requests = Counter("rag_cache_requests_total", "Cache lookups by cache and result (hit/miss).")
+        self.items = Counter("rag_items_total", "Items processed per stage (chunks, documents, queries).")
+        self.batch_size = Histogram(
+            "rag_batch_size", "Items per micro-batched inference call.", buckets=TELEMETRY_BATCH_SIZE_BUCKETS
+        )
+        self.batch_queue_delay = Histogram(
+            "rag_batch_queue_delay_seconds", "Time an item waited in a micro-batch queue before inference."
+        )
+        self._metrics = [
+            self.stage_duration, self.stage_errors, self.llm_tokens,
+            self.llm_requests, self.cache_requests, self.items,
+            self.batch_size, self.batch_queue_delay,
+        ]
+        self._current = contextvars.ContextVar("telemetry_span", default=None)
+        self._tracer = self._init_otel() if enabled and OTEL_ENABLED else None
+
+    @staticmethod
+    def _init_otel():
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            print(f"[Telemetry] OpenTelemetry not installed, span export disabled: {e}")
+            return None
+
+        provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=OTEL_EXPORTER_OTLP_ENDPOINT)))
+        trace.set_tracer_provider(provider)
+        print(f"[Telemetry] Exporting spans to {OTEL_EXPORTER_OTLP_ENDPOINT}")
+        return trace.get_tracer("research-rag")
+
+    @contextmanager
+    def span(self, stage: str, **attributes):
+        """Time a pipeline stage. Yields a dict; keys added to it become span attributes."""
+        if not self.enabled:
+            yield {}
+            return
+
+        parent = self._current.get()
+        record = {"stage": stage, "attributes": dict(attributes), "children": []}
+        token = self._current.set(record)
+        otel_context = self._tracer.start_as_current_span(stage) if self._tracer else None
+        otel_span = otel_context.__enter__() if otel_context else None
+        start = time.perf_counter()
+        error = None
+        try:
+            yield record["attributes"]
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._current.reset(token)
+            self.stage_duration.observe(elapsed, stage=stage)
+            if error is not None:
+                self.stage_errors.inc(stage=stage, error=type(error).__name__)
+
+            record["ms"] = round(elapsed * 1000, 3)
+            if parent is not None:
+                parent["children"].append(record)
+            elif self.log_spans:
+                print(f"[Telemetry] {json.dumps(self._summarize(record), default=str)}")
+
+            if otel_span is not None:
+                for key, value in record["attributes"].items():
+                    if isinstance(value, (str, bool, int, float)):
+                        otel_span.set_attribute(key, value)
+                if error is not None:
+                    otel_span.record_exception(error)
+                otel_context.__exit__(None, None, None)
+
+    def observe(self, stage: str, seconds: float):
+        """Record a stage duration measured outside span()."""
+        if self.enabled:
+            self.stage_duration.observe(seconds, stage=stage)
+
+    def _summarize(self, record: dict) -> dict:
+        summary = {"span": record["stage"], "ms": record["ms"]}
+        if record["attributes"]:
+            summary["attributes"] = record["attributes"]
+        if record["children"]:
+            summary["children"] = [self._summarize(child) for child in record["children"]]
+        return summary
+
+    def traced(self, stage: str):
+        """Decorator form of span()."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def cache_hit(self, cache: str, hits: int = 1):
+        if self.enabled and hits:
+            self.cache_requests.inc(hits, cache=cache, result="hit")
+
+    def cache_miss(self, cache: str, misses: int = 1):
+        if self.enabled and misses:
+            self.cache_requests.inc(misses, cache=cache, result="miss")
+
+    def count_items(self, stage: str, value: int):
+        if self.enabled and value:
+            self.items.inc(value, stage=stage)
+
+    def record_batch(self, batcher: str, size: int, queue_delays):
+        if not self.enabled:
+            return
+        self.batch_size.observe(size, batcher=batcher)
+        for delay in queue_delays:
+            self.batch_queue_delay.observe(delay, batcher=batcher)
+
+    def record_llm_usage(self, stage: str, model: str, response) -> None:
+        """Count one LLM request and its token usage, when the response reports it."""
+        if not self.enabled:
+            return
+        self.llm_requests.inc(stage=stage, model=model)
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for kind in ("prompt_tokens", "completion_tokens"):
+            tokens = getattr(usage, kind, None)
+            if tokens:
+                self.llm_tokens.inc(tokens, stage=stage, model=model, kind=kind.split("_")[0])
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+telemetry = Telemetry()
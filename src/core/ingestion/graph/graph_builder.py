@@ -0,0 +1,390 @@
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from src.config.graph import (
+    GRAPH_BACKEND,
+    GRAPH_DB_PATH,
+    NEO4J_URI,
+    NEO4J_USER,
+    NEO4J_PASSWORD,
+)
+from src.core.ingestion.graph import graph_queries as q
+
+ENTITY = "entity"
+CITATION = "citation"
+CO_OCCURS = "co_occurs"
+CITED_AS = "cited_as"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD = r"[A-Z][A-Za-z0-9]*(?:[-./][A-Za-z0-9]+)*"
+# Runs of capitalized words: "Transformer", "WMT 2014" -> "WMT", "Layer Normalization", "GPT-3"
+_CAPITALIZED_RE = re.compile(rf"\b{_WORD}(?:\s+{_WORD}){{0,3}}")
+# Lower-case compound names; only those containing a digit are kept ("e5-large-v2", "gpt-3")
+_TECHNICAL_RE = re.compile(r"(?<![\w.-])[a-z][a-z0-9]*(?:[-_.][a-z0-9]+)+\b")
+_NUMERIC_CITATION_RE = re.compile(r"\[(\d+(?:\s*[,–-]\s*\d+)*)\]")
+_AUTHOR = r"[A-Z][A-Za-z'\-]+(?:\s+et\s+al\.?|\s+(?:and|&)\s+[A-Z][A-Za-z'\-]+)?"
+# "Vaswani et al. (2017)" and "(Vaswani et al., 2017)"
+_AUTHOR_YEAR_RES = [
+    re.compile(rf"\b({_AUTHOR}),?\s+\(((?:19|20)\d{{2}})[a-z]?\)"),
+    re.compile(rf"\(({_AUTHOR}),\s*((?:19|20)\d{{2}})[a-z]?\)"),
+]
+
+# Typed relations: nearest entity before the cue -> nearest entity after it
+RELATION_PATTERNS = [
+    (re.compile(r"\boutperform(?:s|ed|ing)?\b", re.I), "outperforms"),
+    (re.compile(r"\b(?:is|are|was|were)?\s*based on\b", re.I), "based_on"),
+    (re.compile(r"\bextend(?:s|ed|ing)?\b", re.I), "extends"),
+    (re.compile(r"\b(?:compared (?:to|with)|versus|vs\.?)\b", re.I), "compared_with"),
+    (re.compile(r"\b(?:uses|used|using|employ(?:s|ed)?)\b", re.I), "uses"),
+    (re.compile(r"\b(?:trained on|evaluated on|fine-tuned on)\b", re.I), "evaluated_on"),
+]
+
+# Capitalized words that start sentences or label things rather than name them
+_LEADING_STOPWORDS = frozenset("""
+a an the this that these those we our in on at for of by to from with as it its
+is are was were be however moreover furthermore while when where which
+table figure fig section eq equation appendix
+""".split())
+
+MAX_ENTITIES_PER_CHUNK = 50
+MAX_ENTITIES_PER_SENTENCE = 8
+
+
+def normalize_entity(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip(" \t\n.,;:!?()[]{}\"'").lower()
+
+
+class ChunkGraph:
+    """Entities (with mention counts) and relations extracted from one chunk."""
+
+    def __init__(self):
+        self.mentions: Dict[str, dict] = {}
+        self.relations: Counter = Counter()
+
+    def add_mention(self, name: str, label: str, kind: str = ENTITY):
+        entry = self.mentions.setdefault(name, {"label": label, "kind": kind, "count": 0})
+        entry["count"] += 1
+
+    def add_relation(self, src: str, dst: str, relation: str, weight: float = 1.0):
+        if src != dst:
+            self.relations[(src, dst, relation)] += weight
+
+    def __len__(self) -> int:
+        return len(self.mentions)
+
+
+class EntityRelationExtractor:
+    """
+    Offline, rule-based extraction of entities, citations and relations.
+
+    Entities are capitalized word runs, acronyms and digit-bearing technical
+    names; citations are "[12]"-style markers and author-year references.
+    Entities in the same sentence are linked by co-occurrence, and a few
+    verb cues ("outperforms", "based on", ...) add typed edges.
+    """
+
+    def _entities(self, sentence: str) -> List[Tuple[int, int, str, str]]:
+        """(start, end, normalized name, surface label) in order of appearance."""
+        found = []
+        for match in _CAPITALIZED_RE.finditer(sentence):
+            words = match.group(0).split()
+            start = match.start()
+            # Drop sentence-initial / function words ("The Transformer" -> "Transformer")
+            while words and words[0].lower() in _LEADING_STOPWORDS:
+                start += len(words[0]) + 1
+                words = words[1:]
+            if not words:
+                continue
+            label = " ".join(words)
+            if len(words) == 1:
+                word = words[0]
+                distinctive = (sum(c.isupper() for c in word) >= 2 or any(c.isdigit() for c in word))
+                if len(word) < 3 or (not distinctive and start == 0):
+                    continue
+            found.append((start, match.end(), normalize_entity(label), label))
+
+        for match in _TECHNICAL_RE.finditer(sentence):
+            if any(c.isdigit() for c in match.group(0)):
+                found.append((match.start(), match.end(), normalize_entity(match.group(0)), match.group(0)))
+
+        found.sort()
+        return found
+
+    @staticmethod
+    def _citations(sentence: str) -> List[Tuple[str, str]]:
+        citations = []
+        for match in _NUMERIC_CITATION_RE.finditer(sentence):
+            for part in re.split(r"\s*,\s*", match.group(1)):
+                bounds = re.split(r"\s*[–-]\s*", part)
+                if len(bounds) == 2 and bounds[0].isdigit() and bounds[1].isdigit():
+                    low, high = int(bounds[0]), int(bounds[1])
+                    numbers = range(low, high + 1) if 0 <= high - low <= 20 else [low, high]
+                else:
+                    numbers = [int(bounds[0])]
+                citations.extend((f"cite:{n}", f"[{n}]") for n in numbers)
+        for pattern in _AUTHOR_YEAR_RES:
+            for match in pattern.finditer(sentence):
+                author, year = match.group(1), match.group(2)
+                if author.split()[0].lower() in _LEADING_STOPWORDS:
+                    continue
+                surname = author.split()[0]
+                citations.append((f"cite:{surname.lower()} {year}", f"{author} ({year})"))
+        return citations
+
+    def extract(self, text: str) -> ChunkGraph:
+        graph = ChunkGraph()
+        text = _TAG_RE.sub(" ", text or "")
+        for sentence in _SENTENCE_RE.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+
+            entities = self._entities(sentence)
+            for _, _, name, label in entities:
+                graph.add_mention(name, label)
+
+            citations = self._citations(sentence)
+            for name, label in citations:
+                graph.add_mention(name, label, CITATION)
+
+            distinct = list(dict.fromkeys(name for _, _, name, _ in entities))[:MAX_ENTITIES_PER_SENTENCE]
+            for i, a in enumerate(distinct):
+                for b in distinct[i + 1:]:
+                    src, dst = sorted((a, b))
+                    graph.add_relation(src, dst, CO_OCCURS)
+                for citation, _ in citations:
+                    graph.add_relation(a, citation, CITED_AS)
+
+            for pattern, relation in RELATION_PATTERNS:
+                for cue in pattern.finditer(sentence):
+                    before = [e for e in entities if e[1] <= cue.start()]
+                    after = [e for e in entities if e[0] >= cue.end()]
+                    if before and after:
+                        graph.add_relation(before[-1][2], after[0][2], relation, 2.0)
+
+        if len(graph.mentions) > MAX_ENTITIES_PER_CHUNK:
+            keep = sorted(graph.mentions, key=lambda n: -graph.mentions[n]["count"])[:MAX_ENTITIES_PER_CHUNK]
+            keep = set(keep)
+            graph.mentions = {n: m for n, m in graph.mentions.items() if n in keep}
+            graph.relations = Counter({
+                key: w for key, w in graph.relations.items() if key[0] in keep and key[1] in keep
+            })
+        return graph
+
+
+class SQLiteGraphStore:
+    """Embedded graph store: adjacency tables in a single SQLite file."""
+
+    def __init__(self, path: str = GRAPH_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(q.SQLITE_SCHEMA)
+
+    @staticmethod
+    def _placeholders(values) -> str:
+        return ",".join("?" * len(values))
+
+    def _entity_ids(self, names: List[str]) -> Dict[str, int]:
+        ids = {}
+        names = list(names)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            batch = names[start:start + 500]
+            sql = q.SQL_ENTITY_IDS.format(placeholders=self._placeholders(batch))
+            ids.update(self._conn.execute(sql, batch).fetchall())
+        return ids
+
+    def _delete_chunks(self, chunk_ids: List[str]):
+        for start in range(0, len(chunk_ids), 500):
+            batch = chunk_ids[start:start + 500]
+            placeholders = self._placeholders(batch)
+            self._conn.execute(q.SQL_DELETE_CHUNK_MENTIONS.format(placeholders=placeholders), batch)
+            self._conn.execute(q.SQL_DELETE_CHUNK_RELATIONS.format(placeholders=placeholders), batch)
+
+    def add_chunk_graphs(self, document_id: str, graphs: Dict[str, ChunkGraph]):
+        """Replace the graph of each chunk id in one transaction."""
+        if not graphs:
+            return
+        with self._lock, self._conn:
+            self._delete_chunks(list(graphs))
+            entities = {}
+            for graph in graphs.values():
+                for name, mention in graph.mentions.items():
+                    entities.setdefault(name, (mention["label"], mention["kind"]))
+            self._conn.executemany(
+                q.SQL_UPSERT_ENTITY, [(name, label, kind) for name, (label, kind) in entities.items()]
+            )
+            ids = self._entity_ids(entities)
+
+            self._conn.executemany(q.SQL_INSERT_MENTION, [
+                (ids[name], chunk_id, document_id, mention["count"])
+                for chunk_id, graph in graphs.items()
+                for name, mention in graph.mentions.items()
+            ])
+            self._conn.executemany(q.SQL_INSERT_RELATION, [
+                (ids[src], ids[dst], relation, chunk_id, document_id, weight)
+                for chunk_id, graph in graphs.items()
+                for (src, dst, relation), weight in graph.relations.items()
+                if src in ids and dst in ids
+            ])
+
+    def delete_chunks(self, chunk_ids: List[str]):
+        if not chunk_ids:
+            return
+        with self._lock, self._conn:
+            self._delete_chunks(list(chunk_ids))
+            self._conn.execute(q.SQL_DELETE_ORPHAN_ENTITIES)
+
+    def delete_document(self, document_id: str):
+        with self._lock, self._conn:
+            self._conn.execute(q.SQL_DELETE_DOCUMENT_MENTIONS, (document_id,))
+            self._conn.execute(q.SQL_DELETE_DOCUMENT_RELATIONS, (document_id,))
+            self._conn.execute(q.SQL_DELETE_ORPHAN_ENTITIES)
+
+    def entity_ids(self, names: List[str]) -> Dict[str, int]:
+        with self._lock:
+            return self._entity_ids(names)
+
+    def neighbors(self, entity_ids: List[int], limit: int) -> List[Tuple[int, int, float]]:
+        if not entity_ids:
+            return []
+        ids = list(entity_ids)[:500]
+        sql = q.SQL_NEIGHBORS.format(placeholders=self._placeholders(ids))
+        with self._lock:
+            return self._conn.execute(sql, ids + ids + [limit]).fetchall()
+
+    def chunks_for_entities(self, entity_ids: List[int]) -> List[Tuple[str, int, int]]:
+        if not entity_ids:
+            return []
+        ids = list(entity_ids)[:500]
+        sql = q.SQL_CHUNKS_FOR_ENTITIES.format(placeholders=self._placeholders(ids))
+        with self._lock:
+            return self._conn.execute(sql, ids).fetchall()
+
+    def entity_names(self) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return self._conn.execute(q.SQL_ALL_ENTITY_NAMES).fetchall()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entities, mentions, relations = self._conn.execute(q.SQL_STATS).fetchone()
+        return {"backend": "sqlite", "entities": entities, "mentions": mentions, "relations": relations}
+
+
+class Neo4jGraphStore:
+    """Same interface as SQLiteGraphStore on a Neo4j server; entity ids are names."""
+
+    def __init__(self, uri: str = NEO4J_URI, user: str = NEO4J_USER, password: str = NEO4J_PASSWORD):
+        from neo4j import GraphDatabase
+
+        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.driver.verify_connectivity()
+        with self.driver.session() as session:
+            for statement in q.CYPHER_CONSTRAINTS:
+                session.run(statement)
+
+    def _run(self, query: str, **params) -> list:
+        with self.driver.session() as session:
+            return list(session.run(query, **params))
+
+    def add_chunk_graphs(self, document_id: str, graphs: Dict[str, ChunkGraph]):
+        if not graphs:
+            return
+        self._run(q.CYPHER_DELETE_CHUNKS, chunk_ids=list(graphs))
+        for chunk_id, graph in graphs.items():
+            mentions = [{"name": name, **mention} for name, mention in graph.mentions.items()]
+            relations = [
+                {"src": src, "dst": dst, "relation": relation, "weight": weight}
+                for (src, dst, relation), weight in graph.relations.items()
+            ]
+            self._run(q.CYPHER_MERGE_CHUNK, mentions=mentions, chunk_id=chunk_id, document_id=document_id)
+            self._run(q.CYPHER_MERGE_RELATIONS, relations=relations, chunk_id=chunk_id, document_id=document_id)
+
+    def delete_chunks(self, chunk_ids: List[str]):
+        if not chunk_ids:
+            return
+        self._run(q.CYPHER_DELETE_CHUNKS, chunk_ids=list(chunk_ids))
+        self._run(q.CYPHER_DELETE_ORPHAN_ENTITIES)
+
+    def delete_document(self, document_id: str):
+        self._run(q.CYPHER_DELETE_DOCUMENT, document_id=document_id)
+        self._run(q.CYPHER_DELETE_ORPHAN_ENTITIES)
+
+    def entity_ids(self, names: List[str]) -> Dict[str, str]:
+        return {r["name"]: r["id"] for r in self._run(q.CYPHER_ENTITY_IDS, names=list(names))}
+
+    def neighbors(self, entity_ids: List[str], limit: int) -> List[Tuple[str, str, float]]:
+        if not entity_ids:
+            return []
+        records = self._run(q.CYPHER_NEIGHBORS, ids=list(entity_ids), limit=limit)
+        return [(r["node"], r["neighbor"], r["weight"]) for r in records]
+
+    def chunks_for_entities(self, entity_ids: List[str]) -> List[Tuple[str, str, int]]:
+        if not entity_ids:
+            return []
+        records = self._run(q.CYPHER_CHUNKS_FOR_ENTITIES, ids=list(entity_ids))
+        return [(r["chunk_id"], r["entity_id"], r["count"]) for r in records]
+
+    def entity_names(self) -> List[Tuple[str, str, str]]:
+        return [(r["name"], r["label"], r["kind"]) for r in self._run(q.CYPHER_ALL_ENTITY_NAMES)]
+
+    def stats(self) -> dict:
+        record = self._run(q.CYPHER_STATS)[0]
+        return {"backend": "neo4j", "entities": record["entities"],
+                "mentions": record["mentions"], "relations": record["relations"]}
+
+
+class GraphBuilder:
+    """Graph ingestion stage: extract per chunk and write to the graph store."""
+
+    def __init__(self, store, extractor: Optional[EntityRelationExtractor] = None, id_key: str = "doc_id"):
+        self.store = store
+        self.extractor = extractor or EntityRelationExtractor()
+        self.id_key = id_key
+
+    def index_documents(self, document_id: str, docs: List[Document]) -> dict:
+        graphs = {}
+        for doc in docs:
+            chunk_id = doc.metadata.get(self.id_key)
+            if not chunk_id:
+                continue
+            graph = self.extractor.extract(doc.page_content)
+            if len(graph):
+                graphs[chunk_id] = graph
+        self.store.add_chunk_graphs(document_id, graphs)
+
+        relations = sum(len(g.relations) for g in graphs.values())
+        print(f"[GraphBuilder] {document_id}: {len(graphs)} chunks, "
+              f"{sum(len(g) for g in graphs.values())} mentions, {relations} relations")
+        return {"chunks": len(graphs), "relations": relations}
+
+    def remove_chunks(self, chunk_ids: List[str]):
+        self.store.delete_chunks(chunk_ids)
+
+
+_graph_store = None
+_graph_store_lock = threading.Lock()
+
+
+def get_graph_store():
+    """Process-wide graph store; falls back to SQLite if Neo4j is unavailable."""
+    global _graph_store
+    with _graph_store_lock:
+        if _graph_store is None:
+            if GRAPH_BACKEND == "neo4j":
+                try:
+                    _graph_store = Neo4jGraphStore()
+                except Exception as e:
+                    print(f"[GraphBuilder] Neo4j unavailable, using SQLite graph store: {e}")
+            if _graph_store is None:
+                _graph_store = SQLiteGraphStore()
+        return _graph_store
@@ -0,0 +1,146 @@
+# SQLite adjacency tables for the embedded graph store.
+# entities:  one row per normalized entity / citation name
+# mentions:  entity -> chunk (doc_id of a full-content chunk)
+# relations: directed, typed entity -> entity edges, attributed to the chunk they came from
+SQLITE_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS entities (
+    id    INTEGER PRIMARY KEY,
+    name  TEXT NOT NULL UNIQUE,
+    label TEXT NOT NULL,
+    kind  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    entity_id   INTEGER NOT NULL,
+    chunk_id    TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    count       INTEGER NOT NULL,
+    PRIMARY KEY (entity_id, chunk_id)
+);
+CREATE TABLE IF NOT EXISTS relations (
+    src_id      INTEGER NOT NULL,
+    dst_id      INTEGER NOT NULL,
+    relation    TEXT NOT NULL,
+    chunk_id    TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    weight      REAL NOT NULL,
+    PRIMARY KEY (src_id, dst_id, relation, chunk_id)
+);
+CREATE INDEX IF NOT EXISTS idx_mentions_chunk ON mentions (chunk_id);
+CREATE INDEX IF NOT EXISTS idx_mentions_document ON mentions (document_id);
+CREATE INDEX IF NOT EXISTS idx_relations_dst ON relations (dst_id);
+CREATE INDEX IF NOT EXISTS idx_relations_chunk ON relations (chunk_id);
+CREATE INDEX IF NOT EXISTS idx_relations_document ON relations (document_id);
+"""
+
+SQL_UPSERT_ENTITY = """
+INSERT INTO entities (name, label, kind) VALUES (?, ?, ?)
+ON CONFLICT (name) DO NOTHING
+"""
+
+SQL_ENTITY_IDS = "SELECT name, id FROM entities WHERE name IN ({placeholders})"
+
+SQL_INSERT_MENTION = """
+INSERT OR REPLACE INTO mentions (entity_id, chunk_id, document_id, count) VALUES (?, ?, ?, ?)
+"""
+
+SQL_INSERT_RELATION = """
+INSERT INTO relations (src_id, dst_id, relation, chunk_id, document_id, weight) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (src_id, dst_id, relation, chunk_id) DO UPDATE SET weight = weight + excluded.weight
+"""
+
+SQL_DELETE_CHUNK_MENTIONS = "DELETE FROM mentions WHERE chunk_id IN ({placeholders})"
+SQL_DELETE_CHUNK_RELATIONS = "DELETE FROM relations WHERE chunk_id IN ({placeholders})"
+SQL_DELETE_DOCUMENT_MENTIONS = "DELETE FROM mentions WHERE document_id = ?"
+SQL_DELETE_DOCUMENT_RELATIONS = "DELETE FROM relations WHERE document_id = ?"
+# Entities nothing refers to any more
+SQL_DELETE_ORPHAN_ENTITIES = """
+DELETE FROM entities
+WHERE id NOT IN (SELECT entity_id FROM mentions)
+  AND id NOT IN (SELECT src_id FROM relations)
+  AND id NOT IN (SELECT dst_id FROM relations)
+"""
+
+# Undirected one-hop expansion of a frontier, strongest edges first
+SQL_NEIGHBORS = """
+SELECT node, neighbor, SUM(weight) AS weight FROM (
+    SELECT src_id AS node, dst_id AS neighbor, weight FROM relations WHERE src_id IN ({placeholders})
+    UNION ALL
+    SELECT dst_id AS node, src_id AS neighbor, weight FROM relations WHERE dst_id IN ({placeholders})
+)
+GROUP BY node, neighbor
+ORDER BY weight DESC
+LIMIT ?
+"""
+
+SQL_CHUNKS_FOR_ENTITIES = """
+SELECT chunk_id, entity_id, count FROM mentions WHERE entity_id IN ({placeholders})
+"""
+
+SQL_ALL_ENTITY_NAMES = "SELECT name, label, kind FROM entities"
+
+SQL_STATS = """
+SELECT (SELECT COUNT(*) FROM entities), (SELECT COUNT(*) FROM mentions), (SELECT COUNT(*) FROM relations)
+"""
+
+
+# Cypher equivalents for the optional Neo4j backend.
+# (:Entity {name, label, kind})-[:MENTIONED_IN {count}]->(:Chunk {chunk_id, document_id})
+# (:Entity)-[:RELATED {relation, chunk_id, document_id, weight}]->(:Entity)
+CYPHER_CONSTRAINTS = [
+    "CREATE CONSTRAINT entity_name IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (c:Chunk) REQUIRE c.chunk_id IS UNIQUE",
+]
+
+CYPHER_MERGE_CHUNK = """
+UNWIND $mentions AS m
+MERGE (e:Entity {name: m.name}) ON CREATE SET e.label = m.label, e.kind = m.kind
+MERGE (c:Chunk {chunk_id: $chunk_id}) SET c.document_id = $document_id
+MERGE (e)-[r:MENTIONED_IN]->(c) SET r.count = m.count
+"""
+
+CYPHER_MERGE_RELATIONS = """
+UNWIND $relations AS rel
+MATCH (a:Entity {name: rel.src}), (b:Entity {name: rel.dst})
+MERGE (a)-[r:RELATED {relation: rel.relation, chunk_id: $chunk_id}]->(b)
+SET r.document_id = $document_id, r.weight = rel.weight
+"""
+
+CYPHER_DELETE_CHUNKS = """
+MATCH ()-[r:RELATED]->() WHERE r.chunk_id IN $chunk_ids DELETE r
+WITH 1 AS _
+MATCH (c:Chunk) WHERE c.chunk_id IN $chunk_ids DETACH DELETE c
+"""
+
+CYPHER_DELETE_DOCUMENT = """
+MATCH ()-[r:RELATED {document_id: $document_id}]->() DELETE r
+WITH 1 AS _
+MATCH (c:Chunk {document_id: $document_id}) DETACH DELETE c
+"""
+
+CYPHER_DELETE_ORPHAN_ENTITIES = "MATCH (e:Entity) WHERE NOT (e)--() DELETE e"
+
+CYPHER_ENTITY_IDS = "MATCH (e:Entity) WHERE e.name IN $names RETURN e.name AS name, e.name AS id"
+
+CYPHER_NEIGHBORS = """
+MATCH (a:Entity)-[r:RELATED]-(b:Entity)
+WHERE a.name IN $ids
+RETURN a.name AS node, b.name AS neighbor, sum(r.weight) AS weight
+ORDER BY weight DESC
+LIMIT $limit
+"""
+
+CYPHER_CHUNKS_FOR_ENTITIES = """
+MATCH (e:Entity)-[m:MENTIONED_IN]->(c:Chunk)
+WHERE e.name IN $ids
+RETURN c.chunk_id AS chunk_id, e.name AS entity_id, m.count AS count
+"""
+
+CYPHER_ALL_ENTITY_NAMES = "MATCH (e:Entity) RETURN e.name AS name, e.label AS label, e.kind AS kind"
+
+CYPHER_STATS = """
+CALL { MATCH (e:Entity) RETURN count(e) AS entities }
+CALL { MATCH ()-[m:MENTIONED_IN]->() RETURN count(m) AS mentions }
+CALL { MATCH ()-[r:RELATED]->() RETURN count(r) AS relations }
+RETURN entities, mentions, relations
+"""
@@ -0,0 +1,198 @@
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+_TAG_RE = re.compile(r"<[^>]+>")
+# Keeps hyphenated / dotted terms such as "bleu-4", "e5-large" or "v2.1" intact
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the
+their this to was were which with what who how does do did can about into than
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    text = _TAG_RE.sub(" ", text or "").lower()
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        # Also index the parts of compound terms so "bleu" matches "bleu-4"
+        if any(sep in token for sep in "-_."):
+            tokens.extend(part for part in re.split(r"[-_.]", token) if part and part not in STOPWORDS)
+    return tokens
+
+
+def _scalar_metadata(metadata: dict) -> dict:
+    return {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))}
+
+
+def matches_filter(metadata: dict, metadata_filter: Optional[dict]) -> bool:
+    """Whether `metadata` satisfies an AND of equality constraints, as Chroma filters do."""
+    if not metadata_filter:
+        return True
+    return all(metadata.get(k) == v for k, v in metadata_filter.items())
+
+
+class BM25Index:
+    """
+    Incrementally updatable BM25 inverted index persisted as gzip JSON.
+
+    Documents are keyed by doc_id; re-adding an id replaces it. Scalar
+    metadata is kept so searches can apply the same equality filters as
+    the Chroma collections. Updates only change memory; save() writes the
+    file, and skips the write when nothing changed since the last save.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75, id_key: str = "doc_id"):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.id_key = id_key
+        self._docs: Dict[str, dict] = {}             # doc_id -> {"length", "metadata", "terms"}
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: term frequency}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        # Serializes writers of the file; held through the write and the rename
+        self._save_lock = threading.Lock()
+        self._revision = 0
+        self._saved_revision = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _remove(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        self._total_length -= entry["length"]
+        for term in entry["terms"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def add_documents(self, docs: List[Document]):
+        with self._lock:
+            for doc in docs:
+                doc_id = doc.metadata.get(self.id_key)
+                if not doc_id:
+                    continue
+                self._remove(doc_id)
+
+                counts = Counter(tokenize(doc.page_content))
+                length = sum(counts.values())
+                self._docs[doc_id] = {
+                    "length": length,
+                    "metadata": _scalar_metadata(doc.metadata),
+                    "terms": list(counts),
+                }
+                self._total_length += length
+                for term, tf in counts.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+            self._revision += 1
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+            self._revision += 1
+
+    def search(self, query: str, k: int = 10, metadata_filter: dict = None) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, score) pairs; metadata_filter is an AND of equality constraints."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not terms:
+                return []
+            avg_length = self._total_length / n_docs
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    entry = self._docs[doc_id]
+                    if not matches_filter(entry["metadata"], metadata_filter):
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * entry["length"] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def get_metadata(self, doc_id: str) -> Optional[dict]:
+        entry = self._docs.get(doc_id)
+        return dict(entry["metadata"]) if entry else None
+
+    def metadata_values(self, field: str) -> set:
+        """Distinct non-empty values of a metadata field across all documents."""
+        with self._lock:
+            return {entry["metadata"][field] for entry in self._docs.values() if entry["metadata"].get(field)}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._save_lock:
+            self._save()
+
+    def _save(self):
+        with self._lock:
+            revision = self._revision
+            if revision == self._saved_revision:
+                return
+            payload = {
+                "k1": self.k1,
+                "b": self.b,
+                "docs": {
+                    doc_id: {
+                        "metadata": entry["metadata"],
+                        "tf": {term: self._postings[term][doc_id] for term in entry["terms"]},
+                    }
+                    for doc_id, entry in self._docs.items()
+                },
+            }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".bm25_", suffix=".tmp", dir=directory)
+        try:
+            with gzip.open(os.fdopen(fd, "wb"), "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._saved_revision = revision
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._total_length = 0
+            for doc_id, data in payload.get("docs", {}).items():
+                tf = data["tf"]
+                length = sum(tf.values())
+                self._docs[doc_id] = {"length": length, "metadata": data["metadata"], "terms": list(tf)}
+                self._total_length += length
+                for term, count in tf.items():
+                    self._postings.setdefault(term, {})[doc_id] = count
+        print(f"[BM25Index] Loaded {len(self._docs)} documents from {self.path}")
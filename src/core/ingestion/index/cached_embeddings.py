@@ -0,0 +1,172 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.config.cache import EMBEDDING_CACHE_DIR, EMBEDDING_QUERY_LRU_SIZE
+from src.config.models import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_NORMALIZE,
+    EMBEDDING_QUERY_PREFIX,
+    EMBEDDING_PASSAGE_PREFIX,
+    MICRO_BATCHING_ENABLED,
+    EMBED_BATCH_MAX_SIZE,
+    EMBED_BATCH_MAX_WAIT_MS,
+)
+from src.core.helper.lru_cache import LRUCache
+from src.core.helper.micro_batcher import MicroBatcher
+from src.core.helper.telemetry import telemetry
+
+
+class EmbeddingStore:
+    """Persistent text-hash -> float32 vector map in a per-model SQLite file."""
+
+    def __init__(self, model_name: str, cache_dir: str = EMBEDDING_CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, f"{slug}.sqlite3"), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items.items()],
+            )
+            self._conn.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain Embeddings wrapper around a sentence-transformers model.
+
+    Applies the e5 "query: " / "passage: " prefixes, encodes documents in
+    configurable batches, and skips the forward pass for any text whose
+    vector is already in the persistent store (or, for queries, the LRU).
+    Concurrent query embeddings are micro-batched into one forward pass.
+    """
+
+    def __init__(
+        self,
+        model,
+        model_name: str,
+        store: Optional[EmbeddingStore] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        normalize: bool = EMBEDDING_NORMALIZE,
+        query_prefix: str = EMBEDDING_QUERY_PREFIX,
+        passage_prefix: str = EMBEDDING_PASSAGE_PREFIX,
+        query_cache_size: int = EMBEDDING_QUERY_LRU_SIZE,
+        micro_batching: bool = MICRO_BATCHING_ENABLED,
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.store = store
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.query_prefix = query_prefix
+        self.passage_prefix = passage_prefix
+        self.query_cache = LRUCache(query_cache_size)
+        self.encoded_texts = 0
+        self.micro_batching = micro_batching
+        self._query_batcher = None
+        self._batcher_lock = threading.Lock()
+
+    def _key(self, prefixed_text: str) -> str:
+        payload = f"{self.model_name}\x00{int(self.normalize)}\x00{prefixed_text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # HuggingFaceEmbeddings keeps the SentenceTransformer on `.client`
+        encoder = getattr(self.model, "client", self.model)
+        with telemetry.span("embed", texts=len(texts)):
+            vectors = encoder.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        self.encoded_texts += len(texts)
+        telemetry.count_items("embed", len(texts))
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _embed(self, prefixed: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in prefixed]
+        cached = self.store.get_many(list(set(keys))) if self.store else {}
+
+        # Encode each distinct uncached text once
+        missing = {}
+        for key, text in zip(keys, prefixed):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if self.store:
+            telemetry.cache_hit("embedding_store", len(keys) - len(missing))
+            telemetry.cache_miss("embedding_store", len(missing))
+
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            if self.store:
+                self.store.set_many(fresh)
+            cached.update(fresh)
+
+        return [cached[key].tolist() for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed([self.passage_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.query_cache.get(text)
+        if vector is not None:
+            telemetry.cache_hit("query_embedding")
+            return vector
+        telemetry.cache_miss("query_embedding")
+        with telemetry.span("embed_query"):
+            if self.micro_batching:
+                vector = self._get_query_batcher().submit(self.query_prefix + text)
+            else:
+                vector = self._embed([self.query_prefix + text])[0]
+        self.query_cache.set(text, vector)
+        return vector
+
+    def _get_query_batcher(self) -> MicroBatcher:
+        with self._batcher_lock:
+            if self._query_batcher is None:
+                self._query_batcher = MicroBatcher(
+                    "embed_query", self._embed, EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS
+                )
+            return self._query_batcher
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Batch-embed several queries (e.g. classifier exemplars) with the query prefix."""
+        return self._embed([self.query_prefix + text for text in texts])
+
+    def stats(self) -> dict:
+        return {
+            "encoded_texts": self.encoded_texts,
+            "query_cache": self.query_cache.stats(),
+            "query_batches": self._query_batcher.stats() if self._query_batcher else None,
+        }
@@ -0,0 +1,109 @@
+import threading
+from typing import Dict, List, Optional
+
+from src.core.ingestion.index.manifest import DocumentManifest, ManifestStore
+
+
+class UnknownDocument(KeyError):
+    """Raised when a query is scoped to a document that is not in the corpus."""
+
+
+class DocumentConflict(Exception):
+    """
+    Raised when a file with different content arrives under the id of an
+    indexed document and was not marked as a replacement: document ids come
+    from file names, so it may be an unrelated PDF with the same name.
+    """
+
+
+class CorpusRegistry:
+    """
+    The set of indexed documents, read from the ingestion manifests.
+
+    Chroma, the docstore and the sparse index already hold every document
+    in shared collections, so attaching after a restart only means reading
+    the manifests back; nothing is re-ingested. Ingestion is meant to run in
+    the serving process: the BM25 index and the query gazetteer are loaded
+    once per process, so sync() only refreshes the document list when
+    another process moved the corpus version, not what those indexes hold.
+    """
+
+    def __init__(self, manifests: ManifestStore):
+        self.manifests = manifests
+        self._documents: Dict[str, dict] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(manifest: DocumentManifest) -> dict:
+        return {
+            "document_id": manifest.document_id,
+            "file_hash": manifest.file_hash,
+            "chunks": len(manifest.chunks),
+            "images": len(manifest.images),
+            "updated_at": manifest.updated_at,
+        }
+
+    def attach(self) -> int:
+        """Load every manifest; returns the number of documents in the corpus."""
+        version = self.manifests.corpus_version()
+        documents = {}
+        for document_id in self.manifests.list_document_ids():
+            manifest = self.manifests.get(document_id)
+            if manifest is not None:
+                documents[document_id] = self._entry(manifest)
+
+        with self._lock:
+            self._documents = documents
+            self._version = version
+        print(f"[CorpusRegistry] Attached {len(documents)} documents (corpus version {version})")
+        return len(documents)
+
+    def sync(self):
+        """Reload when another ingestion changed the corpus since the last read."""
+        try:
+            version = self.manifests.corpus_version()
+        except Exception as e:
+            print(f"[CorpusRegistry] Could not read corpus version: {e}")
+            return
+        if version != self._version:
+            self.attach()
+
+    def register(self, manifest: DocumentManifest):
+        with self._lock:
+            self._documents[manifest.document_id] = self._entry(manifest)
+
+    def unregister(self, document_id: str):
+        with self._lock:
+            self._documents.pop(document_id, None)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, document_id: str) -> Optional[dict]:
+        return self._documents.get(document_id)
+
+    def documents(self) -> List[dict]:
+        self.sync()
+        with self._lock:
+            return sorted(self._documents.values(), key=lambda d: d["document_id"])
+
+    def latest(self) -> Optional[str]:
+        """Most recently indexed document, the target of unscoped summary intents."""
+        with self._lock:
+            if not self._documents:
+                return None
+            return max(self._documents.values(), key=lambda d: d["updated_at"])["document_id"]
+
+    def resolve(self, document_id: Optional[str]) -> Optional[str]:
+        """Validate an optional document scope; raises UnknownDocument for ids not in the corpus."""
+        if document_id is None:
+            return None
+        if document_id not in self._documents:
+            self.sync()
+        if document_id not in self._documents:
+            raise UnknownDocument(document_id)
+        return document_id
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+MANIFEST_PREFIX = "manifest:"
+MANIFEST_INDEX_KEY = "manifest:__index__"
+# Incremented whenever any document is added, revised or removed
+CORPUS_VERSION_KEY = "corpus:version"
+
+# Metadata that affects filtering; a change here re-indexes the chunk. Page numbers
+# are left out so inserting a page does not re-index every chunk after it.
+ID_METADATA_FIELDS = ("type", "section", "heading")
+
+
+def _digest(*parts: str) -> str:
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+        sha.update(b"\x00")
+    return sha.hexdigest()[:32]
+
+
+def document_id_for(file_path: str) -> str:
+    """
+    Stable document identity across revisions of the same file. Ids are file
+    names, so an unrelated PDF with the same name would share one;
+    QAService.check_upload rejects that unless the upload is marked as a
+    replacement.
+    """
+    return os.path.basename(file_path)
+
+
+def chunk_doc_id(document_id: str, page_content: str, metadata: dict) -> str:
+    fields = [str(metadata.get(field, "")) for field in ID_METADATA_FIELDS]
+    return _digest("chunk", document_id, page_content, *fields)
+
+
+def summary_doc_id(chunk_id: str) -> str:
+    return _digest("summary", chunk_id)
+
+
+def image_doc_id(document_id: str, image_sha256: str) -> str:
+    """Id of an image by the sha256 of its file content."""
+    return _digest("image", document_id, image_sha256)
+
+
+class DocumentManifest:
+    """
+    Record of what has been indexed for one document.
+
+    `chunks` maps each full-content chunk id to the ids of the summaries
+    derived from it; `images` maps each image id to its caption id.
+    `section_titles` are the titles the section summaries are grouped by.
+    """
+
+    def __init__(self, document_id: str, file_hash: str,
+                 chunks: Dict[str, List[str]] = None, images: Dict[str, List[str]] = None,
+                 updated_at: float = None, section_titles: List[str] = None):
+        self.document_id = document_id
+        self.file_hash = file_hash
+        self.chunks = chunks or {}
+        self.images = images or {}
+        self.updated_at = updated_at or time.time()
+        self.section_titles = sorted(section_titles or [])
+
+    def all_ids(self) -> List[str]:
+        ids = []
+        for source_id, derived_ids in list(self.chunks.items()) + list(self.images.items()):
+            ids.append(source_id)
+            ids.extend(derived_ids)
+        return ids
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "document_id": self.document_id,
+            "file_hash": self.file_hash,
+            "chunks": self.chunks,
+            "images": self.images,
+            "updated_at": self.updated_at,
+            "section_titles": self.section_titles,
+        })
+
+    @classmethod
+    def from_json(cls, raw) -> "DocumentManifest":
+        data = json.loads(raw)
+        return cls(
+            document_id=data["document_id"],
+            file_hash=data["file_hash"],
+            chunks=data.get("chunks", {}),
+            images=data.get("images", {}),
+            updated_at=data.get("updated_at"),
+            section_titles=data.get("section_titles"),
+        )
+
+
+class ManifestStore:
+    """Per-document manifests kept in Redis next to the docstore."""
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    def get(self, document_id: str) -> Optional[DocumentManifest]:
+        raw = self.redis.get(MANIFEST_PREFIX + document_id)
+        if raw is None:
+            return None
+        return DocumentManifest.from_json(raw)
+
+    def save(self, manifest: DocumentManifest):
+        manifest.updated_at = time.time()
+        pipe = self.redis.pipeline()
+        pipe.set(MANIFEST_PREFIX + manifest.document_id, manifest.to_json())
+        pipe.sadd(MANIFEST_INDEX_KEY, manifest.document_id)
+        pipe.incr(CORPUS_VERSION_KEY)
+        pipe.execute()
+
+    def delete(self, document_id: str):
+        pipe = self.redis.pipeline()
+        pipe.delete(MANIFEST_PREFIX + document_id)
+        pipe.srem(MANIFEST_INDEX_KEY, document_id)
+        pipe.incr(CORPUS_VERSION_KEY)
+        pipe.execute()
+
+    def corpus_version(self) -> int:
+        raw = self.redis.get(CORPUS_VERSION_KEY)
+        return int(raw) if raw is not None else 0
+
+    def list_document_ids(self) -> List[str]:
+        return sorted(
+            m.decode("utf-8") if isinstance(m, bytes) else m
+            for m in self.redis.smembers(MANIFEST_INDEX_KEY)
+        )
@@ -0,0 +1,109 @@
+import json
+import time
+from typing import Dict, Optional
+
+from src.config.intent import ARTIFACT_CACHE_SIZE
+from src.core.helper.lru_cache import LRUCache
+
+ARTIFACT_PREFIX = "summary:"
+# Chunks without a detected section title are grouped under this name
+UNSECTIONED = "document"
+
+
+class SummaryArtifacts:
+    """
+    Precomputed summaries for one document: a whole-document summary and
+    one summary per section, in reading order.
+    """
+
+    def __init__(self, document_id: str, file_hash: str, document: str,
+                 sections: Dict[str, str] = None, created_at: float = None):
+        self.document_id = document_id
+        self.file_hash = file_hash
+        self.document = document
+        self.sections = sections or {}
+        self.created_at = created_at or time.time()
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "document_id": self.document_id,
+            "file_hash": self.file_hash,
+            "document": self.document,
+            # List of pairs keeps section order through JSON
+            "sections": list(self.sections.items()),
+            "created_at": self.created_at,
+        })
+
+    @classmethod
+    def from_json(cls, raw) -> "SummaryArtifacts":
+        data = json.loads(raw)
+        return cls(
+            document_id=data["document_id"],
+            file_hash=data["file_hash"],
+            document=data["document"],
+            sections=dict(data.get("sections", [])),
+            created_at=data.get("created_at"),
+        )
+
+
+class SummaryArtifactStore:
+    """
+    Summary artifacts in Redis, fronted by an in-process LRU.
+
+    Each version is stored under the file hash it was built from
+    (`summary:{document_id}:{file_hash}`) and `summary:{document_id}:current`
+    points at the live one, so a revision never serves summaries of an
+    older file.
+    """
+
+    def __init__(self, redis_client, cache_size: int = ARTIFACT_CACHE_SIZE):
+        self.redis = redis_client
+        self.cache = LRUCache(cache_size)
+
+    @staticmethod
+    def _version_key(document_id: str, file_hash: str) -> str:
+        return f"{ARTIFACT_PREFIX}{document_id}:{file_hash}"
+
+    @staticmethod
+    def _current_key(document_id: str) -> str:
+        return f"{ARTIFACT_PREFIX}{document_id}:current"
+
+    def current_hash(self, document_id: str) -> Optional[str]:
+        raw = self.redis.get(self._current_key(document_id))
+        if raw is None:
+            return None
+        return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+    def get(self, document_id: str, file_hash: str = None) -> Optional[SummaryArtifacts]:
+        """Live artifacts, or None when missing or not built from `file_hash`."""
+        artifacts = self.cache.get(document_id)
+        if artifacts is None:
+            current = self.current_hash(document_id)
+            raw = self.redis.get(self._version_key(document_id, current)) if current else None
+            if raw is None:
+                return None
+            artifacts = SummaryArtifacts.from_json(raw)
+            self.cache.set(document_id, artifacts)
+
+        if file_hash is not None and artifacts.file_hash != file_hash:
+            return None
+        return artifacts
+
+    def save(self, artifacts: SummaryArtifacts):
+        previous = self.current_hash(artifacts.document_id)
+        pipe = self.redis.pipeline()
+        pipe.set(self._version_key(artifacts.document_id, artifacts.file_hash), artifacts.to_json())
+        pipe.set(self._current_key(artifacts.document_id), artifacts.file_hash)
+        if previous and previous != artifacts.file_hash:
+            pipe.delete(self._version_key(artifacts.document_id, previous))
+        pipe.execute()
+        self.cache.set(artifacts.document_id, artifacts)
+
+    def delete(self, document_id: str):
+        current = self.current_hash(document_id)
+        pipe = self.redis.pipeline()
+        if current:
+            pipe.delete(self._version_key(document_id, current))
+        pipe.delete(self._current_key(document_id))
+        pipe.execute()
+        self.cache.pop(document_id)
@@ -1,19 +1,21 @@
-import uuid
+import hashlib
+import os
 from langchain_community.vectorstores import Chroma
 from langchain_community.storage.redis import RedisStore
 from langchain.schema.document import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.retrievers.multi_vector import MultiVectorRetriever
 from redis import Redis
 
-from src.config.models import EMBEDDING_MODEL
 from src.config.redis import REDIS_URL
+from src.core.helper.model_registry import get_embedding_model
+from src.core.ingestion.index.manifest import ManifestStore
+from src.core.ingestion.index.summary_artifacts import SummaryArtifactStore
+from src.core.ingestion.index.bm25_index import BM25Index
 
 class VectorStoreManager:
     def __init__(self, collection_name="multi_modal_rag", persist_dir="chroma_db"):
-        self.embedding_model = HuggingFaceEmbeddings(
-            model_name=EMBEDDING_MODEL
-        )
+        # Shared across every VectorStoreManager in the process
+        self.embedding_model = get_embedding_model()
         # Store summarized chunks' embeddings 
         self.vectorstore = Chroma(
             collection_name=collection_name,
@@ -23,6 +25,13 @@ class VectorStoreManager:
 
         # Store orignal contents
         self.docstore = RedisStore(client=Redis.from_url(REDIS_URL))        
+        # Sparse (BM25) index over the same entries, persisted beside the Chroma files
+        self.sparse_index = BM25Index(os.path.join(persist_dir, f"{collection_name}_bm25.json.gz"))
+        self._backfill_sparse_index()
+        # Per-document ingestion manifests live next to the docstore
+        self.manifests = ManifestStore(self.docstore.client)
+        # Precomputed document / section summaries served by the query router
+        self.summary_artifacts = SummaryArtifactStore(self.docstore.client)
         # Set the key used to link vector entries to full documents
         self.id_key = "doc_id"
 
@@ -33,13 +42,34 @@ class VectorStoreManager:
             id_key=self.id_key,
         )
 
+    def _backfill_sparse_index(self):
+        """Build the BM25 index from an existing collection that predates it."""
+        if len(self.sparse_index):
+            return
+        try:
+            data = self.vectorstore.get(include=["documents", "metadatas"])
+        except Exception as e:
+            print(f"[VectorStoreManager] Could not read collection for BM25 backfill: {e}")
+            return
+        if not data.get("ids"):
+            return
+
+        docs = [
+            Document(page_content=text or "", metadata={**(metadata or {}), self.id_key: doc_id})
+            for doc_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"])
+        ]
+        self.sparse_index.add_documents(docs)
+        self.sparse_index.save()
+        print(f"[VectorStoreManager] Backfilled BM25 index with {len(docs)} documents")
+
     def add_chunks(self, chunks: list[str], parent_metadata: dict = None):
         """Embed and store summary chunks with parent metadata."""
-        doc_id = str(uuid.uuid4())
+        # Content-derived id so the same chunks are only stored once
+        doc_id = hashlib.sha256("\x00".join(chunks).encode("utf-8")).hexdigest()[:32]
         metadata = parent_metadata or {}
 
         # Check if doc_id already exists in Redis
-        redis_client = self.docstore.redis
+        redis_client = self.docstore.client
         if redis_client.exists(doc_id):
             print(f"Doc_id already exists in Redis: {doc_id}")
             return
@@ -55,7 +85,25 @@ class VectorStoreManager:
         print(f"Stored {len(docs)} chunks under doc_id={doc_id}")
 
     def add_documents(self, docs: list[Document]):
-        self.vectorstore.add_documents(documents=docs)
+        if not docs:
+            return
+        # Use doc_id as the Chroma id so entries can be replaced or deleted later
+        ids = [doc.metadata[self.id_key] for doc in docs]
+        self.vectorstore.add_documents(documents=docs, ids=ids)
+        # Written to disk once per ingestion by save_sparse_index()
+        self.sparse_index.add_documents(docs)
+
+    def delete_documents(self, ids: list[str]):
+        """Remove entries from both the vector store and the docstore."""
+        if not ids:
+            return
+        self.vectorstore.delete(ids=ids)
+        self.docstore.mdelete(ids)
+        self.sparse_index.delete(ids)
+
+    def save_sparse_index(self):
+        """Persist pending BM25 updates; a no-op when there are none."""
+        self.sparse_index.save()
 
     def get_vectorstore(self):
         return self.vectorstore
@@ -63,5 +111,8 @@ class VectorStoreManager:
     def get_docstore(self):
         return self.docstore
 
+    def get_sparse_index(self):
+        return self.sparse_index
+
     def get_retriever(self):
         return self.retriever
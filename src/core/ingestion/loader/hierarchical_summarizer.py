@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Set
+
+from langchain.schema import Document
+
+from src.config.models import (
+    LLM_MODEL,
+    MAX_CONCURRENCY,
+    SUMMARY_TEMPERATURE,
+    SUMMARY_REQUESTS_PER_MINUTE,
+    HIERARCHY_FAN_IN,
+    HIERARCHY_MAX_INPUT_CHARS,
+)
+from src.config.prompts import SECTION_SUMMARY_PROMPT, DOCUMENT_SUMMARY_PROMPT
+from src.core.helper.response_cleaner import ResponseCleaner
+from src.core.helper.model_registry import get_llm_client
+from src.core.ingestion.loader.summarization_engine import SummarizationEngine
+from src.core.ingestion.index.summary_artifacts import SummaryArtifacts, UNSECTIONED
+
+DOCUMENT_SCOPE = "__document__"
+
+
+def batch_for_reduce(parts: List[str], fan_in: int, max_chars: int) -> List[List[str]]:
+    """
+    Consecutive groups of at most `fan_in` parts and (where possible)
+    `max_chars` characters. Every group of a multi-part input holds at least
+    two parts, so each reduce round strictly shrinks the number of parts.
+    """
+    batches, current, size = [], [], 0
+    for part in parts:
+        if len(current) >= fan_in or (len(current) >= 2 and size + len(part) > max_chars):
+            batches.append(current)
+            current, size = [], 0
+        current.append(part)
+        size += len(part)
+    if len(current) == 1 and batches:
+        # Pair a trailing lone part with one from the previous group rather than spend a call on it
+        previous = batches[-1]
+        if len(previous) > 2:
+            current.insert(0, previous.pop())
+        elif len(previous) < fan_in:
+            previous.extend(current)
+            current = []
+    if current:
+        batches.append(current)
+    return batches
+
+
+class HierarchicalSummarizer:
+    """
+    Map-reduce chunk summaries into section summaries, then section
+    summaries into a document summary.
+
+    Each reduce call sees at most `fan_in` inputs, so long sections are
+    reduced over several rounds. Every round submits the groups of all
+    sections at once to the shared SummarizationEngine, which bounds
+    concurrency and request rate.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        fan_in: int = HIERARCHY_FAN_IN,
+        max_input_chars: int = HIERARCHY_MAX_INPUT_CHARS,
+        max_concurrency: int = MAX_CONCURRENCY,
+        requests_per_minute: int = SUMMARY_REQUESTS_PER_MINUTE,
+    ):
+        self.model = LLM_MODEL
+        self.fan_in = max(2, fan_in)
+        self.max_input_chars = max_input_chars
+        self.client = client if client is not None else get_llm_client()
+        self.engine = SummarizationEngine(
+            client=self.client,
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            stage="reduce",
+        )
+        self.llm_calls = 0
+
+    def _request(self, scope: str, parts: List[str]) -> dict:
+        content = "\n\n".join(parts)
+        if scope == DOCUMENT_SCOPE:
+            prompt = DOCUMENT_SUMMARY_PROMPT.replace("{element}", content)
+        else:
+            prompt = SECTION_SUMMARY_PROMPT.replace("{section}", scope).replace("{element}", content)
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": SUMMARY_TEMPERATURE,
+            "max_tokens": 2048,
+            "stream": False,
+        }
+
+    def _join(self, batch: List[str]) -> str:
+        """Fallback for a failed reduce call, bounded like a reduce input."""
+        return "\n".join(batch)[:self.max_input_chars]
+
+    def _reduce(self, groups: Dict[str, List[str]]) -> Dict[str, str]:
+        """Reduce every scope's parts to a single text, all scopes in lock-step rounds."""
+        pending = {scope: parts for scope, parts in groups.items() if parts}
+        done = {}
+        round_no = 0
+        while pending:
+            # A lone part is already its scope's summary
+            for scope in [s for s, parts in pending.items() if len(parts) == 1]:
+                done[scope] = pending.pop(scope)[0]
+            if not pending:
+                break
+
+            jobs = [
+                (scope, batch)
+                for scope, parts in pending.items()
+                for batch in batch_for_reduce(parts, self.fan_in, self.max_input_chars)
+            ]
+            round_no += 1
+            print(f"[HierarchicalSummarizer] Round {round_no}: {len(jobs)} reduce calls "
+                  f"over {len(pending)} scopes")
+            try:
+                outputs = self.engine.run([self._request(scope, batch) for scope, batch in jobs])
+                outputs = [ResponseCleaner.strip_think_block(out or "").strip() for out in outputs]
+            except Exception as e:
+                # Keep ingestion going; the joined text still answers summary queries
+                print(f"[HierarchicalSummarizer] Reduce failed, joining inputs instead: {e}")
+                outputs = [self._join(batch) for _, batch in jobs]
+            self.llm_calls += len(jobs)
+
+            reduced: Dict[str, List[str]] = {}
+            for (scope, batch), output in zip(jobs, outputs):
+                reduced.setdefault(scope, []).append(output or self._join(batch))
+            pending = reduced
+        return done
+
+    @staticmethod
+    def group_by_section(summary_docs: List[Document], section_titles: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+        """
+        Chunk summaries (in reading order) grouped by section title. With
+        `section_titles`, chunks whose section is not a known title stay in
+        the previous section.
+        """
+        grouped: Dict[str, List[str]] = {}
+        current = UNSECTIONED
+        for doc in summary_docs:
+            text = (doc.page_content or "").strip()
+            if not text:
+                continue
+            section = doc.metadata.get("section") or ""
+            if section and (section_titles is None or section in section_titles):
+                current = section
+            grouped.setdefault(current, []).append(text)
+        return grouped
+
+    def summarize(
+        self,
+        document_id: str,
+        file_hash: str,
+        summary_docs: List[Document],
+        section_titles: Optional[Set[str]] = None,
+    ) -> SummaryArtifacts:
+        grouped = self.group_by_section(summary_docs, section_titles or None)
+        sections = self._reduce(grouped)
+        # Reading order, not completion order
+        sections = {name: sections[name] for name in grouped if name in sections}
+
+        if len(sections) > 1:
+            labelled = [f"{name.title()}:\n{text}" for name, text in sections.items()]
+            document = self._reduce({DOCUMENT_SCOPE: labelled})[DOCUMENT_SCOPE]
+        else:
+            document = next(iter(sections.values()), "")
+
+        print(f"[HierarchicalSummarizer] {document_id}: {len(sections)} section summaries, "
+              f"{self.llm_calls} reduce calls")
+        return SummaryArtifacts(document_id, file_hash, document, sections)
@@ -0,0 +1,273 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+
+from src.config.unstructured import (
+    COMPOSITE_BLOCK_TYPE,
+    IMAGE_BLOCK_TYPES,
+    IMAGE_STORE_DIR,
+    IMAGE_MIN_BYTES,
+    IMAGE_MIN_WIDTH,
+    IMAGE_MIN_HEIGHT,
+    IMAGE_MIN_AREA,
+    IMAGE_DHASH_MAX_DISTANCE,
+)
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.loader.partition_cache import file_content_hash
+
+DHASH_SIZE = 8
+
+
+def dhash(image, size: int = DHASH_SIZE) -> int:
+    """64-bit difference hash: sign of the horizontal gradient on a 9x8 grayscale thumbnail."""
+    from PIL import Image
+
+    gray = image.convert("L").resize((size + 1, size), Image.LANCZOS)
+    pixels = list(gray.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def iter_image_elements(chunks) -> Iterator:
+    """Image elements nested in the composite chunks, in document order."""
+    for chunk in chunks:
+        if COMPOSITE_BLOCK_TYPE in str(type(chunk)):
+            for el in chunk.metadata.orig_elements or []:
+                if IMAGE_BLOCK_TYPES in str(type(el)):
+                    yield el
+
+
+class ImageStore:
+    """
+    Content-addressed image files: <root>/<sha256[:2]>/<sha256><ext>.
+
+    Identical images extracted from any document share one file, and a
+    path never changes content, so it is safe to keep in cached partition
+    output and in summary metadata.
+    """
+
+    def __init__(self, root: str = IMAGE_STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}{ext}")
+
+    def contains(self, path: str) -> bool:
+        root = os.path.abspath(self.root)
+        return os.path.abspath(path).startswith(root + os.sep) and os.path.exists(path)
+
+    def _commit(self, tmp_path: str, sha256: str, ext: str) -> str:
+        path = self.path_for(sha256, ext)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic, so concurrent ingestions of the same image cannot see a partial file
+            os.replace(tmp_path, path)
+        return path
+
+    def _staging_file(self) -> str:
+        fd, tmp_path = tempfile.mkstemp(prefix=".incoming_", dir=self.root)
+        os.close(fd)
+        return tmp_path
+
+    def put_file(self, src_path: str, move: bool = False) -> Tuple[str, str]:
+        """Add a file to the store; returns (sha256, stored path)."""
+        sha256 = file_content_hash(src_path)
+        ext = os.path.splitext(src_path)[1].lower() or ".png"
+        if os.path.exists(self.path_for(sha256, ext)):
+            if move:
+                os.remove(src_path)
+            return sha256, self.path_for(sha256, ext)
+
+        tmp_path = self._staging_file()
+        if move:
+            shutil.move(src_path, tmp_path)
+        else:
+            shutil.copyfile(src_path, tmp_path)
+        return sha256, self._commit(tmp_path, sha256, ext)
+
+    def put_bytes(self, data: bytes, ext: str = ".png") -> Tuple[str, str]:
+        sha256 = hashlib.sha256(data).hexdigest()
+        if os.path.exists(self.path_for(sha256, ext)):
+            return sha256, self.path_for(sha256, ext)
+
+        tmp_path = self._staging_file()
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return sha256, self._commit(tmp_path, sha256, ext)
+
+
+class ImageRecord:
+    """One image to caption, referenced by its file in the image store."""
+
+    def __init__(self, path: str, sha256: str, page_number: int = -1,
+                 width: int = 0, height: int = 0, phash: Optional[int] = None):
+        self.path = path
+        self.sha256 = sha256
+        self.page_number = page_number
+        self.width = width
+        self.height = height
+        self.phash = phash
+
+    @property
+    def mime_type(self) -> str:
+        return mimetypes.guess_type(self.path)[0] or "image/png"
+
+    def to_metadata(self) -> dict:
+        return {
+            "image_path": self.path,
+            "page_number": self.page_number,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+class ImageLoader:
+    """
+    Moves extracted image blocks into the image store and selects the ones
+    worth captioning.
+
+    Images are handled one at a time: a file written by partition_pdf is
+    moved into the store, a base64 payload is decoded, stored and dropped
+    from its element, and either way the element's image_path is rewritten
+    to the stored file. Images below the size thresholds are skipped as
+    decorative; exact duplicates (same sha256) and near duplicates
+    (difference hashes within `dhash_max_distance` bits) are kept once.
+    """
+
+    def __init__(
+        self,
+        store: ImageStore = None,
+        min_bytes: int = IMAGE_MIN_BYTES,
+        min_width: int = IMAGE_MIN_WIDTH,
+        min_height: int = IMAGE_MIN_HEIGHT,
+        min_area: int = IMAGE_MIN_AREA,
+        dhash_max_distance: int = IMAGE_DHASH_MAX_DISTANCE,
+    ):
+        self.store = store or ImageStore()
+        self.min_bytes = min_bytes
+        self.min_width = min_width
+        self.min_height = min_height
+        self.min_area = min_area
+        self.dhash_max_distance = dhash_max_distance
+        self.stats = {}
+        self._pil_missing = False
+
+    def _store_element(self, el) -> Optional[Tuple[str, str]]:
+        """(sha256, stored path) for an image element, importing it if needed."""
+        md = el.metadata
+        path = getattr(md, "image_path", None)
+        if path and self.store.contains(path):
+            return os.path.splitext(os.path.basename(path))[0], path
+
+        payload = getattr(md, "image_base64", None)
+        if payload:
+            ext = mimetypes.guess_extension(getattr(md, "image_mime_type", None) or "") or ".png"
+            sha256, path = self.store.put_bytes(base64.b64decode(payload), ext)
+            md.image_base64 = None
+        elif path and os.path.exists(path):
+            sha256, path = self.store.put_file(path, move=True)
+        else:
+            return None
+        md.image_path = path
+        return sha256, path
+
+    def import_images(self, chunks) -> int:
+        """Move every image of `chunks` into the store; returns how many were found."""
+        return sum(1 for el in iter_image_elements(chunks) if self._store_element(el) is not None)
+
+    def _inspect(self, path: str) -> Tuple[int, int, Optional[int]]:
+        """(width, height, dhash) of an image; unknown when PIL is not available."""
+        try:
+            from PIL import Image
+        except ImportError:
+            if not self._pil_missing:
+                print("[ImageLoader] Pillow not installed, skipping size checks and near-duplicate detection")
+                self._pil_missing = True
+            return 0, 0, None
+
+        with Image.open(path) as image:
+            width, height = image.size
+            if width < self.min_width or height < self.min_height or width * height < self.min_area:
+                return width, height, None
+            # Lets the JPEG decoder downscale instead of decoding at full resolution
+            image.draft("L", (DHASH_SIZE * 8, DHASH_SIZE * 8))
+            return width, height, dhash(image)
+
+    def _is_small(self, width: int, height: int) -> bool:
+        if self._pil_missing:
+            return False
+        return width < self.min_width or height < self.min_height or width * height < self.min_area
+
+    def load(self, chunks) -> List[ImageRecord]:
+        stats = {"found": 0, "missing": 0, "small": 0, "duplicates": 0, "near_duplicates": 0}
+        records: List[ImageRecord] = []
+        seen_sha = set()
+
+        with telemetry.span("image_extraction") as span:
+            for el in iter_image_elements(chunks):
+                stats["found"] += 1
+                stored = self._store_element(el)
+                if stored is None:
+                    stats["missing"] += 1
+                    continue
+                sha256, path = stored
+
+                if sha256 in seen_sha:
+                    stats["duplicates"] += 1
+                    continue
+                seen_sha.add(sha256)
+
+                if os.path.getsize(path) < self.min_bytes:
+                    stats["small"] += 1
+                    continue
+                try:
+                    width, height, phash = self._inspect(path)
+                except Exception as e:
+                    print(f"[ImageLoader] Could not read {path}: {e}")
+                    stats["missing"] += 1
+                    continue
+                if self._is_small(width, height):
+                    stats["small"] += 1
+                    continue
+
+                if phash is not None and any(
+                    r.phash is not None and hamming(phash, r.phash) <= self.dhash_max_distance
+                    for r in records
+                ):
+                    stats["near_duplicates"] += 1
+                    continue
+
+                page_number = getattr(el.metadata, "page_number", None)
+                records.append(ImageRecord(
+                    path=path,
+                    sha256=sha256,
+                    page_number=page_number if page_number is not None else -1,
+                    width=width,
+                    height=height,
+                    phash=phash,
+                ))
+            span.update(stats)
+
+        stats["kept"] = len(records)
+        self.stats = stats
+        telemetry.count_items("images_skipped", stats["small"] + stats["duplicates"] + stats["near_duplicates"])
+        print(f"[ImageLoader] Kept {len(records)}/{stats['found']} images "
+              f"({stats['small']} small, {stats['duplicates']} duplicates, "
+              f"{stats['near_duplicates']} near duplicates)")
+        return records
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from src.config.unstructured import IMAGE_BLOCK_TYPES
+from src.core.ingestion.loader.partition_cache import element_to_dict, element_from_dict
+
+
+def pdf_page_count(file_path: str) -> int:
+    import pikepdf
+
+    with pikepdf.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def page_ranges(page_count: int, pages_per_range: int) -> List[Tuple[int, int]]:
+    """1-based inclusive (start, end) ranges covering every page."""
+    return [
+        (start, min(start + pages_per_range - 1, page_count))
+        for start in range(1, page_count + 1, pages_per_range)
+    ]
+
+
+def split_pdf(file_path: str, ranges: List[Tuple[int, int]], out_dir: str) -> List[str]:
+    import pikepdf
+
+    paths = []
+    with pikepdf.open(file_path) as pdf:
+        for start, end in ranges:
+            part = pikepdf.new()
+            part.pages.extend(pdf.pages[start - 1:end])
+            path = os.path.join(out_dir, f"pages_{start:05d}_{end:05d}.pdf")
+            part.save(path)
+            paths.append(path)
+    return paths
+
+
+def _partition_range(part_path: str, page_offset: int, image_dir: str) -> List[dict]:
+    """
+    Worker entry point: hi_res partition of one page range, without chunking.
+    Image blocks are written under `image_dir`.
+
+    Elements are returned as plain dicts so they cross the process boundary
+    cheaply and independent of unstructured's pickling support.
+    """
+    from unstructured.partition.pdf import partition_pdf
+
+    elements = partition_pdf(
+        filename=part_path,
+        infer_table_structure=True,
+        strategy="hi_res",
+        extract_image_block_types=[IMAGE_BLOCK_TYPES],
+        extract_image_block_output_dir=image_dir,
+        extract_image_block_to_payload=False,
+    )
+    for el in elements:
+        if el.metadata.page_number is not None:
+            el.metadata.page_number += page_offset
+    return [element_to_dict(el) for el in elements]
+
+
+def _restore_section_continuity(ranges_elements: List[list]):
+    """
+    Elements at the top of a range belong to the last Title of the previous
+    range; re-link their parent_id so the hierarchy matches a single pass.
+    """
+    last_title_id = None
+    for elements in ranges_elements:
+        seen_title = False
+        for el in elements:
+            if getattr(el, "category", None) == "Title":
+                seen_title = True
+                last_title_id = el.id
+            elif not seen_title and last_title_id and not el.metadata.parent_id:
+                el.metadata.parent_id = last_title_id
+
+
+def _chunk(elements: list, chunking_strategy: str, max_characters: int,
+           combine_text_under_n_chars: int, new_after_n_chars: int) -> list:
+    if chunking_strategy == "by_title":
+        from unstructured.chunking.title import chunk_by_title
+        return chunk_by_title(
+            elements,
+            max_characters=max_characters,
+            combine_text_under_n_chars=combine_text_under_n_chars,
+            new_after_n_chars=new_after_n_chars,
+        )
+    if chunking_strategy == "basic":
+        from unstructured.chunking.basic import chunk_elements
+        return chunk_elements(
+            elements,
+            max_characters=max_characters,
+            new_after_n_chars=new_after_n_chars,
+        )
+    return elements
+
+
+def partition_pdf_parallel(
+    file_path: str,
+    chunking_strategy: str,
+    max_characters: int,
+    combine_text_under_n_chars: int,
+    new_after_n_chars: int,
+    workers: int,
+    pages_per_range: int,
+    image_dir: str,
+) -> list:
+    """
+    Partition page ranges in a process pool, merge them back in page order
+    and chunk the merged element stream, matching partition_pdf's output.
+    """
+    ranges = page_ranges(pdf_page_count(file_path), pages_per_range)
+
+    with tempfile.TemporaryDirectory(prefix="partition_") as tmp_dir:
+        part_paths = split_pdf(file_path, ranges, tmp_dir)
+        # Spawned, not forked: the caller is a worker thread of a process that
+        # already runs torch / tokenizer threads, which a fork can deadlock on
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                # Image file names restart per range, so each range gets its own directory
+                pool.submit(_partition_range, path, start - 1, os.path.join(image_dir, f"pages_{start:05d}"))
+                for path, (start, _) in zip(part_paths, ranges)
+            ]
+            # Collected in submission order, i.e. page order
+            ranges_elements = [[element_from_dict(d) for d in f.result()] for f in futures]
+
+    filename = os.path.basename(file_path)
+    file_directory = os.path.dirname(os.path.abspath(file_path))
+    for elements in ranges_elements:
+        for el in elements:
+            el.metadata.filename = filename
+            el.metadata.file_directory = file_directory
+
+    _restore_section_continuity(ranges_elements)
+    elements = [el for range_elements in ranges_elements for el in range_elements]
+
+    # Re-derive element ids over the merged stream (page numbers changed)
+    try:
+        from unstructured.documents.elements import assign_and_map_hash_ids
+        elements = assign_and_map_hash_ids(elements)
+    except ImportError:
+        pass
+
+    print(f"[partition_pdf_parallel] {len(ranges)} page ranges, {len(elements)} elements")
+    return _chunk(elements, chunking_strategy, max_characters, combine_text_under_n_chars, new_after_n_chars)
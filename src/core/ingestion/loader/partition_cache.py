@@ -0,0 +1,95 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from src.config.cache import PARTITION_CACHE_DIR
+
+# Bump when the serialized layout changes so stale artifacts are ignored
+PARTITION_CACHE_VERSION = 1
+
+
+def file_content_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def element_to_dict(element) -> dict:
+    """Serialize an unstructured element, including nested orig_elements."""
+    from unstructured.staging.base import convert_to_dict
+
+    orig_elements = getattr(element.metadata, "orig_elements", None)
+    data = convert_to_dict([element])[0]
+    data.get("metadata", {}).pop("orig_elements", None)
+    if orig_elements:
+        data["orig_elements"] = [element_to_dict(orig) for orig in orig_elements]
+    return data
+
+
+def element_from_dict(data: dict):
+    from unstructured.staging.base import dict_to_elements
+
+    data = dict(data)
+    orig_elements = data.pop("orig_elements", None)
+    element = dict_to_elements([data])[0]
+    if orig_elements is not None:
+        element.metadata.orig_elements = [element_from_dict(orig) for orig in orig_elements]
+    return element
+
+
+class PartitionCache:
+    """
+    On-disk cache of chunked partition_pdf output.
+
+    Artifacts are gzip-compressed JSON, one file per (PDF content hash,
+    chunking parameters) combination, so layout analysis only runs once per
+    unique document/configuration.
+    """
+
+    def __init__(self, cache_dir: str = PARTITION_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(file_hash: str, chunking_strategy: str, max_characters: int,
+                 combine_text_under_n_chars: int, new_after_n_chars: int) -> str:
+        params = json.dumps({
+            "version": PARTITION_CACHE_VERSION,
+            "file_hash": file_hash,
+            "chunking_strategy": chunking_strategy,
+            "max_characters": max_characters,
+            "combine_text_under_n_chars": combine_text_under_n_chars,
+            "new_after_n_chars": new_after_n_chars,
+        }, sort_keys=True)
+        return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def load(self, key: str) -> Optional[List]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            return [element_from_dict(data) for data in payload["elements"]]
+        except Exception as e:
+            print(f"[PartitionCache] Ignoring unreadable artifact {path}: {e}")
+            return None
+
+    def save(self, key: str, elements: List):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        payload = {
+            "version": PARTITION_CACHE_VERSION,
+            "elements": [element_to_dict(el) for el in elements],
+        }
+        # Write then rename so concurrent readers never see a partial file
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
@@ -1,5 +1,7 @@
+import os
 import re
-import uuid
+import shutil
+import tempfile
 from typing import List
 from src.config.client import client
 from langchain.schema import Document
@@ -12,7 +14,15 @@ from src.config.unstructured import (
     COMPOSITE_BLOCK_TYPE,
     TABLE_BLOCK_TYPE,
     IMAGE_BLOCK_TYPES,
+    PARTITION_WORKERS,
+    PAGES_PER_PARTITION,
 )
+from src.config.cache import PARTITION_CACHE_ENABLED
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.loader.partition_cache import PartitionCache, file_content_hash
+from src.core.ingestion.loader.parallel_partition import partition_pdf_parallel, pdf_page_count
+from src.core.ingestion.loader.image_loader import ImageLoader, ImageRecord
+from src.core.ingestion.index.manifest import document_id_for, chunk_doc_id, image_doc_id
 
 
 class UnstructuredPDFLoader:
@@ -24,6 +34,10 @@ class UnstructuredPDFLoader:
         max_characters: int = MAX_CHARS,
         combine_text_under_n_chars: int = COMBINE_UNDER,
         new_after_n_chars: int = NEW_AFTER,
+        use_partition_cache: bool = PARTITION_CACHE_ENABLED,
+        partition_workers: int = PARTITION_WORKERS,
+        pages_per_partition: int = PAGES_PER_PARTITION,
+        image_loader: ImageLoader = None,
     ):
         self.file_path = file_path
         self.image_output_dir = image_output_dir
@@ -32,22 +46,92 @@ class UnstructuredPDFLoader:
         self.combine_text_under_n_chars = combine_text_under_n_chars
         self.new_after_n_chars = new_after_n_chars
         self.section_titles = set()
-
+        self.partition_cache = PartitionCache() if use_partition_cache else None
+        self.file_hash = None
+        self.document_id = document_id_for(file_path)
+        self.partition_workers = partition_workers
+        self.pages_per_partition = pages_per_partition
+        self.image_loader = image_loader or ImageLoader()
+
+    def get_file_hash(self) -> str:
+        if self.file_hash is None:
+            self.file_hash = file_content_hash(self.file_path)
+        return self.file_hash
+
+    def _partition_cache_key(self) -> str:
+        return PartitionCache.make_key(
+            self.get_file_hash(),
+            self.chunking_strategy,
+            self.max_characters,
+            self.combine_text_under_n_chars,
+            self.new_after_n_chars,
+        )
 
     def load_chunks(self) -> List[Document]:
-        chunks = partition_pdf(
+        cache_key = None
+        if self.partition_cache is not None:
+            cache_key = self._partition_cache_key()
+            cached = self.partition_cache.load(cache_key)
+            if cached is not None:
+                telemetry.cache_hit("partition")
+                print(f"[UnstructuredPDFLoader] Loaded {len(cached)} chunks from partition cache")
+                return cached
+            telemetry.cache_miss("partition")
+
+        # partition_pdf writes image blocks to a private directory; they are moved
+        # into the image store so the cached chunks only hold stable file paths
+        if self.image_output_dir:
+            os.makedirs(self.image_output_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix="images_", dir=self.image_output_dir)
+        try:
+            with telemetry.span("partition") as span:
+                chunks = self._partition(staging_dir)
+                span["chunks"] = len(chunks)
+            self.image_loader.import_images(chunks)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        if cache_key is not None:
+            try:
+                self.partition_cache.save(cache_key, chunks)
+            except Exception as e:
+                print(f"[UnstructuredPDFLoader] Failed to write partition cache: {e}")
+        return chunks
+
+    def _use_parallel_partition(self) -> bool:
+        if self.partition_workers <= 1:
+            return False
+        try:
+            return pdf_page_count(self.file_path) > self.pages_per_partition
+        except Exception as e:
+            print(f"[UnstructuredPDFLoader] Could not count pages, partitioning in-process: {e}")
+            return False
+
+    def _partition(self, image_dir: str):
+        if self._use_parallel_partition():
+            return partition_pdf_parallel(
+                self.file_path,
+                chunking_strategy=self.chunking_strategy,
+                max_characters=self.max_characters,
+                combine_text_under_n_chars=self.combine_text_under_n_chars,
+                new_after_n_chars=self.new_after_n_chars,
+                workers=self.partition_workers,
+                pages_per_range=self.pages_per_partition,
+                image_dir=image_dir,
+            )
+
+        return partition_pdf(
             filename=self.file_path,
             infer_table_structure=True,
             strategy="hi_res",
             extract_image_block_types=[IMAGE_BLOCK_TYPES],
-            image_output_dir_path=self.image_output_dir,
-            extract_image_block_to_payload=True,
+            extract_image_block_output_dir=image_dir,
+            extract_image_block_to_payload=False,
             chunking_strategy=self.chunking_strategy,
             max_characters=self.max_characters,
             combine_text_under_n_chars=self.combine_text_under_n_chars,
             new_after_n_chars=self.new_after_n_chars,
         )
-        return chunks
 
     def separate_tables_and_texts_from_chunks(self, chunks):
         tables = []
@@ -59,28 +143,20 @@ class UnstructuredPDFLoader:
                 texts.append(chunk)
         return tables, texts
 
-    def get_images_from_chunks(self, chunks):
-        images_b64 = []
-        for chunk in chunks:
-            if COMPOSITE_BLOCK_TYPE in str(type(chunk)):
-                orig_elements = chunk.metadata.orig_elements
-                if orig_elements:
-                    for el in orig_elements:
-                        if IMAGE_BLOCK_TYPES in str(type(el)):
-                            images_b64.append(el.metadata.image_base64)
-        return images_b64
+    def get_images_from_chunks(self, chunks) -> List[ImageRecord]:
+        return self.image_loader.load(chunks)
 
-    
-    
     def process_pdf_content(self):
         chunks = self.load_chunks()
         tables_raw, texts_raw = self.separate_tables_and_texts_from_chunks(chunks)
+        # Reading order survives the text / table split through this index
+        chunk_index = {id(chunk): i for i, chunk in enumerate(chunks)}
 
         def clean_section_title(raw_title: str) -> str:
             # Remove leading numbers, dots, dashes, and colons (e.g., "1.", "1.1:", "2-")
             return re.sub(r"^\s*[\d\W_]+", "", raw_title).strip().lower()
         
-        def get_metadata(el, content_type):
+        def get_metadata(el, content_type, page_content):
             md = el.metadata.to_dict() if hasattr(el, "metadata") else {}
 
             # Default section (fallback)
@@ -99,22 +175,26 @@ class UnstructuredPDFLoader:
             if section_title and len(section_title) > 3:
                 self.section_titles.add(section_title)
 
-            return {
-                "doc_id": str(uuid.uuid4()),
+            metadata = {
+                "source": self.document_id,
                 "type": content_type,
                 "heading": md.get("heading", "").strip().lower(),
                 "section": section_title,
                 "page_number": md.get("page_number", -1),
                 "element_id": md.get("id", ""),
                 "parent_id": md.get("parent_id", ""),
+                "element_index": chunk_index.get(id(el), -1),
             }
+            # Content-derived id: identical chunks of the same document keep their id
+            metadata["doc_id"] = chunk_doc_id(self.document_id, page_content, metadata)
+            return metadata
 
-        images_b64 = self.get_images_from_chunks(texts_raw)
+        images = self.get_images_from_chunks(texts_raw)
 
         text_docs = [
             Document(
                 page_content=str(el),
-                metadata=get_metadata(el, "text")
+                metadata=get_metadata(el, "text", str(el))
             )
             for el in texts_raw
         ]
@@ -122,14 +202,25 @@ class UnstructuredPDFLoader:
         table_docs = [
             Document(
                 page_content=el.metadata.text_as_html,
-                metadata=get_metadata(el, "table")
+                metadata=get_metadata(el, "table", el.metadata.text_as_html)
             )
             for el in tables_raw
         ]
 
 
 
-        return text_docs, table_docs, images_b64
+        return text_docs, table_docs, images
     
+    def get_image_metadata(self, images: List[ImageRecord]):
+        return [
+            {
+                "doc_id": image_doc_id(self.document_id, image.sha256),
+                "source": self.document_id,
+                "type": "image",
+                **image.to_metadata(),
+            }
+            for image in images
+        ]
+
     def get_extracted_section_titles(self):
         return list(self.section_titles)
\ No newline at end of file
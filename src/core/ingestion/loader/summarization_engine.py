@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+
+from src.config.models import (
+    MAX_CONCURRENCY,
+    SUMMARY_REQUESTS_PER_MINUTE,
+    SUMMARY_MAX_RETRIES,
+    SUMMARY_BACKOFF_BASE,
+    SUMMARY_BACKOFF_MAX,
+)
+from src.core.helper.completion_cache import CachedChatClient
+from src.core.helper.telemetry import telemetry
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Sliding-window limiter: at most `requests_per_minute` acquisitions per 60s."""
+
+    def __init__(self, requests_per_minute: int, window_seconds: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.window_seconds = window_seconds
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.requests_per_minute or self.requests_per_minute <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self.window_seconds:
+                    self._timestamps.popleft()
+
+                if len(self._timestamps) < self.requests_per_minute:
+                    self._timestamps.append(now)
+                    return
+
+                wait = self.window_seconds - (now - self._timestamps[0])
+            time.sleep(max(wait, 0.01))
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    status = get_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+
+    # Together SDK errors without a status code (timeouts, dropped connections)
+    name = type(error).__name__
+    return any(hint in name for hint in ("RateLimit", "Timeout", "ServiceUnavailable", "APIConnection"))
+
+
+class SummarizationEngine:
+    """
+    Runs chat completion requests on a bounded thread pool.
+
+    Results come back in submission order. Every request that reaches the
+    API passes through a shared requests-per-minute limiter (completion
+    cache hits do not) and is retried on 429/5xx with exponential backoff
+    plus full jitter.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_concurrency: int = MAX_CONCURRENCY,
+        requests_per_minute: int = SUMMARY_REQUESTS_PER_MINUTE,
+        max_retries: int = SUMMARY_MAX_RETRIES,
+        backoff_base: float = SUMMARY_BACKOFF_BASE,
+        backoff_max: float = SUMMARY_BACKOFF_MAX,
+        stage: str = "summarize",
+    ):
+        self.client = client
+        # Telemetry label for the spans and token counts of this engine's requests
+        self.stage = stage
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def complete(self, request: Union[dict, Callable[[], dict]]) -> str:
+        """
+        Send one chat completion request and return the message content.
+        `request` may be a callable that builds the request when it is sent,
+        which keeps large payloads (images) out of memory until then.
+        """
+        if callable(request):
+            request = request()
+        cached_client = isinstance(self.client, CachedChatClient)
+        if cached_client:
+            # Cache hits never reach the API, so they do not spend rate-limit budget
+            cached = self.client.lookup(request)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                with telemetry.span("llm_completion", engine=self.stage):
+                    if cached_client:
+                        response = self.client.create_uncached(request)
+                    else:
+                        response = self.client.chat.completions.create(**request)
+                if not getattr(response, "cached", False):
+                    telemetry.record_llm_usage(self.stage, request.get("model", ""), response)
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self._backoff(attempt)
+                print(f"[SummarizationEngine] Retrying after {type(e).__name__} "
+                      f"(attempt {attempt + 1}/{self.max_retries}) in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def run(self, requests: List[Union[dict, Callable[[], dict]]]) -> List[str]:
+        """Complete all requests concurrently, preserving input order."""
+        if not requests:
+            return []
+        if self.max_concurrency == 1 or len(requests) == 1:
+            return [self.complete(request) for request in requests]
+
+        workers = min(self.max_concurrency, len(requests))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+            return list(pool.map(self.complete, requests))
@@ -1,102 +1,157 @@
-from src.config.models import LLM_MODEL, IMAGE_MODEL
+import base64
+import functools
+import mimetypes
+
+from src.config.models import (
+    LLM_MODEL,
+    IMAGE_MODEL,
+    MAX_CONCURRENCY,
+    SUMMARY_TEMPERATURE,
+    SUMMARY_REQUESTS_PER_MINUTE,
+)
 from src.config.prompts import SUMMARY_PROMPT, IMAGE_SUMMARY_PROMPT
 from src.core.helper.response_cleaner import ResponseCleaner
-from src.config.client import client
+from src.core.helper.model_registry import get_llm_client
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.loader.summarization_engine import SummarizationEngine
+from src.core.ingestion.index.manifest import summary_doc_id
 from langchain.schema import Document
 import uuid
 
 
 class Summarizer:
-    def __init__(self):
+    def __init__(
+        self,
+        client=None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        requests_per_minute: int = SUMMARY_REQUESTS_PER_MINUTE,
+    ):
         self.model = LLM_MODEL
         self.image_model = IMAGE_MODEL
         self.prompt_template = SUMMARY_PROMPT
+        # Any object exposing chat.completions.create works (e.g. a stub for benchmarks)
+        self.client = client if client is not None else get_llm_client()
+        self.engine = SummarizationEngine(
+            client=self.client,
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+        )
 
     def _format_prompt(self, content):
         return self.prompt_template.replace("{element}", content)
 
-    def summarize_text(self, texts):
+    def _text_request(self, content: str) -> dict:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": self._format_prompt(content)}],
+            "temperature": SUMMARY_TEMPERATURE,
+            "max_tokens": 4096,
+            "stream": False,
+        }
+
+    def _image_request(self, image_path: str) -> dict:
+        # Encoded only now, one image per in-flight request
+        with open(image_path, "rb") as f:
+            b64 = base64.b64encode(f.read()).decode("ascii")
+        mime_type = mimetypes.guess_type(image_path)[0] or "image/png"
+        return {
+            "model": self.image_model,
+            "messages": [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": IMAGE_SUMMARY_PROMPT},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{b64}"}}
+                ]
+            }],
+            "max_tokens": 1024,
+            "temperature": SUMMARY_TEMPERATURE,
+            "stream": False,
+        }
+
+    def _text_requests(self, texts):
+        return [
+            self._text_request(doc.page_content if hasattr(doc, "page_content") else str(doc))
+            for doc in texts
+        ]
+
+    def _table_requests(self, tables):
+        # Table Documents already carry text_as_html as page_content
+        return [
+            self._text_request(table.page_content if hasattr(table, "page_content") else table.metadata.text_as_html)
+            for table in tables
+        ]
+
+    def _image_requests(self, image_paths):
+        return [functools.partial(self._image_request, path) for path in image_paths]
+
+    @staticmethod
+    def _summary_id(parent_metadata: dict) -> str:
+        # Derived from the parent chunk so re-summarizing yields the same id
+        parent_id = parent_metadata.get("doc_id") if parent_metadata else None
+        return summary_doc_id(parent_id) if parent_id else str(uuid.uuid4())
+
+    def _build_text_docs(self, texts, outputs):
         results = []
-
-        for doc in texts:
-            text = doc.page_content if hasattr(doc, "page_content") else str(doc)
-            prompt = self._format_prompt(text)
-
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-                max_tokens=4096,
-                stream=False
-            )
-            raw_output = response.choices[0].message.content
+        for doc, raw_output in zip(texts, outputs):
             cleaned = ResponseCleaner.strip_think_block(raw_output)
 
-            doc_id = str(uuid.uuid4())
+            doc_id = self._summary_id(doc.metadata)
             results.append(Document(
                 page_content=cleaned,
                 metadata={**doc.metadata, "doc_id": doc_id, "type": "summary"}
             ))
-
         return results
 
-    def summarize_tables(self, tables):
+    def _build_table_docs(self, tables, outputs):
         results = []
-
-        for table in tables:
-            html = table.metadata.text_as_html
-            prompt = self._format_prompt(html)
-
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-                max_tokens=4096,
-                stream=False
-            )
-            raw_output = response.choices[0].message.content
+        for table, raw_output in zip(tables, outputs):
             cleaned = ResponseCleaner.strip_think_block(raw_output)
 
-            doc_id = str(uuid.uuid4())
+            doc_id = self._summary_id(table.metadata)
             results.append(Document(
                 page_content=cleaned,
                 metadata={**table.metadata, "doc_id": doc_id, "type": "summary"}
             ))
-
         return results
 
-    def summarize_images(self, images_b64):
+    def _build_image_docs(self, outputs, image_metadata=None):
+        image_metadata = image_metadata or [{}] * len(outputs)
         results = []
-
-        for b64 in images_b64:
-            response = client.chat.completions.create(
-                model=self.image_model,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": IMAGE_SUMMARY_PROMPT},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}}
-                    ]
-                }],
-                max_tokens=1024,
-                temperature=0.5,
-                stream=False
-            )
-
-            content = response.choices[0].message.content
+        for content, parent in zip(outputs, image_metadata):
             cleaned = ResponseCleaner.strip_think_block(content)
 
-            doc_id = str(uuid.uuid4())
+            doc_id = self._summary_id(parent)
             results.append(Document(
                 page_content=cleaned,
-                metadata={"doc_id": doc_id, "type": "image"}
+                metadata={**parent, "doc_id": doc_id, "type": "image"}
             ))
-
         return results
 
-    def summarize_all(self, texts, tables, images_b64):
+    def summarize_text(self, texts):
+        outputs = self.engine.run(self._text_requests(texts))
+        return self._build_text_docs(texts, outputs)
+
+    def summarize_tables(self, tables):
+        outputs = self.engine.run(self._table_requests(tables))
+        return self._build_table_docs(tables, outputs)
+
+    def summarize_images(self, image_paths, image_metadata=None):
+        outputs = self.engine.run(self._image_requests(image_paths))
+        return self._build_image_docs(outputs, image_metadata)
+
+    def summarize_all(self, texts, tables, image_paths, image_metadata=None):
+        # Submit every element to one pool so the concurrency budget is shared
+        text_requests = self._text_requests(texts)
+        table_requests = self._table_requests(tables)
+        image_requests = self._image_requests(image_paths)
+
+        requests = text_requests + table_requests + image_requests
+        with telemetry.span("summarize", requests=len(requests)):
+            outputs = self.engine.run(requests)
+        n_texts, n_tables = len(text_requests), len(table_requests)
+
         return {
-            "texts": self.summarize_text(texts),
-            "tables": self.summarize_tables(tables),
-            "images": self.summarize_images(images_b64),
-        }
\ No newline at end of file
+            "texts": self._build_text_docs(texts, outputs[:n_texts]),
+            "tables": self._build_table_docs(tables, outputs[n_texts:n_texts + n_tables]),
+            "images": self._build_image_docs(outputs[n_texts + n_tables:], image_metadata),
+        }
@@ -0,0 +1,203 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from src.core.generation.generation import Generation
+from src.core.generation.semantic_cache import SemanticAnswerCache
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.index.corpus_registry import CorpusRegistry
+from src.core.ingestion.index.summary_artifacts import SummaryArtifactStore
+from src.core.query.query_router import (
+    QueryRouter,
+    RouteDecision,
+    ROUTE_DOCUMENT_SUMMARY,
+    ROUTE_SECTION_SUMMARY,
+)
+from src.core.retrieval.metadata_filter import MetadataFilterExtractor
+from src.core.retrieval.retriever import Retriever
+
+
+class RAGPipeline:
+    """
+    Query-time orchestration: route on intent, answer summary intents from
+    stored artifacts, and send everything else through filter extraction,
+    the semantic answer cache, retrieval and generation.
+
+    Queries search the whole corpus unless a `document_id` scopes them to
+    one document; unscoped summary intents target the most recently
+    indexed document.
+    """
+
+    def __init__(
+        self,
+        store,
+        retriever: Retriever,
+        router: QueryRouter,
+        filter_extractor: MetadataFilterExtractor,
+        artifacts: SummaryArtifactStore,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        corpus: Optional[CorpusRegistry] = None,
+    ):
+        self.store = store
+        self.retriever = retriever
+        self.router = router
+        self.filter_extractor = filter_extractor
+        self.artifacts = artifacts
+        self.answer_cache = answer_cache
+        self.corpus = corpus
+
+    def route(self, query: str, document_id: str = None) -> Tuple[RouteDecision, Optional[str]]:
+        """Routing decision plus the stored answer when the route is an artifact lookup."""
+        artifacts = None
+        if document_id is None and self.corpus is not None:
+            document_id = self.corpus.latest()
+        if document_id:
+            try:
+                artifacts = self.artifacts.get(document_id)
+            except Exception as e:
+                print(f"[RAGPipeline] Could not load summary artifacts for {document_id}: {e}")
+
+        with telemetry.span("routing"):
+            decision = self.router.route(query, artifacts)
+        if decision.route == ROUTE_DOCUMENT_SUMMARY:
+            return decision, artifacts.document
+        if decision.route == ROUTE_SECTION_SUMMARY:
+            return decision, artifacts.sections[decision.section]
+        return decision, None
+
+    def answer(self, query: str, document_id: str = None) -> Dict:
+        with telemetry.span("query") as span:
+            result = self._answer(query, document_id)
+            span["route"] = result["route"]["route"]
+            span["cached"] = bool(result.get("cached"))
+        return result
+
+    def _plan(self, query: str, document_id: str = None) -> Tuple[Dict, object]:
+        """
+        Everything before generation: routing, filter extraction and the
+        semantic cache. Returns (result, answer cache key); the result
+        already holds an "answer" when no generation is needed.
+        """
+        decision, stored = self.route(query, document_id)
+        result = {"query": query, "route": decision.to_dict(), "filter": {}}
+        if stored is not None:
+            return {**result, "answer": stored}, None
+
+        metadata_filter = self._metadata_filter(query, document_id)
+        result["filter"] = metadata_filter
+
+        cache_key = self._answer_cache_key(query)
+        cached = self._lookup_answer(query, cache_key, metadata_filter)
+        if cached is not None:
+            return {**result, "answer": cached, "cached": True}, None
+        return result, cache_key
+
+    def _finish(self, result: Dict, cache_key, generator: Generation, answer: str) -> Dict:
+        if not generator.failed:
+            self._store_answer(result["query"], cache_key, result["filter"], answer)
+        result = {**result, "answer": answer}
+        if generator.last_context is not None:
+            result["context"] = generator.last_context.to_dict()
+        return result
+
+    def _answer(self, query: str, document_id: str = None) -> Dict:
+        result, cache_key = self._plan(query, document_id)
+        if "answer" in result:
+            return result
+
+        generator = Generation(retriever=self.retriever)
+        answer = generator.answer(query, result["filter"])
+        return self._finish(result, cache_key, generator, answer)
+
+    async def aanswer(self, query: str, document_id: str = None) -> Dict:
+        """answer() for the async API: blocking steps run in worker threads, the LLM call does not."""
+        with telemetry.span("query") as span:
+            result, cache_key = await asyncio.to_thread(self._plan, query, document_id)
+            if "answer" not in result:
+                generator = Generation(retriever=self.retriever)
+                answer = await generator.aanswer(query, result["filter"])
+                result = self._finish(result, cache_key, generator, answer)
+            span["route"] = result["route"]["route"]
+            span["cached"] = bool(result.get("cached"))
+        return result
+
+    def stream(self, query: str, document_id: str = None) -> Tuple[dict, Iterator[str]]:
+        """({"route", "filter"}, answer tokens)."""
+        result, cache_key = self._plan(query, document_id)
+        info = {"route": result["route"], "filter": result["filter"]}
+        if "answer" in result:
+            return info, iter([result["answer"]])
+
+        generator = Generation(retriever=self.retriever)
+
+        def tokens():
+            parts = []
+            for token in generator.stream_answer(query, result["filter"]):
+                parts.append(token)
+                yield token
+            # A stream that failed partway ends in an error message after real tokens
+            if not generator.failed:
+                self._store_answer(query, cache_key, result["filter"], "".join(parts))
+
+        return info, tokens()
+
+    async def astream(self, query: str, document_id: str = None) -> Tuple[dict, AsyncIterator[str]]:
+        """Async stream(); an abandoned stream is neither finished upstream nor cached."""
+        result, cache_key = await asyncio.to_thread(self._plan, query, document_id)
+        info = {"route": result["route"], "filter": result["filter"]}
+
+        if "answer" in result:
+            async def stored():
+                yield result["answer"]
+            return info, stored()
+
+        generator = Generation(retriever=self.retriever)
+
+        async def tokens():
+            parts = []
+            async for token in generator.astream_answer(query, result["filter"]):
+                parts.append(token)
+                yield token
+            # A stream that failed partway ends in an error message after real tokens
+            if not generator.failed:
+                self._store_answer(query, cache_key, result["filter"], "".join(parts))
+
+        return info, tokens()
+
+    def _metadata_filter(self, query: str, document_id: str = None) -> dict:
+        metadata_filter = self.filter_extractor.extract(query)
+        if document_id:
+            # Chunks carry their document id as "source"; the filter also keys the answer cache
+            metadata_filter = {**metadata_filter, "source": document_id}
+        return metadata_filter
+
+    def _answer_cache_key(self, query: str):
+        """(query embedding, corpus version) for the semantic answer cache, or None."""
+        if self.answer_cache is None:
+            return None
+        try:
+            query_vector = self.store.embedding_model.embed_query(query)
+            return query_vector, self.store.manifests.corpus_version()
+        except Exception as e:
+            print(f"[RAGPipeline] Semantic cache unavailable: {e}")
+            return None
+
+    def _lookup_answer(self, query: str, cache_key, metadata_filter: dict):
+        if cache_key is None:
+            return None
+        query_vector, corpus_version = cache_key
+        hit = self.answer_cache.lookup(query, query_vector, metadata_filter, corpus_version)
+        if hit is None:
+            telemetry.cache_miss("semantic_answer")
+            return None
+        telemetry.cache_hit("semantic_answer")
+        entry, score = hit
+        print(f"[RAGPipeline] Semantic cache hit (similarity {score:.3f}) for: {entry['query']}")
+        return entry["answer"]
+
+    def _store_answer(self, query: str, cache_key, metadata_filter: dict, answer: str):
+        # Failures and empty retrievals are not worth replaying
+        if cache_key is None or not answer or answer.startswith("LLM error") \
+                or answer == "No relevant context found.":
+            return
+        query_vector, corpus_version = cache_key
+        self.answer_cache.store(query, query_vector, metadata_filter, corpus_version, answer)
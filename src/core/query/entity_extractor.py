@@ -0,0 +1,228 @@
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+from src.config.intent import GAZETTEER_MIN_TERM_LENGTH, GAZETTEER_FUZZY_THRESHOLD
+
+KIND_SECTION = "section"
+KIND_HEADING = "heading"
+KIND_ENTITY = "entity"
+# When a name is several kinds, the first one here wins
+KIND_PRIORITY = (KIND_SECTION, KIND_HEADING, KIND_ENTITY)
+
+MAX_FUZZY_NGRAM = 4
+
+# Words that mark a name as a document part ("the results section", "section: method")
+_STRUCTURE_CUE = r"(?:section|chapter|heading|part)"
+_CUE_BEFORE_RE = re.compile(_STRUCTURE_CUE + r"\s*:?\s*[\"']?$")
+_CUE_AFTER_RE = re.compile(r"^[\"']?\s+" + _STRUCTURE_CUE + r"\b")
+_QUOTES = "\"'"
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher: one pass over the text finds every
+    occurrence of every pattern, in time linear in the text length plus
+    the number of matches.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str):
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _link(self):
+        # Breadth-first failure links; outputs of the fallback state are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, pattern index) for every occurrence."""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index in self._out[node]:
+                yield i + 1 - len(self.patterns[index]), i + 1, index
+
+
+class EntityMatch:
+    def __init__(self, name: str, kind: str, start: int, end: int, score: float = 100.0):
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.score = score
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "kind": self.kind, "start": self.start, "end": self.end, "score": self.score}
+
+
+class EntityExtractor:
+    """
+    Gazetteer-based query entity extraction.
+
+    Terms are the entity names, section titles and headings collected at
+    ingestion. Exact matches come from an Aho-Corasick automaton (whole
+    words, longest match wins); when nothing matches, query n-grams are
+    compared to the term list with rapidfuzz. The automaton is rebuilt and
+    swapped in only when a new document brings terms it has not seen.
+    """
+
+    def __init__(self, min_length: int = GAZETTEER_MIN_TERM_LENGTH,
+                 fuzzy_threshold: int = GAZETTEER_FUZZY_THRESHOLD):
+        self.min_length = min_length
+        self.fuzzy_threshold = fuzzy_threshold
+        # (term -> kind, term list, automaton), replaced as a whole on rebuild
+        self._snapshot: Tuple[Dict[str, str], List[str], AhoCorasick] = ({}, [], AhoCorasick([]))
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def add_terms(self, terms: Iterable[Tuple[str, str]]) -> int:
+        """Add (name, kind) pairs; returns how many were new."""
+        with self._lock:
+            current_terms = self._snapshot[0]
+            terms_copy = dict(current_terms)
+            added = 0
+            for name, kind in terms:
+                name = normalize_text(name)
+                if len(name) < self.min_length or kind not in KIND_PRIORITY:
+                    continue
+                current = terms_copy.get(name)
+                if current is None:
+                    added += 1
+                elif KIND_PRIORITY.index(kind) >= KIND_PRIORITY.index(current):
+                    continue
+                terms_copy[name] = kind
+
+            if terms_copy == current_terms:
+                return 0
+
+            # Build off to the side, then swap: queries never see a half-built automaton
+            names = list(terms_copy)
+            self._snapshot = (terms_copy, names, AhoCorasick(names))
+            self.rebuilds += 1
+        print(f"[EntityExtractor] Gazetteer rebuilt with {len(names)} terms (+{added})")
+        return added
+
+    @staticmethod
+    def _is_word_boundary(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def _exact(self, text: str, terms: Dict[str, str], automaton: AhoCorasick) -> List[EntityMatch]:
+        candidates = [
+            (start, end, automaton.patterns[index])
+            for start, end, index in automaton.iter_matches(text)
+            if self._is_word_boundary(text, start, end)
+        ]
+        # Longest match first, then leftmost; drop anything overlapping a kept match
+        candidates.sort(key=lambda c: (-(c[1] - c[0]), c[0]))
+        kept: List[EntityMatch] = []
+        for start, end, name in candidates:
+            if all(end <= m.start or start >= m.end for m in kept):
+                kept.append(EntityMatch(name, terms[name], start, end))
+        kept.sort(key=lambda m: m.start)
+        return kept
+
+    def _fuzzy(self, text: str, terms: Dict[str, str], names: List[str]) -> List[EntityMatch]:
+        matches = []
+        spans = [(m.start(), m.end()) for m in re.finditer(r"[\w.-]+", text)]
+        for n in range(MAX_FUZZY_NGRAM, 0, -1):
+            for i in range(len(spans) - n + 1):
+                start, end = spans[i][0], spans[i + n - 1][1]
+                gram = text[start:end]
+                if len(gram) < max(5, self.min_length):
+                    continue
+                if any(start < m.end and end > m.start for m in matches):
+                    continue
+                best = process.extractOne(gram, names, scorer=fuzz.ratio, score_cutoff=self.fuzzy_threshold)
+                if best is not None:
+                    name, score, _ = best
+                    matches.append(EntityMatch(name, terms[name], start, end, float(score)))
+        matches.sort(key=lambda m: m.start)
+        return matches
+
+    def extract(self, query: str, fuzzy: bool = True) -> List[EntityMatch]:
+        text = normalize_text(query)
+        terms, names, automaton = self._snapshot
+        if not terms:
+            return []
+        matches = self._exact(text, terms, automaton)
+        if not matches and fuzzy and self.fuzzy_threshold:
+            matches = self._fuzzy(text, terms, names)
+        return matches
+
+    def entity_names(self, query: str) -> List[str]:
+        # Titles can also be graph entities, so every matched name is returned
+        return [m.name for m in self.extract(query)]
+
+    @staticmethod
+    def is_explicit(text: str, match: EntityMatch) -> bool:
+        """
+        Whether a match unambiguously names a document part: a multi-word
+        title, a quoted one, or one next to a cue such as "section". A lone
+        common word ("model", "results") is not.
+        """
+        if " " in match.name:
+            return True
+        before, after = text[:match.start], text[match.end:]
+        if before[-1:] in _QUOTES and after[:1] in _QUOTES:
+            return True
+        return bool(_CUE_BEFORE_RE.search(before.rstrip()) or _CUE_AFTER_RE.match(after))
+
+    def metadata_filter(self, query: str, matches: Optional[List[EntityMatch]] = None) -> dict:
+        """
+        Equality filter on the first explicitly named section title, else
+        heading. Incidental matches are left out: a hard filter on them would
+        hide every other part of the document.
+        """
+        matches = self.extract(query) if matches is None else matches
+        text = normalize_text(query)
+        for kind in (KIND_SECTION, KIND_HEADING):
+            for match in matches:
+                if match.kind == kind and self.is_explicit(text, match):
+                    return {kind: match.name}
+        return {}
@@ -0,0 +1,148 @@
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.intent import (
+    TYPE_EXEMPLARS,
+    INTENT_EXEMPLARS,
+    INTENT_TEMPERATURE,
+    TYPE_CONFIDENCE_THRESHOLD,
+    INTENT_CONFIDENCE_THRESHOLD,
+    TYPE_CALIBRATION_EXAMPLES,
+    INTENT_CALIBRATION_EXAMPLES,
+    CALIBRATION_TARGET_PRECISION,
+)
+from src.core.helper.model_registry import get_embedding_model
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class PrototypeClassifier:
+    """
+    Nearest-prototype classifier over query embeddings.
+
+    Each label is the normalized mean embedding of its exemplars, computed
+    once. Classifying a query is one embedding plus a dot product; the
+    softmax over similarities (with a temperature) is the confidence.
+    """
+
+    def __init__(self, exemplars: Dict[str, List[str]], embedding_model,
+                 temperature: float = INTENT_TEMPERATURE, threshold: float = 0.5):
+        self.exemplars = exemplars
+        self.embedding_model = embedding_model
+        self.temperature = temperature
+        self.threshold = threshold
+        self.labels = list(exemplars)
+        self._prototypes = None
+        self._lock = threading.Lock()
+
+    def _embed_queries(self, texts: List[str]) -> np.ndarray:
+        # Exemplars are queries too, so they use the same "query: " prefix
+        if hasattr(self.embedding_model, "embed_queries"):
+            vectors = self.embedding_model.embed_queries(texts)
+        else:
+            vectors = [self.embedding_model.embed_query(text) for text in texts]
+        return np.asarray(vectors, dtype=np.float32)
+
+    @property
+    def prototypes(self) -> np.ndarray:
+        if self._prototypes is None:
+            with self._lock:
+                if self._prototypes is None:
+                    rows = [_normalize(self._embed_queries(self.exemplars[label])).mean(axis=0)
+                            for label in self.labels]
+                    self._prototypes = _normalize(np.stack(rows))
+        return self._prototypes
+
+    def probabilities(self, query: str, query_vector=None) -> np.ndarray:
+        if query_vector is None:
+            query_vector = self.embedding_model.embed_query(query)
+        vec = _normalize(np.asarray(query_vector, dtype=np.float32))
+        logits = (self.prototypes @ vec) / self.temperature
+        logits -= logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def predict(self, query: str, query_vector=None) -> Tuple[str, float]:
+        probs = self.probabilities(query, query_vector)
+        best = int(np.argmax(probs))
+        return self.labels[best], float(probs[best])
+
+    def classify(self, query: str, query_vector=None) -> Optional[str]:
+        """Top label, or None when its confidence is below the threshold."""
+        label, confidence = self.predict(query, query_vector)
+        return label if confidence >= self.threshold else None
+
+    def calibrate(self, examples: List[Tuple[str, str]], target_precision: float = 0.9,
+                  temperatures=(0.005, 0.01, 0.02, 0.03, 0.05, 0.1)) -> dict:
+        """
+        Fit the temperature by minimum negative log-likelihood on labelled
+        (query, label) pairs, then pick the lowest confidence threshold whose
+        accepted predictions reach `target_precision`. When no threshold
+        reaches it, the current threshold is kept.
+        """
+        vectors = self._embed_queries([q for q, _ in examples])
+        sims = _normalize(vectors) @ self.prototypes.T
+        gold = np.array([self.labels.index(label) for _, label in examples])
+
+        def log_softmax(t):
+            logits = sims / t
+            logits = logits - logits.max(axis=1, keepdims=True)
+            return logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+
+        best_t = min(temperatures, key=lambda t: -log_softmax(t)[np.arange(len(gold)), gold].mean())
+        probs = np.exp(log_softmax(best_t))
+        predicted = probs.argmax(axis=1)
+        confidence = probs.max(axis=1)
+
+        threshold = self.threshold
+        for candidate in sorted(set(np.round(confidence, 3))):
+            accepted = confidence >= candidate
+            if accepted.any() and (predicted[accepted] == gold[accepted]).mean() >= target_precision:
+                threshold = float(candidate)
+                break
+
+        self.temperature, self.threshold = best_t, threshold
+        accuracy = float((predicted == gold).mean()) if len(gold) else math.nan
+        return {"temperature": best_t, "threshold": threshold, "accuracy": accuracy}
+
+
+class IntentClassifier:
+    """Content-type ("text"/"table"/"image") and query-intent classification."""
+
+    def __init__(self, embedding_model=None):
+        embedding_model = embedding_model or get_embedding_model()
+        self.type_classifier = PrototypeClassifier(
+            TYPE_EXEMPLARS, embedding_model, threshold=TYPE_CONFIDENCE_THRESHOLD
+        )
+        self.intent_classifier = PrototypeClassifier(
+            INTENT_EXEMPLARS, embedding_model, threshold=INTENT_CONFIDENCE_THRESHOLD
+        )
+
+    def calibrate(self, target_precision: float = CALIBRATION_TARGET_PRECISION) -> dict:
+        """Fit both classifiers' temperature and threshold on the held-out examples."""
+        report = {
+            "type": self.type_classifier.calibrate(TYPE_CALIBRATION_EXAMPLES, target_precision),
+            "intent": self.intent_classifier.calibrate(INTENT_CALIBRATION_EXAMPLES, target_precision),
+        }
+        print(f"[IntentClassifier] Calibrated: {report}")
+        return report
+
+    def classify_type(self, query: str, query_vector=None) -> Optional[str]:
+        return self.type_classifier.classify(query, query_vector)
+
+    def classify_intent(self, query: str, query_vector=None) -> Optional[str]:
+        return self.intent_classifier.classify(query, query_vector)
+
+    def predict_intent(self, query: str, query_vector=None) -> Tuple[str, float]:
+        """Top intent label and its confidence, whether or not it clears the threshold."""
+        return self.intent_classifier.predict(query, query_vector)
+
+    @property
+    def intent_threshold(self) -> float:
+        return self.intent_classifier.threshold
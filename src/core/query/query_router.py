@@ -0,0 +1,107 @@
+import re
+import time
+from typing import Optional, Tuple
+
+from rapidfuzz import fuzz
+
+from src.config.constants import SUMMARY_INTENT_FULL, SUMMARY_INTENT_SECTION, QUERY_INTENT_DETAIL
+from src.config.intent import SECTION_MATCH_THRESHOLD
+from src.core.ingestion.index.summary_artifacts import SummaryArtifacts, UNSECTIONED
+
+ROUTE_DOCUMENT_SUMMARY = "document_summary"
+ROUTE_SECTION_SUMMARY = "section_summary"
+ROUTE_RETRIEVAL = "retrieval"
+
+_SUMMARY_RE = re.compile(r"\b(summar\w*|overview|tl;?dr|gist|recap|in short|what is (this|the) (paper|document|article) about)\b")
+_SECTION_RE = re.compile(r"\b(section|chapter|part)\b")
+
+
+class RouteDecision:
+    def __init__(self, intent: str, route: str, section: Optional[str] = None,
+                 confidence: float = None, source: str = "default", elapsed_ms: float = 0.0):
+        self.intent = intent
+        self.route = route
+        self.section = section
+        self.confidence = confidence
+        self.source = source
+        self.elapsed_ms = elapsed_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "intent": self.intent,
+            "route": self.route,
+            "section": self.section,
+            "confidence": self.confidence,
+            "source": self.source,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+class QueryRouter:
+    """
+    Dispatch a query on its intent.
+
+    Full-document and section summaries are served from precomputed
+    summary artifacts; everything else (or a summary request that cannot be
+    matched to an artifact) goes through retrieval. Keyword rules are tried
+    first, the embedding intent classifier only when they are inconclusive.
+    """
+
+    def __init__(self, intent_classifier=None, section_threshold: int = SECTION_MATCH_THRESHOLD):
+        self.intent_classifier = intent_classifier
+        self.section_threshold = section_threshold
+
+    def match_section(self, query: str, artifacts: Optional[SummaryArtifacts]) -> Optional[str]:
+        if artifacts is None:
+            return None
+        query = query.lower()
+        best, best_score = None, 0
+        for name in artifacts.sections:
+            if name == UNSECTIONED:
+                continue
+            score = fuzz.partial_ratio(name, query)
+            if score > best_score:
+                best, best_score = name, score
+        return best if best_score >= self.section_threshold else None
+
+    def classify(self, query: str, section: Optional[str]) -> Tuple[str, Optional[float], str]:
+        """(intent, confidence, source) using rules first, then the classifier."""
+        lowered = query.lower()
+        if _SUMMARY_RE.search(lowered):
+            if section or _SECTION_RE.search(lowered):
+                return SUMMARY_INTENT_SECTION, None, "rules"
+            return SUMMARY_INTENT_FULL, None, "rules"
+
+        if self.intent_classifier is not None:
+            try:
+                label, confidence = self.intent_classifier.predict_intent(query)
+                if confidence >= self.intent_classifier.intent_threshold:
+                    return label, confidence, "classifier"
+            except Exception as e:
+                print(f"[QueryRouter] Intent classification failed: {e}")
+
+        return QUERY_INTENT_DETAIL, None, "default"
+
+    def route(self, query: str, artifacts: Optional[SummaryArtifacts] = None) -> RouteDecision:
+        start = time.perf_counter()
+        section = self.match_section(query, artifacts)
+        intent, confidence, source = self.classify(query, section)
+
+        route = ROUTE_RETRIEVAL
+        if intent == SUMMARY_INTENT_FULL and artifacts is not None and artifacts.document:
+            route = ROUTE_DOCUMENT_SUMMARY
+        elif intent == SUMMARY_INTENT_SECTION and section is not None:
+            route = ROUTE_SECTION_SUMMARY
+        elif intent != QUERY_INTENT_DETAIL:
+            print(f"[QueryRouter] No summary artifact for intent={intent}, falling back to retrieval")
+
+        decision = RouteDecision(
+            intent=intent,
+            route=route,
+            section=section if route == ROUTE_SECTION_SUMMARY else None,
+            confidence=confidence,
+            source=source,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+        print(f"[QueryRouter] {decision.to_dict()} <- {query!r}")
+        return decision
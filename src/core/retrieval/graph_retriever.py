@@ -0,0 +1,124 @@
+import heapq
+import math
+import re
+import time
+from typing import Dict, List, Tuple
+
+from src.config.graph import (
+    GRAPH_MAX_HOPS,
+    GRAPH_MAX_NODES,
+    GRAPH_HOP_FANOUT,
+    GRAPH_TIME_BUDGET_MS,
+    GRAPH_HOP_DECAY,
+    GRAPH_TOP_K,
+)
+from src.core.ingestion.graph.graph_builder import normalize_entity
+
+MAX_NGRAM = 4
+
+
+def query_ngrams(query: str, max_n: int = MAX_NGRAM) -> List[str]:
+    """Normalized word n-grams of the query, for exact entity-name lookup."""
+    words = [w for w in (normalize_entity(w) for w in query.split()) if w]
+    grams = []
+    for n in range(1, max_n + 1):
+        for i in range(len(words) - n + 1):
+            grams.append(" ".join(words[i:i + n]))
+    # "[12]" in a query refers to the same citation node as in the text
+    grams.extend(f"cite:{n}" for n in re.findall(r"\[(\d+)\]", query))
+    return grams
+
+
+class GraphRetriever:
+    """
+    Entity-graph retrieval: find the entities named in the query, expand
+    them breadth-first over related entities for a bounded number of hops,
+    and rank the chunks that mention the visited entities.
+
+    Expansion stops at `max_hops`, after `max_nodes` entities, or when the
+    per-query `time_budget_ms` runs out, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        store,
+        max_hops: int = GRAPH_MAX_HOPS,
+        max_nodes: int = GRAPH_MAX_NODES,
+        hop_fanout: int = GRAPH_HOP_FANOUT,
+        time_budget_ms: float = GRAPH_TIME_BUDGET_MS,
+        hop_decay: float = GRAPH_HOP_DECAY,
+        top_k: int = GRAPH_TOP_K,
+        entity_extractor=None,
+    ):
+        self.store = store
+        # Gazetteer over the graph's entity names; n-gram lookup without it
+        self.entity_extractor = entity_extractor
+        self.max_hops = max_hops
+        self.max_nodes = max_nodes
+        self.hop_fanout = hop_fanout
+        self.time_budget_ms = time_budget_ms
+        self.hop_decay = hop_decay
+        self.top_k = top_k
+
+    def query_entities(self, query: str) -> Dict:
+        """Entity id -> seed score for every entity named in the query."""
+        if self.entity_extractor is not None and len(self.entity_extractor):
+            names = self.entity_extractor.entity_names(query)
+            names.extend(f"cite:{n}" for n in re.findall(r"\[(\d+)\]", query))
+        else:
+            names = query_ngrams(query)
+        ids = self.store.entity_ids(names) if names else {}
+        # Longer names are more specific; "layer normalization" beats "layer"
+        return {entity_id: float(len(name.split())) for name, entity_id in ids.items()}
+
+    def expand(self, seeds: Dict, deadline: float) -> Tuple[Dict, int]:
+        """Bounded BFS from the seeds; returns (entity id -> score, hops completed)."""
+        scores = dict(seeds)
+        frontier = dict(seeds)
+        hops = 0
+        while frontier and hops < self.max_hops and len(scores) < self.max_nodes:
+            if time.perf_counter() >= deadline:
+                print(f"[GraphRetriever] Time budget exhausted after {hops} hops")
+                break
+
+            edges = self.store.neighbors(list(frontier), self.hop_fanout)
+            strongest = max((weight for _, _, weight in edges), default=1.0) or 1.0
+            next_frontier = {}
+            for node, neighbor, weight in edges:
+                if neighbor in scores:
+                    continue
+                score = frontier.get(node, 0.0) * self.hop_decay * (weight / strongest)
+                if score > next_frontier.get(neighbor, 0.0):
+                    next_frontier[neighbor] = score
+
+            room = self.max_nodes - len(scores)
+            next_frontier = dict(heapq.nlargest(room, next_frontier.items(), key=lambda item: item[1]))
+            scores.update(next_frontier)
+            frontier = next_frontier
+            hops += 1
+        return scores, hops
+
+    def search(self, query: str, k: int = None) -> List[Tuple[str, float]]:
+        """Top-k (chunk doc_id, score) pairs."""
+        start = time.perf_counter()
+        deadline = start + self.time_budget_ms / 1000
+        k = k or self.top_k
+
+        try:
+            seeds = self.query_entities(query)
+            if not seeds:
+                return []
+            entity_scores, hops = self.expand(seeds, deadline)
+
+            chunk_scores: Dict[str, float] = {}
+            for chunk_id, entity_id, count in self.store.chunks_for_entities(list(entity_scores)):
+                chunk_scores[chunk_id] = chunk_scores.get(chunk_id, 0.0) + \
+                    entity_scores[entity_id] * (1 + math.log(count))
+        except Exception as e:
+            print(f"[GraphRetriever] Graph search failed: {e}")
+            return []
+
+        results = heapq.nlargest(k, chunk_scores.items(), key=lambda item: item[1])
+        print(f"[GraphRetriever] seeds={len(seeds)} entities={len(entity_scores)} hops={hops} "
+              f"chunks={len(results)} in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return results
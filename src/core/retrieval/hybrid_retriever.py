@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from langchain.schema.document import Document
+from langchain_community.vectorstores import Chroma
+
+from src.config.retrieval import TOP_K_RETRIEVAL, HYBRID_CANDIDATES_K, RRF_K
+from src.core.helper.telemetry import telemetry
+from src.core.ingestion.index.bm25_index import BM25Index, matches_filter
+from src.core.retrieval.retriever import Retriever
+from src.core.retrieval.graph_retriever import GraphRetriever
+
+# Shared by all hybrid retrievers; each query uses at most three workers
+_search_pool = ThreadPoolExecutor(max_workers=12, thread_name_prefix="hybrid-search")
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class HybridRetriever(Retriever):
+    """
+    BM25 + dense (+ optional entity graph) retrieval fused with reciprocal
+    rank fusion.
+
+    The searches run concurrently with the same metadata filter; the fused
+    top-k is enriched from the docstore and reranked like Retriever.
+    """
+
+    def __init__(
+        self,
+        vectorstore: Chroma,
+        docstore,
+        embedding_function,
+        sparse_index: BM25Index,
+        candidates_k: int = HYBRID_CANDIDATES_K,
+        rrf_k: int = RRF_K,
+        graph_retriever: GraphRetriever = None,
+        **kwargs
+    ):
+        super().__init__(vectorstore, docstore, embedding_function, **kwargs)
+        self.sparse_index = sparse_index
+        self.graph_retriever = graph_retriever
+        self.candidates_k = candidates_k
+        self.rrf_k = rrf_k
+
+    def sparse_search(self, query: str, k: int, metadata_filter: dict = None) -> List[Tuple[str, float]]:
+        with telemetry.span("sparse_search", k=k):
+            return self.sparse_index.search(query, k=k, metadata_filter=metadata_filter)
+
+    def graph_search(self, query: str, k: int, metadata_filter: dict = None) -> List[Tuple[str, float]]:
+        if self.graph_retriever is None:
+            return []
+        with telemetry.span("graph_search", k=k):
+            results = self.graph_retriever.search(query, k)
+        if not metadata_filter:
+            return results
+        # The graph has no metadata; filter on what the sparse index keeps per chunk
+        return [
+            (doc_id, score) for doc_id, score in results
+            if matches_filter(self.sparse_index.get_metadata(doc_id) or {}, metadata_filter)
+        ]
+
+    def hybrid_search(self, query: str, k: int, metadata_filter: dict = None) -> List[Tuple[Document, float]]:
+        dense_future = _search_pool.submit(self.dense_search, query, self.candidates_k, metadata_filter)
+        sparse_future = _search_pool.submit(self.sparse_search, query, self.candidates_k, metadata_filter)
+        graph_future = _search_pool.submit(self.graph_search, query, self.candidates_k, metadata_filter) \
+            if self.graph_retriever is not None else None
+        dense_results = dense_future.result()
+        sparse_results = sparse_future.result()
+        graph_results = graph_future.result() if graph_future is not None else []
+
+        dense_docs = {doc.metadata.get(self.id_key): doc for doc, _ in dense_results}
+        fused = reciprocal_rank_fusion(
+            [
+                [doc.metadata.get(self.id_key) for doc, _ in dense_results],
+                [doc_id for doc_id, _ in sparse_results],
+                [doc_id for doc_id, _ in graph_results],
+            ],
+            k=self.rrf_k,
+        )[:k]
+
+        results = []
+        for doc_id, score in fused:
+            doc = dense_docs.get(doc_id)
+            if doc is None:
+                # Sparse/graph-only hit: content comes from the docstore during enrichment
+                doc = Document(page_content="", metadata=self.sparse_index.get_metadata(doc_id) or {self.id_key: doc_id})
+            results.append((doc, score))
+
+        print(f"[HybridRetriever] dense={len(dense_results)} sparse={len(sparse_results)} "
+              f"graph={len(graph_results)} fused={len(results)}")
+        return results
+
+    def retrieve(self, query: str, metadata_filter: dict = None):
+        with telemetry.span("hybrid_search"):
+            results = self.hybrid_search(query, TOP_K_RETRIEVAL, metadata_filter)
+        enriched_docs = [doc for doc in self.enrich(results) if doc.page_content]
+        return self.reranker.rerank(query, enriched_docs)
@@ -1,35 +1,48 @@
-import os
 from typing import Optional
-from transformers import pipeline
-from src.config.models import ZERO_SHOT_MODEL
 from rapidfuzz import fuzz
+from src.core.helper.model_registry import get_intent_classifier
+from src.core.helper.telemetry import telemetry
 
 TYPE_LABELS = ["text", "table", "image"]
 
 
 # Fuzzy rule-based matching
 def rule_based_type(query: str, threshold: int = 85) -> Optional[str]:
+    """
+    Content type named by keywords, or None when the keywords are ambiguous.
+    Table and image keywords take precedence over generic text verbs
+    ("describe the diagram", "what does table 2 say"); a query naming both
+    a table and an image is left to the classifier.
+    """
     query_lower = query.lower()
 
     def fuzzy_contains(keywords):
         return any(fuzz.partial_ratio(query_lower, word) >= threshold for word in keywords)
 
+    specific = [
+        label for label, keywords in (
+            ("table", ["table", "tabular", "spreadsheet", "data table"]),
+            ("image", ["image", "figure", "diagram", "chart", "plot", "graph", "visual"]),
+        )
+        if fuzzy_contains(keywords)
+    ]
+    if specific:
+        return specific[0] if len(specific) == 1 else None
     if fuzzy_contains(["text", "describe", "explain", "say", "content", "paragraph"]):
         return "text"
-    if fuzzy_contains(["table", "tabular", "spreadsheet", "data table"]):
-        return "table"
-    if fuzzy_contains(["image", "figure", "diagram", "chart", "plot", "graph", "visual"]):
-        return "image"
 
     return None
 
 
 class MetadataFilterExtractor:
-    def __init__(self):
+    def __init__(self, entity_extractor=None):
+        # Gazetteer of section titles / headings seen at ingestion (optional)
+        self.entity_extractor = entity_extractor
+        # Prototype classifier on the shared e5 embeddings (no per-label NLI passes)
         try:
-            self.classifier = pipeline("zero-shot-classification", model=ZERO_SHOT_MODEL)
+            self.classifier = get_intent_classifier()
         except Exception as e:
-            print(f"[MetadataFilterExtractor] Failed to load zero-shot model: {e}")
+            print(f"[MetadataFilterExtractor] Failed to load intent classifier: {e}")
             self.classifier = None
 
     def classify_query_type(self, query: str) -> Optional[str]:
@@ -37,29 +50,43 @@ class MetadataFilterExtractor:
             if not self.classifier:
                 return None
 
-            result = self.classifier(query, candidate_labels=TYPE_LABELS)
-            top_label = result["labels"][0]
-            top_score = result["scores"][0]
+            top_label, top_score = self.classifier.type_classifier.predict(query)
 
-            print(f"[Zero-Shot] Predicted: {top_label} (score: {top_score:.2f})")
+            print(f"[IntentClassifier] Predicted: {top_label} (confidence: {top_score:.2f})")
 
-            if top_score > 0.4:
+            if top_score >= self.classifier.type_classifier.threshold:
                 return top_label.lower()
         except Exception as e:
-            print(f"[MetadataFilterExtractor] Zero-shot classification failed: {e}")
+            print(f"[MetadataFilterExtractor] Type classification failed: {e}")
         return None
 
+    def extract_structure(self, query: str) -> dict:
+        """Section / heading named in the query, via the gazetteer."""
+        if self.entity_extractor is None:
+            return {}
+        try:
+            structure = self.entity_extractor.metadata_filter(query)
+        except Exception as e:
+            print(f"[MetadataFilterExtractor] Gazetteer lookup failed: {e}")
+            return {}
+        if structure:
+            print(f"[Gazetteer] Matched {structure}")
+        return structure
+
+    @telemetry.traced("filter_extraction")
     def extract(self, query: str) -> dict:
-        # Try zero-shot classification first
+        metadata_filter = self.extract_structure(query)
+
+        # Zero-cost tier: fuzzy keyword rules
+        rule_type = rule_based_type(query)
+        if rule_type:
+            print(f"[Rules] Rule-based matched type: {rule_type}")
+            return {**metadata_filter, "type": rule_type}
+
+        # Embedding tier: one query embedding + dot product against label prototypes
         label = self.classify_query_type(query)
         if label:
-            return {"type": label}
-
-        # Fallback to rule-based
-        fallback_type = rule_based_type(query)
-        if fallback_type:
-            print(f"[Fallback] Rule-based matched type: {fallback_type}")
-            return {"type": fallback_type}
+            return {**metadata_filter, "type": label}
 
         print("[MetadataFilterExtractor] No type matched.")
-        return {}
\ No newline at end of file
+        return metadata_filter
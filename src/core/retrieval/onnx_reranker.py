@@ -0,0 +1,89 @@
+import os
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+from src.config.models import RERANKER_MODEL, RERANKER_MAX_LENGTH, RERANKER_ONNX_DIR
+
+
+def _model_dir(model_name: str, base_dir: str) -> str:
+    return os.path.join(base_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+
+
+def export_int8_cross_encoder(model_name: str = RERANKER_MODEL, base_dir: str = RERANKER_ONNX_DIR) -> str:
+    """
+    Export a Hugging Face cross-encoder to ONNX and quantize its weights to
+    int8. Artifacts are written once and reused on later calls.
+    """
+    out_dir = _model_dir(model_name, base_dir)
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    int8_path = os.path.join(out_dir, "model-int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+
+    import torch
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["query"], ["passage"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"[export_int8_cross_encoder] Wrote {int8_path}")
+    return int8_path
+
+
+class OnnxCrossEncoder:
+    """int8 ONNX Runtime cross-encoder with a CrossEncoder-like predict()."""
+
+    def __init__(self, model_name: str = RERANKER_MODEL, max_length: int = RERANKER_MAX_LENGTH,
+                 base_dir: str = RERANKER_ONNX_DIR, intra_op_threads: int = 0):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = export_int8_cross_encoder(model_name, base_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(os.path.dirname(model_path))
+        self.input_names = {inp.name for inp in self.session.get_inputs()}
+        self.max_length = max_length
+
+    def predict(self, pairs: List[Tuple[str, str]], batch_size: int = 32) -> np.ndarray:
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            features = self.tokenizer(
+                [q for q, _ in batch],
+                [d for _, d in batch],
+                truncation="only_second",
+                max_length=self.max_length,
+                padding=True,
+                return_tensors="np",
+            )
+            inputs = {k: v.astype(np.int64) for k, v in features.items() if k in self.input_names}
+            logits = self.session.run(["logits"], inputs)[0]
+            scores.append(logits[:, 0] if logits.ndim == 2 else logits)
+        return np.concatenate(scores) if scores else np.array([])
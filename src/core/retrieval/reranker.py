@@ -1,22 +1,135 @@
-from sentence_transformers import CrossEncoder
+import hashlib
+import threading
 from langchain.schema import Document
-from src.config.models import RERANKER_MODEL
+from src.config.models import (
+    RERANKER_MODEL,
+    RERANKER_BACKEND,
+    RERANKER_MAX_LENGTH,
+    RERANKER_TOP_N,
+    MICRO_BATCHING_ENABLED,
+    RERANK_BATCH_MAX_SIZE,
+    RERANK_BATCH_MAX_WAIT_MS,
+)
+from src.config.cache import RERANKER_SCORE_CACHE_SIZE
+from src.core.helper.lru_cache import LRUCache
+from src.core.helper.micro_batcher import MicroBatcher
+from src.core.helper.telemetry import telemetry
+from src.core.helper.model_registry import get_reranker_model, get_onnx_reranker_model
+
+# Rough upper bound on characters per token; text beyond max_length tokens is never scored
+CHARS_PER_TOKEN = 6
+
+# Shared by every Reranker so retrievers over different stores reuse scores
+_score_cache = LRUCache(RERANKER_SCORE_CACHE_SIZE)
+
+# One batcher per loaded model, so pairs from concurrent queries share a forward pass
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def _get_batcher(key: tuple, model) -> MicroBatcher:
+    with _batchers_lock:
+        if key not in _batchers:
+            _batchers[key] = MicroBatcher(
+                "rerank",
+                lambda pairs: [float(s) for s in model.predict(pairs, batch_size=RERANK_BATCH_MAX_SIZE)],
+                RERANK_BATCH_MAX_SIZE,
+                RERANK_BATCH_MAX_WAIT_MS,
+            )
+        return _batchers[key]
+
 
 class Reranker:
-    def __init__(self, model_name: str = RERANKER_MODEL):
+    def __init__(
+        self,
+        model_name: str = RERANKER_MODEL,
+        backend: str = RERANKER_BACKEND,
+        max_length: int = RERANKER_MAX_LENGTH,
+        top_n: int = RERANKER_TOP_N,
+        score_cache: LRUCache = None,
+        micro_batching: bool = MICRO_BATCHING_ENABLED,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.max_length = max_length
+        self.top_n = top_n
+        self.score_cache = score_cache if score_cache is not None else _score_cache
+        self.micro_batching = micro_batching
         try:
-            self.model = CrossEncoder(model_name)
+            if backend == "onnx":
+                self.model = get_onnx_reranker_model(model_name, max_length)
+            else:
+                self.model = get_reranker_model(model_name, max_length)
         except Exception as e:
-            print(f"[Reranker] Failed to load reranker model: {e}")
+            print(f"[Reranker] Failed to load {backend} reranker model: {e}")
             self.model = None
 
+    def _clip(self, text: str) -> str:
+        # Avoid tokenizing characters that the model would truncate away anyway
+        return text[: self.max_length * CHARS_PER_TOKEN] if self.max_length else text
+
+    def _truncate(self, query: str, texts: list[str]) -> list[str]:
+        """
+        Cut each passage to the tokens that fit beside the query in
+        max_length, keeping the query whole as the ONNX model does. A
+        CrossEncoder would otherwise truncate the longer of the two.
+        """
+        texts = [self._clip(text) for text in texts]
+        tokenizer = getattr(self.model, "tokenizer", None)
+        # The ONNX model truncates this way itself; offsets need a fast tokenizer
+        if self.backend == "onnx" or not self.max_length or not getattr(tokenizer, "is_fast", False):
+            return texts
+        encoded = tokenizer(
+            [query] * len(texts), texts,
+            truncation="only_second",
+            max_length=self.max_length,
+            return_offsets_mapping=True,
+        )
+        truncated = []
+        for i, text in enumerate(texts):
+            ends = [end for (_, end), sequence in zip(encoded["offset_mapping"][i], encoded.sequence_ids(i))
+                    if sequence == 1]
+            truncated.append(text[: ends[-1]] if ends else text)
+        return truncated
+
+    def _cache_key(self, query_hash: str, doc: Document) -> tuple:
+        doc_key = doc.metadata.get("doc_id") or hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+        return (self.backend, self.model_name, self.max_length, query_hash, doc_key)
+
+    def score(self, query: str, docs: list[Document]) -> list[float]:
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        keys = [self._cache_key(query_hash, doc) for doc in docs]
+        scores = [self.score_cache.get(key) for key in keys]
+
+        missing = [i for i, s in enumerate(scores) if s is None]
+        telemetry.cache_hit("rerank_scores", len(docs) - len(missing))
+        telemetry.cache_miss("rerank_scores", len(missing))
+        if missing:
+            texts = self._truncate(query, [docs[i].page_content for i in missing])
+            pairs = [(query, text) for text in texts]
+            with telemetry.span("rerank_predict", pairs=len(pairs), backend=self.backend):
+                if self.micro_batching:
+                    batcher = _get_batcher((self.backend, self.model_name, self.max_length), self.model)
+                    predicted = batcher.submit_many(pairs)
+                else:
+                    predicted = self.model.predict(pairs)
+            for i, value in zip(missing, predicted):
+                scores[i] = float(value)
+                self.score_cache.set(keys[i], scores[i])
+        return scores
+
     def rerank(self, query: str, docs: list[Document]) -> list[Document]:
         if not self.model:
             print("[Reranker] Model not available. Skipping reranking.")
+            return docs[: self.top_n] if self.top_n else docs
+
+        if not docs:
             return docs
 
-        pairs = [(query, doc.page_content) for doc in docs]
-        scores = self.model.predict(pairs)
+        with telemetry.span("rerank", docs=len(docs)):
+            scores = self.score(query, docs)
 
         reranked = sorted(zip(docs, scores), key=lambda x: -x[1])
-        return [doc for doc, _ in reranked]
\ No newline at end of file
+        if self.top_n:
+            reranked = reranked[: self.top_n]
+        return [doc for doc, _ in reranked]
@@ -1,18 +1,10 @@
 from langchain.schema.document import Document
 import json
 from langchain_community.vectorstores import Chroma
-from src.config.retrieval import TOP_K_RETRIEVAL
-from transformers import pipeline
-from src.config.models import RERANKER_MODEL, ZERO_SHOT_MODEL
+from src.config.retrieval import TOP_K_RETRIEVAL, DOCSTORE_LRU_SIZE, DOCSTORE_MISS_POLICY
+from src.core.helper.lru_cache import LRUCache
+from src.core.helper.telemetry import telemetry
 from src.core.retrieval.reranker import Reranker
-from src.config.constants import (
-    SUMMARY_INTENT_FULL,
-    QUERY_INTENT_DETAIL,
-    SUMMARY_INTENT_SECTION
-)
-from sentence_transformers import CrossEncoder
-
-QUERY_INTENT_LABELS = [SUMMARY_INTENT_FULL, SUMMARY_INTENT_SECTION, QUERY_INTENT_DETAIL]
 
 class Retriever:
     def __init__(
@@ -20,28 +12,18 @@ class Retriever:
         vectorstore: Chroma,
         docstore,
         embedding_function,
-        id_key="doc_id"
+        id_key="doc_id",
+        doc_cache: LRUCache = None,
+        miss_policy: str = DOCSTORE_MISS_POLICY,
     ):
         self.vectorstore = vectorstore
         self.docstore = docstore
         self.embedding_function = embedding_function
         self.reranker = Reranker()
         self.id_key = id_key
-
-        # Load zero-shot classification model
-        try:
-            self.classifier = pipeline("zero-shot-classification", model=ZERO_SHOT_MODEL)
-        except Exception as e:
-            print(f"[Retriever] Failed to load zero-shot model: {e}")
-            self.classifier = None
-
-        # Load cross-encoder reranker model
-        try:
-            self.reranker = CrossEncoder(RERANKER_MODEL)
-        except Exception as e:
-            print(f"[Retriever] Failed to load reranker model: {e}")
-            self.reranker = None
-
+        # Hot parent documents; ids are content-derived so cached entries never go stale
+        self.doc_cache = doc_cache if doc_cache is not None else LRUCache(DOCSTORE_LRU_SIZE)
+        self.miss_policy = miss_policy
 
 
     def _format_filter(self, metadata_filter):
@@ -54,37 +36,77 @@ class Retriever:
             return metadata_filter
         return {"$and": [{k: v} for k, v in metadata_filter.items()]}
 
-
-    def retrieve(self, query: str, metadata_filter: dict = None):
+    def _fetch_parents(self, doc_ids: list) -> dict:
         """
-        Main entry point for document retrieval:
-        - If full summary is requested → delegate to SummaryRetriever
-        - If section summary is requested → delegate to SummaryRetriever
-        - Else → do top-k similarity search with optional metadata filter and rerank
+        Resolve doc_ids to parent Documents: LRU first, then a single
+        multi-get against the docstore for everything that missed.
         """
+        parents = {}
+        missing = []
+        for doc_id in doc_ids:
+            cached = self.doc_cache.get(doc_id)
+            if cached is not None:
+                parents[doc_id] = cached
+            elif doc_id not in missing:
+                missing.append(doc_id)
+        telemetry.cache_hit("docstore_lru", len(parents))
+        telemetry.cache_miss("docstore_lru", len(missing))
+
+        if missing:
+            with telemetry.span("docstore_fetch", keys=len(missing)):
+                raw_docs = self.docstore.mget(missing)
+            for doc_id, redis_raw in zip(missing, raw_docs):
+                if not redis_raw:
+                    continue
+                try:
+                    parent = Document(**json.loads(redis_raw))
+                except Exception as e:
+                    print(f"[Retriever] Failed to parse doc_id={doc_id}: {e}")
+                    continue
+                parents[doc_id] = parent
+                self.doc_cache.set(doc_id, parent)
+
+        return parents
+
+    def enrich(self, results: list) -> list:
+        """Swap vector hits for their full docstore documents, applying the miss policy."""
+        doc_ids = [doc.metadata.get(self.id_key) for doc, _ in results]
+        parents = self._fetch_parents([doc_id for doc_id in doc_ids if doc_id])
 
+        enriched_docs = []
+        for (doc, score), doc_id in zip(results, doc_ids):
+            parent = parents.get(doc_id)
+            if parent is not None:
+                enriched_docs.append(parent)
+            elif self.miss_policy == "vector":
+                print(f"[Retriever] doc_id={doc_id} not in docstore, using vector store content")
+                enriched_docs.append(doc)
+            else:
+                print(f"[Retriever] doc_id={doc_id} not in docstore, dropping hit")
+        return enriched_docs
+
+    def dense_search(self, query: str, k: int, metadata_filter: dict = None) -> list:
+        """Top-k (Document, distance) pairs from the vector store."""
         formatted_filter = self._format_filter(metadata_filter)
         if formatted_filter:
             print(f"[Retriever] Applying metadata filter: {formatted_filter}")
 
-        results = self.vectorstore.similarity_search_with_score(
-            query,
-            k=TOP_K_RETRIEVAL,
-            filter=formatted_filter
-        )
+        with telemetry.span("vector_search", k=k):
+            return self.vectorstore.similarity_search_with_score(
+                query,
+                k=k,
+                filter=formatted_filter
+            )
 
-        enriched_docs = []
-        for doc, score in results:
-            doc_id = doc.metadata.get(self.id_key)
-            redis_raw = self.docstore.mget([doc_id])[0]
-            if redis_raw:
-                try:
-                    parsed = json.loads(redis_raw)
-                    enriched_docs.append(Document(**parsed))
-                except Exception as e:
-                    print(f"[Retriever] Failed to parse doc_id={doc_id}: {e}")
-                    enriched_docs.append(doc)
+    def retrieve(self, query: str, metadata_filter: dict = None):
+        """
+        Main entry point for document retrieval: top-k similarity search with
+        an optional metadata filter, then rerank. Summary intents never get
+        here; the query router answers them from stored artifacts.
+        """
+
+        results = self.dense_search(query, TOP_K_RETRIEVAL, metadata_filter)
+
+        enriched_docs = self.enrich(results)
 
-       # Re-rank only for detail queries
-      
         return self.reranker.rerank(query, enriched_docs)
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routes.main_route import router as main_router  
+from fastapi.responses import PlainTextResponse
+from src.api.routes.main_route import router as main_router, qa_service
+from src.core.helper.telemetry import telemetry
+from src.core.helper.model_registry import model_registry, get_llm_gateway
 
 app = FastAPI(
     title="PDF QA API",
@@ -20,6 +23,25 @@ app.add_middleware(
 # Register routes
 app.include_router(main_router)
 
+@app.on_event("startup")
+def attach_corpus():
+    # Serve what Chroma and Redis already hold instead of waiting for a re-upload
+    try:
+        qa_service.attach()
+    except Exception as e:
+        print(f"[main] Could not attach to the persisted corpus, attaching on first use: {e}")
+
+@app.on_event("shutdown")
+async def close_llm_gateway():
+    # Release pooled upstream connections
+    if model_registry.is_loaded("llm_gateway:together"):
+        await get_llm_gateway().aclose()
+
+# Prometheus scrape endpoint: stage latency histograms, LLM tokens, cache hit/miss counters
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(telemetry.render(), media_type="text/plain; version=0.0.4")
+
 # python3 -m uvicorn src.main:app --reload --port 8000
 
 
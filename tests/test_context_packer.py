@@ -0,0 +1,67 @@
+from langchain.schema import Document
+
+from src.core.generation.context_packer import ContextPacker, html_table_to_markdown
+
+
+class _WordTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+
+def _packer(**kwargs):
+    settings = dict(budget=60, chunk_max_tokens=30, min_chunk_tokens=3, dedup_threshold=0.8)
+    return ContextPacker(tokenizer=_WordTokenizer(), **{**settings, **kwargs})
+
+
+FILLER = "The appendix lists every hyperparameter used in the ablation runs."
+
+
+def test_near_duplicate_chunks_are_dropped():
+    text = "The model reaches 28.4 BLEU on the WMT 2014 English to German test set."
+    docs = [
+        Document(page_content=text),
+        # Only the last shingle differs
+        Document(page_content=text.replace("test set", "test split")),
+        Document(page_content="Training took three days on eight GPUs."),
+    ]
+
+    packed = _packer().pack("bleu score", docs)
+
+    assert packed.duplicates == 1
+    assert [doc.page_content for doc in packed.docs] == [docs[0].page_content, docs[2].page_content]
+
+
+def test_long_chunks_keep_their_most_relevant_sentences_in_order():
+    sentences = [FILLER, "Dropout is set to 0.1 for all layers.", FILLER.replace("ablation", "baseline"),
+                 "Label smoothing uses a dropout-free value of 0.1."]
+    packed = _packer(chunk_max_tokens=20).pack("what dropout rate", [Document(page_content=" ".join(sentences))])
+
+    assert packed.trimmed == 1 and packed.tokens <= 20
+    assert packed.text == f"{sentences[1]} {sentences[3]}"
+
+
+def test_trimmed_tables_keep_their_header():
+    html = ("<table><tr><th>Model</th><th>BLEU</th></tr>"
+            + "".join(f"<tr><td>baseline {i}</td><td>2{i}.0</td></tr>" for i in range(8))
+            + "<tr><td>transformer big</td><td>28.4</td></tr></table>")
+    doc = Document(page_content=html, metadata={"type": "table"})
+
+    lines = _packer(chunk_max_tokens=20).pack("transformer bleu", [doc]).text.split("\n")
+
+    assert lines[:2] == ["| Model | BLEU |", "| --- | --- |"]
+    assert "| transformer big | 28.4 |" in lines
+
+
+def test_chunks_past_the_budget_are_left_out():
+    docs = [Document(page_content=f"Chunk {i} " + " ".join(["word"] * 20)) for i in range(5)]
+    packed = _packer(dedup_threshold=1.1).pack("chunk", docs)
+
+    assert packed.tokens <= 60
+    assert len(packed.docs) + packed.truncated == 5 and packed.truncated > 0
+    assert packed.saved_tokens == packed.original_tokens - packed.tokens
+
+
+def test_tables_without_header_row_use_their_first_row():
+    assert html_table_to_markdown("<table><tr><td>a</td><td>b</td></tr><tr><td>1</td></tr></table>") == [
+        "| a | b |", "| --- | --- |", "| 1 |  |",
+    ]
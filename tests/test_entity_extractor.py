@@ -0,0 +1,69 @@
+import random
+
+from src.core.query.entity_extractor import (
+    AhoCorasick,
+    EntityExtractor,
+    KIND_ENTITY,
+    KIND_HEADING,
+    KIND_SECTION,
+)
+
+
+def _naive_matches(patterns, text):
+    return sorted(
+        (start, start + len(pattern), index)
+        for index, pattern in enumerate(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+
+def test_automaton_finds_every_overlapping_occurrence():
+    patterns = ["he", "she", "his", "hers", "s"]
+    text = "ushers say his hershey"
+
+    assert sorted(AhoCorasick(patterns).iter_matches(text)) == _naive_matches(patterns, text)
+
+
+def test_automaton_matches_brute_force_on_random_inputs():
+    rng = random.Random(7)
+    for _ in range(200):
+        patterns = list({"".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)})
+        text = "".join(rng.choice("ab") for _ in range(30))
+        assert sorted(AhoCorasick(patterns).iter_matches(text)) == _naive_matches(patterns, text)
+
+
+def _extractor():
+    extractor = EntityExtractor(min_length=3, fuzzy_threshold=88)
+    extractor.add_terms([
+        ("Layer Normalization", KIND_ENTITY),
+        ("layer", KIND_ENTITY),
+        ("Results", KIND_ENTITY),
+        ("results", KIND_SECTION),
+        ("training setup", KIND_HEADING),
+    ])
+    return extractor
+
+
+def test_exact_matches_are_whole_words_and_longest_first():
+    extractor = _extractor()
+
+    assert extractor.entity_names("Why does layer normalization help?") == ["layer normalization"]
+    assert extractor.entity_names("multilayer perceptrons") == []
+
+
+def test_kind_priority_and_rebuilds_only_on_new_terms():
+    extractor = _extractor()
+
+    assert [m.kind for m in extractor.extract("results")] == [KIND_SECTION]
+    assert extractor.add_terms([("results", KIND_ENTITY), ("layer", KIND_ENTITY)]) == 0
+    assert extractor.rebuilds == 1
+
+
+def test_fuzzy_fallback_and_explicit_section_filter():
+    extractor = _extractor()
+
+    assert extractor.entity_names("details of the trainng setup") == ["training setup"]
+    assert extractor.metadata_filter("summarize the results section") == {"section": "results"}
+    # A lone common word is not a hard filter
+    assert extractor.metadata_filter("what are the results") == {}
@@ -0,0 +1,67 @@
+import time
+
+from src.core.retrieval.graph_retriever import GraphRetriever
+
+
+class _ChainGraphStore:
+    """Entities 1 - 2 - ... - n in a line; entity i is mentioned once in chunk "c<i>"."""
+
+    def __init__(self, length=10, delay=0.0):
+        self.length = length
+        self.delay = delay
+        self.neighbor_calls = 0
+
+    def entity_ids(self, names):
+        return {name: 1 for name in names if name == "alpha"}
+
+    def neighbors(self, entity_ids, limit):
+        self.neighbor_calls += 1
+        time.sleep(self.delay)
+        edges = []
+        for node in entity_ids:
+            for neighbor in (node - 1, node + 1):
+                if 1 <= neighbor <= self.length:
+                    edges.append((node, neighbor, 1.0))
+        return edges[:limit]
+
+    def chunks_for_entities(self, entity_ids):
+        return [(f"c{entity_id}", entity_id, 1) for entity_id in entity_ids]
+
+
+def _retriever(store, **kwargs):
+    settings = dict(max_hops=2, max_nodes=100, hop_fanout=50, time_budget_ms=1000, hop_decay=0.5, top_k=10)
+    return GraphRetriever(store, **{**settings, **kwargs})
+
+
+def test_expansion_stops_at_max_hops_with_decaying_scores():
+    results = _retriever(_ChainGraphStore()).search("results for alpha")
+
+    assert results == [("c1", 1.0), ("c2", 0.5), ("c3", 0.25)]
+
+
+def test_expansion_stops_at_max_nodes():
+    retriever = _retriever(_ChainGraphStore(), max_hops=10, max_nodes=4)
+    scores, hops = retriever.expand({1: 1.0}, time.perf_counter() + 1)
+
+    assert sorted(scores) == [1, 2, 3, 4]
+    assert hops == 3
+
+
+def test_expansion_stops_when_the_time_budget_runs_out():
+    store = _ChainGraphStore(delay=0.05)
+    retriever = _retriever(store, max_hops=10, time_budget_ms=20)
+
+    results = retriever.search("alpha")
+
+    # The first hop starts within the budget; none starts after it
+    assert store.neighbor_calls == 1
+    assert [chunk_id for chunk_id, _ in results] == ["c1", "c2"]
+
+
+def test_unknown_entities_and_store_errors_return_nothing():
+    class _BrokenStore(_ChainGraphStore):
+        def neighbors(self, entity_ids, limit):
+            raise RuntimeError("database is locked")
+
+    assert _retriever(_ChainGraphStore()).search("nothing known here") == []
+    assert _retriever(_BrokenStore()).search("alpha") == []
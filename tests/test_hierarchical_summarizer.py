@@ -0,0 +1,55 @@
+import pytest
+from langchain.schema import Document
+
+from evaluation.stub_client import StubTogetherClient
+from src.core.ingestion.index.summary_artifacts import UNSECTIONED
+from src.core.ingestion.loader.hierarchical_summarizer import HierarchicalSummarizer, batch_for_reduce
+
+
+@pytest.mark.parametrize("count", range(2, 12))
+@pytest.mark.parametrize("fan_in", [2, 3, 4])
+def test_batches_keep_order_respect_fan_in_and_shrink(count, fan_in):
+    parts = [f"part {i}" for i in range(count)]
+    batches = batch_for_reduce(parts, fan_in, max_chars=10_000)
+
+    assert [part for batch in batches for part in batch] == parts
+    assert all(len(batch) <= fan_in for batch in batches)
+    assert len(batches) < count
+
+
+def test_batches_split_on_characters_but_never_below_two_parts():
+    parts = ["x" * 40, "y" * 40, "z" * 40, "w" * 40]
+
+    assert batch_for_reduce(parts, fan_in=4, max_chars=100) == [parts[:2], parts[2:]]
+    # A single oversized part still gets a partner
+    assert batch_for_reduce(["x" * 500, "y"], fan_in=4, max_chars=100) == [["x" * 500, "y"]]
+
+
+def test_summaries_group_by_known_section_titles():
+    docs = [
+        Document(page_content="intro text", metadata={"section": ""}),
+        Document(page_content="method a", metadata={"section": "method"}),
+        Document(page_content="footnote", metadata={"section": "figure 2"}),
+        Document(page_content="results a", metadata={"section": "results"}),
+    ]
+
+    grouped = HierarchicalSummarizer.group_by_section(docs, {"method", "results"})
+
+    assert list(grouped) == [UNSECTIONED, "method", "results"]
+    assert grouped["method"] == ["method a", "footnote"]
+    assert grouped["results"] == ["results a"]
+
+
+def test_summarize_reduces_long_sections_over_several_rounds():
+    client = StubTogetherClient(latency=0, reply="Reduced.")
+    summarizer = HierarchicalSummarizer(client=client, fan_in=2, requests_per_minute=0)
+    docs = [Document(page_content=f"method {i}", metadata={"section": "method"}) for i in range(5)]
+    docs.append(Document(page_content="results only", metadata={"section": "results"}))
+
+    artifacts = summarizer.summarize("paper.pdf", "abc", docs, {"method", "results"})
+
+    assert list(artifacts.sections) == ["method", "results"]
+    assert artifacts.sections == {"method": "Reduced.", "results": "results only"}
+    assert artifacts.document == "Reduced."
+    # Five method parts need three rounds at fan-in 2, plus one document reduce
+    assert summarizer.llm_calls == client.calls == 7
@@ -0,0 +1,64 @@
+import pytest
+from langchain.schema import Document
+
+from src.core.ingestion.index.bm25_index import BM25Index, matches_filter, tokenize
+from src.core.retrieval.hybrid_retriever import reciprocal_rank_fusion
+
+
+def _doc(doc_id, text, **metadata):
+    return Document(page_content=text, metadata={"doc_id": doc_id, **metadata})
+
+
+@pytest.fixture
+def index():
+    index = BM25Index()
+    index.add_documents([
+        _doc("a", "The model reaches 28.4 BLEU-4 on the WMT test set", section="results"),
+        _doc("b", "The model is trained on the WMT training set", section="method"),
+        _doc("c", "<table><tr><td>dropout</td><td>0.1</td></tr></table>", section="method", type="table"),
+    ])
+    return index
+
+
+def test_tokenize_keeps_compound_terms_and_their_parts():
+    assert tokenize("The BLEU-4 of <b>e5-large</b>") == ["bleu-4", "bleu", "4", "e5-large", "e5", "large"]
+
+
+def test_rare_terms_rank_first_and_filters_apply(index):
+    assert [doc_id for doc_id, _ in index.search("bleu model")][0] == "a"
+    assert [doc_id for doc_id, _ in index.search("model", metadata_filter={"section": "method"})] == ["b"]
+    assert [doc_id for doc_id, _ in index.search("dropout")] == ["c"]
+    assert index.search("nothing matches") == []
+
+
+def test_readding_an_id_replaces_it_and_delete_removes_it(index):
+    index.add_documents([_doc("a", "A different chunk about attention heads", section="results")])
+    assert [doc_id for doc_id, _ in index.search("bleu")] == []
+    assert [doc_id for doc_id, _ in index.search("attention")] == ["a"]
+
+    index.delete(["a"])
+    assert len(index) == 2 and index.search("attention") == []
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    index.path = str(tmp_path / "bm25.json.gz")
+    index.save()
+    restored = BM25Index(index.path)
+
+    assert len(restored) == 3
+    assert restored.search("bleu model") == index.search("bleu model")
+    assert restored.metadata_values("section") == {"results", "method"}
+
+
+def test_matches_filter_is_an_and_of_equalities():
+    metadata = {"section": "method", "type": "table"}
+    assert matches_filter(metadata, None)
+    assert matches_filter(metadata, {"section": "method", "type": "table"})
+    assert not matches_filter(metadata, {"section": "method", "type": "text"})
+
+
+def test_rrf_favours_ids_ranked_in_several_lists():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"], []], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "d", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.generation.llm_gateway import AsyncLLMGateway
+
+REQUEST = {"model": "stub", "messages": [{"role": "user", "content": "What is BLEU?"}], "stream": False}
+
+
+class _SlowProvider:
+    """Chat-completions endpoint that answers once `release` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return httpx.Response(200, json={"choices": [{"message": {"content": "An n-gram metric."}}]})
+
+
+def _gateway(provider):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(provider))
+    return AsyncLLMGateway(api_key="test", base_url="https://llm.test/v1", http_client=http)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_requests_share_one_upstream_call():
+    async def scenario():
+        provider = _SlowProvider()
+        gateway = _gateway(provider)
+        first = asyncio.create_task(gateway.complete(REQUEST))
+        second = asyncio.create_task(gateway.complete(REQUEST))
+        await _settle()
+        provider.release.set()
+
+        assert await asyncio.gather(first, second) == ["An n-gram metric."] * 2
+        assert provider.calls == 1 and gateway.coalesced == 1
+        assert gateway.stats()["in_flight"] == 0
+        await gateway.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_one_waiter_keeps_the_call_for_the_others():
+    async def scenario():
+        provider = _SlowProvider()
+        gateway = _gateway(provider)
+        leaving = asyncio.create_task(gateway.complete(REQUEST))
+        staying = asyncio.create_task(gateway.complete(REQUEST))
+        await _settle()
+
+        leaving.cancel()
+        await _settle()
+        provider.release.set()
+
+        assert await staying == "An n-gram metric."
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        assert provider.calls == 1 and provider.cancelled == 0
+        await gateway.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_every_waiter_cancels_the_upstream_call():
+    async def scenario():
+        provider = _SlowProvider()
+        gateway = _gateway(provider)
+        waiters = [asyncio.create_task(gateway.complete(REQUEST)) for _ in range(2)]
+        await _settle()
+
+        for waiter in waiters:
+            waiter.cancel()
+        await _settle()
+
+        assert provider.cancelled == 1
+        assert gateway.stats()["in_flight"] == 0
+        # A later identical request starts its own call instead of joining the cancelled one
+        provider.release.set()
+        assert await gateway.complete(REQUEST) == "An n-gram metric."
+        assert provider.calls == 2
+        await gateway.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+import pytest
+
+from src.core.ingestion.index.manifest import DocumentManifest, chunk_doc_id, summary_doc_id
+
+
+def _metadata(**overrides):
+    return {"type": "text", "section": "results", "heading": "", "page_number": 3, **overrides}
+
+
+def test_chunk_ids_follow_content_and_filter_fields_only():
+    base = chunk_doc_id("paper.pdf", "BLEU improves by 2.1", _metadata())
+
+    assert chunk_doc_id("paper.pdf", "BLEU improves by 2.1", _metadata()) == base
+    # A page inserted earlier in the document must not re-index the chunk
+    assert chunk_doc_id("paper.pdf", "BLEU improves by 2.1", _metadata(page_number=4)) == base
+    assert chunk_doc_id("paper.pdf", "BLEU improves by 2.1", _metadata(section="method")) != base
+    assert chunk_doc_id("paper.pdf", "BLEU improves by 2.2", _metadata()) != base
+    assert chunk_doc_id("other.pdf", "BLEU improves by 2.1", _metadata()) != base
+
+
+def test_manifest_round_trips_through_json():
+    manifest = DocumentManifest(
+        "paper.pdf", "abc",
+        chunks={"c1": [summary_doc_id("c1")]},
+        images={"i1": [summary_doc_id("i1")]},
+        section_titles=["results", "method"],
+    )
+    restored = DocumentManifest.from_json(manifest.to_json())
+
+    assert restored.chunks == manifest.chunks
+    assert restored.images == manifest.images
+    assert restored.section_titles == ["method", "results"]
+    assert sorted(restored.all_ids()) == sorted(["c1", summary_doc_id("c1"), "i1", summary_doc_id("i1")])
+
+
+class _RecordingStore:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_documents(self, ids):
+        self.deleted.extend(ids)
+
+
+def test_remove_stale_entries_deletes_only_dropped_chunks_and_their_summaries():
+    pytest.importorskip("unstructured.partition.pdf")
+    from src.api.helper.pdf_utils import remove_stale_entries
+
+    previous = DocumentManifest("paper.pdf", "v1", chunks={
+        "kept": [summary_doc_id("kept")],
+        "dropped": [summary_doc_id("dropped")],
+    }, images={"old_image": [summary_doc_id("old_image")]})
+    current = DocumentManifest("paper.pdf", "v2", chunks={
+        "kept": [summary_doc_id("kept")],
+        "added": [summary_doc_id("added")],
+    })
+    full_store, summary_store = _RecordingStore(), _RecordingStore()
+
+    removed = remove_stale_entries(full_store, summary_store, previous, current)
+
+    assert removed == 2
+    assert sorted(full_store.deleted) == ["dropped", "old_image"]
+    assert sorted(summary_store.deleted) == sorted([summary_doc_id("dropped"), summary_doc_id("old_image")])
+    assert remove_stale_entries(full_store, summary_store, None, current) == 0
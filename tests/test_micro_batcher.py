@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from src.core.helper.micro_batcher import MicroBatcher
+
+
+def _submit_concurrently(batcher, requests):
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def call(i):
+        barrier.wait()
+        results[i] = batcher.submit_many(requests[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_requests_share_batches_and_get_their_own_results():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        time.sleep(0.01)
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=8, max_wait_ms=20)
+    requests = [[i, i + 100] for i in range(12)]
+
+    results = _submit_concurrently(batcher, requests)
+
+    assert results == [[i * 10, (i + 100) * 10] for i in range(12)]
+    assert all(size <= 8 and size % 2 == 0 for size in sizes)
+    assert len(sizes) < 12
+    assert batcher.stats()["items"] == 24
+
+
+def test_batch_errors_reach_every_caller_of_that_batch():
+    def batch_fn(items):
+        if "bad" in items:
+            raise ValueError("model failed")
+        return items
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=4, max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        batcher.submit("bad")
+    # The worker survives an ordinary exception
+    assert batcher.submit("good") == "good"
+
+
+def test_a_lone_request_is_not_held_for_the_window():
+    batcher = MicroBatcher("test", lambda items: items, max_batch_size=8, max_wait_ms=1000)
+
+    start = time.perf_counter()
+    assert batcher.submit_many([1, 2]) == [1, 2]
+    assert time.perf_counter() - start < 0.5
+
+
+# The worker re-raises after failing its callers
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_worker_exit_fails_pending_and_later_requests():
+    started, release = threading.Event(), threading.Event()
+
+    def batch_fn(items):
+        started.set()
+        release.wait(5)
+        raise SystemExit("worker stopped")
+
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=1, max_wait_ms=0)
+    errors = []
+
+    def call(item):
+        try:
+            batcher.submit(item)
+        except BaseException as e:
+            errors.append(e)
+
+    running = threading.Thread(target=call, args=(1,))
+    running.start()
+    assert started.wait(5)
+    # Queued behind the running batch when the worker dies
+    queued = threading.Thread(target=call, args=(2,))
+    queued.start()
+    deadline = time.monotonic() + 5
+    while batcher.stats()["queued"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    running.join(5)
+    queued.join(5)
+    batcher._worker.join(5)
+
+    assert not running.is_alive() and not queued.is_alive()
+    assert len(errors) == 2 and all(isinstance(e, SystemExit) for e in errors)
+    with pytest.raises(RuntimeError):
+        batcher.submit(3)
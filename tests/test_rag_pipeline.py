@@ -0,0 +1,90 @@
+import asyncio
+import functools
+from types import SimpleNamespace
+
+from langchain.schema import Document
+
+from src.core.generation.context_packer import ContextPacker
+from src.core.orchestration import rag_pipeline
+from src.core.orchestration.rag_pipeline import RAGPipeline
+
+
+class _WordTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+
+class _FixedRetriever:
+    def retrieve(self, query, metadata_filter=None):
+        return [Document(page_content="The model reaches 28.4 BLEU.", metadata={"doc_id": "c1"})]
+
+
+class _RecordingCache:
+    def __init__(self):
+        self.stored = []
+
+    def store(self, query, query_vector, metadata_filter, corpus_version, answer):
+        self.stored.append(answer)
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FailingStreamClient:
+    """Streams a few tokens, then the connection drops."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        def chunks():
+            yield _chunk("The model ")
+            yield _chunk("reaches ")
+            raise ConnectionError("stream reset")
+        return chunks()
+
+
+class _FailingGateway:
+    async def stream(self, request, timeout=None):
+        yield "The model "
+        yield "reaches "
+        raise ConnectionError("stream reset")
+
+
+def _pipeline(monkeypatch, **generation_kwargs):
+    cache = _RecordingCache()
+    pipeline = RAGPipeline(
+        store=None, retriever=_FixedRetriever(), router=None,
+        filter_extractor=None, artifacts=None, answer_cache=cache,
+    )
+    plan = ({"query": "bleu?", "route": {"route": "detail"}, "filter": {}}, ([1.0, 0.0], 1))
+    monkeypatch.setattr(pipeline, "_plan", lambda query, document_id=None: plan)
+    monkeypatch.setattr(rag_pipeline, "Generation", functools.partial(
+        rag_pipeline.Generation, packer=ContextPacker(tokenizer=_WordTokenizer()), **generation_kwargs
+    ))
+    return pipeline, cache
+
+
+def test_stream_failing_midway_is_not_cached(monkeypatch):
+    pipeline, cache = _pipeline(monkeypatch, client=_FailingStreamClient())
+
+    _, tokens = pipeline.stream("bleu?")
+    text = "".join(tokens)
+
+    assert text.startswith("The model reaches")
+    assert "LLM error" in text
+    assert cache.stored == []
+
+
+def test_async_stream_failing_midway_is_not_cached(monkeypatch):
+    pipeline, cache = _pipeline(monkeypatch, client=object(), gateway=_FailingGateway())
+
+    async def run():
+        _, tokens = await pipeline.astream("bleu?")
+        return "".join([token async for token in tokens])
+
+    text = asyncio.run(run())
+    assert text.startswith("The model reaches")
+    assert "LLM error" in text
+    assert cache.stored == []
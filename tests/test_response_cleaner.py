@@ -0,0 +1,39 @@
+import pytest
+
+from src.core.helper.response_cleaner import ResponseCleaner, StreamingThinkBlockCleaner
+
+SAMPLES = [
+    "<think>weigh the options</think>\n\nThe answer is 42.",
+    "  Before <reasoning>hidden</reasoning> after <thinking>more</thinking>end  ",
+    "No reasoning here, just a < b and <b>bold</b>.",
+    "<think>a</think><think>b</think>  Done",
+]
+
+
+def _stream(text, chunks):
+    cleaner = StreamingThinkBlockCleaner()
+    return "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.flush()
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_batch_cleaner_for_every_split(text):
+    expected = ResponseCleaner.strip_think_block(text)
+
+    assert _stream(text, list(text)) == expected
+    for cut in range(len(text) + 1):
+        assert _stream(text, [text[:cut], text[cut:]]) == expected, cut
+
+
+def test_reasoning_is_never_emitted_before_its_block_closes():
+    cleaner = StreamingThinkBlockCleaner()
+    emitted = [cleaner.feed(chunk) for chunk in ["<thi", "nk>secret ", "plan</th", "ink> Visible"]]
+
+    assert "secret" not in "".join(emitted)
+    assert "".join(emitted) + cleaner.flush() == "Visible"
+
+
+def test_unterminated_block_stays_hidden():
+    cleaner = StreamingThinkBlockCleaner()
+
+    assert cleaner.feed("Intro <think>never closed") == "Intro"
+    assert cleaner.flush() == ""
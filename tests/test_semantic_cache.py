@@ -0,0 +1,56 @@
+import math
+
+from src.core.generation import semantic_cache
+from src.core.generation.semantic_cache import SemanticAnswerCache
+
+
+def _vector(angle_degrees):
+    """Unit vector at `angle_degrees` from [1, 0]; cosine similarity is cos(angle)."""
+    angle = math.radians(angle_degrees)
+    return [math.cos(angle), math.sin(angle)]
+
+
+def test_hits_only_above_the_similarity_threshold():
+    cache = SemanticAnswerCache(threshold=0.95, max_entries=10, ttl_seconds=0)
+    cache.store("what is the bleu score", _vector(0), {}, 1, "28.4")
+
+    hit = cache.lookup("what's the bleu score", _vector(10), {}, 1)   # cos 10deg ~ 0.985
+    assert hit is not None and hit[0]["answer"] == "28.4"
+    assert cache.lookup("who are the authors", _vector(30), {}, 1) is None  # cos 30deg ~ 0.866
+
+
+def test_filter_identifier_terms_and_corpus_version_must_match():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10, ttl_seconds=0)
+    cache.store("results on table 2", _vector(0), {"section": "results"}, 1, "answer")
+
+    assert cache.lookup("results on table 2", _vector(0), {}, 1) is None
+    assert cache.lookup("results on table 3", _vector(0), {"section": "results"}, 1) is None
+    assert cache.lookup("results on table 2", _vector(0), {"section": "results"}, 1) is not None
+    # A newer corpus drops everything; answers computed against an older one are not stored
+    assert cache.lookup("results on table 2", _vector(0), {"section": "results"}, 2) is None
+    cache.store("results on table 2", _vector(0), {"section": "results"}, 1, "stale")
+    assert cache.stats()["size"] == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10, ttl_seconds=60)
+    cache.store("what is the bleu score", _vector(0), {}, 1, "28.4")
+
+    now[0] += 59
+    assert cache.lookup("what is the bleu score", _vector(0), {}, 1) is not None
+    now[0] += 2
+    assert cache.lookup("what is the bleu score", _vector(0), {}, 1) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticAnswerCache(threshold=0.99, max_entries=2, ttl_seconds=0)
+    cache.store("first", _vector(0), {}, 1, "a")
+    cache.store("second", _vector(90), {}, 1, "b")
+    assert cache.lookup("first", _vector(0), {}, 1) is not None
+    cache.store("third", _vector(180), {}, 1, "c")
+
+    assert cache.lookup("second", _vector(90), {}, 1) is None
+    assert cache.lookup("first", _vector(0), {}, 1) is not None
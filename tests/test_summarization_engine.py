@@ -0,0 +1,32 @@
+from evaluation.stub_client import StubTogetherClient
+from src.core.helper.completion_cache import CachedChatClient, CompletionCache, DiskCompletionStore
+from src.core.ingestion.loader.summarization_engine import SummarizationEngine
+
+
+def test_run_completes_one_request_with_stub_client():
+    client = StubTogetherClient(latency=0, reply="Stub summary.")
+    engine = SummarizationEngine(client, requests_per_minute=0)
+
+    request = {"model": "stub", "messages": [{"role": "user", "content": "Summarize this."}]}
+    assert engine.run([request]) == ["Stub summary."]
+    assert client.calls == 1
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+def test_completion_cache_hits_skip_the_rate_limiter(tmp_path):
+    client = StubTogetherClient(latency=0, reply="Stub summary.")
+    cache = CompletionCache(DiskCompletionStore(cache_dir=str(tmp_path)))
+    engine = SummarizationEngine(CachedChatClient(client, cache), max_concurrency=1)
+    engine.rate_limiter = limiter = _CountingLimiter()
+
+    request = {"model": "stub", "messages": [{"role": "user", "content": "Summarize this."}]}
+    assert engine.run([request, request, request]) == ["Stub summary."] * 3
+    assert client.calls == 1
+    assert limiter.acquired == 1